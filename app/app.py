@@ -25,10 +25,25 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+def _read_table(csv_path, parquet_path=None):
+    """Read a saved table, preferring its Parquet copy (by default the .parquet sibling) over the CSV unless the CSV was modified later, e.g. appended to by the AWS IoT integration; None when neither can be read"""
+    if parquet_path is None:
+        parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+    if os.path.exists(parquet_path) and (
+        not os.path.exists(csv_path) or os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)
+    ):
+        try:
+            return pd.read_parquet(parquet_path)
+        except (ImportError, OSError, ValueError):
+            pass
+    if os.path.exists(csv_path):
+        return pd.read_csv(csv_path)
+    return None
+
 # Function to load data
 @st.cache_data(ttl=3600)  # Cache data for 1 hour
 def load_data():
-    """Load sensor data from CSV files or generate if not available"""
+    """Load sensor data from Parquet or CSV files or generate if not available"""
     data_dir = os.path.join(os.path.dirname(__file__), 'data')
     
     # Check if data directory exists
@@ -40,8 +55,9 @@ def load_data():
     # Load combined data
     combined_data_path = os.path.join(data_dir, 'combined_sensor_data.csv')
     if os.path.exists(combined_data_path):
-        combined_data = pd.read_csv(combined_data_path)
+        combined_data = _read_table(combined_data_path)
         combined_data['timestamp'] = pd.to_datetime(combined_data['timestamp'])
+        combined_data = combined_data.sort_values('timestamp', ignore_index=True)
     else:
         st.error("ไม่พบข้อมูลเซ็นเซอร์รวม กรุณาสร้างข้อมูลก่อน")
         combined_data = None
@@ -57,8 +73,9 @@ def load_data():
     # Load daily summary
     daily_summary_path = os.path.join(data_dir, 'daily_summary.csv')
     if os.path.exists(daily_summary_path):
-        daily_summary = pd.read_csv(daily_summary_path)
+        daily_summary = _read_table(daily_summary_path)
         daily_summary['date'] = pd.to_datetime(daily_summary['date'])
+        daily_summary = daily_summary.sort_values('date', ignore_index=True)
     else:
         st.error("ไม่พบข้อมูลสรุปรายวัน กรุณาสร้างข้อมูลก่อน")
         daily_summary = None
@@ -67,9 +84,14 @@ def load_data():
     individual_sensors = {}
     for i in range(1, 6):  # Assuming 5 sensors
         sensor_path = os.path.join(data_dir, f'sensor_{i}_data.csv')
-        if os.path.exists(sensor_path):
-            sensor_data = pd.read_csv(sensor_path)
+        partition_path = os.path.join(data_dir, 'sensors', f'sensor_id={i}')
+        if os.path.exists(sensor_path) or os.path.exists(partition_path):
+            sensor_data = _read_table(sensor_path, partition_path)
+            if sensor_data is None:
+                st.warning(f"ไม่สามารถอ่านข้อมูลของเซ็นเซอร์ {i} ได้")
+                continue
             sensor_data['timestamp'] = pd.to_datetime(sensor_data['timestamp'])
+            sensor_data = sensor_data.sort_values('timestamp', ignore_index=True)
             individual_sensors[f'sensor_{i}'] = sensor_data
     
     return {
@@ -0,0 +1,430 @@
+import hashlib
+import math
+
+import numpy as np
+import pandas as pd
+
+# Numba is optional: the kernels are JIT-compiled (and cached on disk) when it
+# is installed, otherwise the NumPy implementations below are used
+try:
+    from numba import njit, types
+except ImportError:
+    njit = None
+
+# Longest series whose Mann-Kendall score is computed from the full pairwise
+# difference matrix (n x n float64); longer ones use SciPy or the row-by-row kernels
+MK_OUTER_MAX_N = 2000
+
+# SciPy's kendalltau uses Knight's O(n log n) algorithm, which beats the
+# O(n^2) pair counting on long series
+try:
+    from scipy.stats import kendalltau
+except ImportError:
+    kendalltau = None
+
+# Rust-backed downsampler; falls back to the LTTB kernels when not installed
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+except ImportError:
+    MinMaxLTTBDownsampler = None
+
+def _lttb_edges(n, n_out):
+    """
+    Bucket edges for LTTB: the first and last points are always kept and the
+    points in between are split into n_out - 2 buckets.
+    """
+    return np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+def _lttb_numpy(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets with the inner search vectorized in NumPy.
+    """
+    n = len(y)
+    edges = _lttb_edges(n, n_out)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # Average point of the next bucket (the last point for the final bucket)
+        if i + 2 < len(edges):
+            next_x = x[end:edges[i + 2]].mean()
+            next_y = y[end:edges[i + 2]].mean()
+        else:
+            next_x = x[-1]
+            next_y = y[-1]
+
+        # Keep the point forming the largest triangle with the previous pick and the next average
+        area = np.abs(
+            (x[a] - next_x) * (y[start:end] - y[a]) -
+            (x[a] - x[start:end]) * (next_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+
+    return indices
+
+def _lttb_loop(x, y, n_out, edges):
+    """
+    Largest-Triangle-Three-Buckets as explicit loops, for Numba.
+    """
+    n = y.shape[0]
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[n_out - 1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start = edges[i]
+        end = edges[i + 1]
+
+        if i + 2 < edges.shape[0]:
+            next_end = edges[i + 2]
+            next_x = 0.0
+            next_y = 0.0
+            for j in range(end, next_end):
+                next_x += x[j]
+                next_y += y[j]
+            next_x /= next_end - end
+            next_y /= next_end - end
+        else:
+            next_x = x[n - 1]
+            next_y = y[n - 1]
+
+        best = start
+        best_area = -1.0
+        for j in range(start, end):
+            area = abs((x[a] - next_x) * (y[j] - y[a]) - (x[a] - x[j]) * (next_y - y[a]))
+            if area > best_area:
+                best_area = area
+                best = j
+        a = best
+        indices[i + 1] = a
+
+    return indices
+
+def _iqr_outliers_loop(x, lower_bound, upper_bound):
+    """
+    Indices of the values outside [lower_bound, upper_bound], for Numba.
+    """
+    count = 0
+    for i in range(x.shape[0]):
+        if x[i] < lower_bound or x[i] > upper_bound:
+            count += 1
+
+    indices = np.empty(count, dtype=np.int64)
+    k = 0
+    for i in range(x.shape[0]):
+        if x[i] < lower_bound or x[i] > upper_bound:
+            indices[k] = i
+            k += 1
+
+    return indices
+
+def _bin_reduce_loop(y, n_bins):
+    """
+    Positions of the minimum and maximum in each equal-count bin, for Numba.
+    """
+    n = y.shape[0]
+    edges = np.linspace(0, n, n_bins + 1).astype(np.int64)
+    indices = np.empty(2 * n_bins, dtype=np.int64)
+    k = 0
+    for b in range(n_bins):
+        start = edges[b]
+        end = edges[b + 1]
+        if end <= start:
+            continue
+
+        lo = start
+        hi = start
+        for j in range(start + 1, end):
+            if y[j] < y[lo]:
+                lo = j
+            if y[j] > y[hi]:
+                hi = j
+
+        # Keep the pair in time order
+        if lo <= hi:
+            indices[k] = lo
+            indices[k + 1] = hi
+        else:
+            indices[k] = hi
+            indices[k + 1] = lo
+        k += 2
+
+    return indices[:k]
+
+def _bin_reduce_numpy(y, n_bins):
+    """
+    Positions of the minimum and maximum in each equal-count bin, with the
+    search inside each bin done by NumPy.
+    """
+    edges = np.linspace(0, len(y), n_bins + 1).astype(np.int64)
+    indices = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end <= start:
+            continue
+        lo = start + int(np.argmin(y[start:end]))
+        hi = start + int(np.argmax(y[start:end]))
+        indices.extend((lo, hi) if lo <= hi else (hi, lo))
+
+    return np.asarray(indices, dtype=np.int64)
+
+def _kde_loop(x, grid, bandwidth):
+    """
+    Gaussian kernel density of x evaluated on grid, for Numba.
+    """
+    out = np.empty(grid.shape[0], dtype=np.float64)
+    norm = 1.0 / (x.shape[0] * bandwidth * np.sqrt(2.0 * np.pi))
+    for i in range(grid.shape[0]):
+        total = 0.0
+        for j in range(x.shape[0]):
+            d = (grid[i] - x[j]) / bandwidth
+            total += np.exp(-0.5 * d * d)
+        out[i] = total * norm
+
+    return out
+
+def _kde_numpy(x, grid, bandwidth):
+    """
+    Gaussian kernel density of x evaluated on grid, one grid point row at a time
+    in NumPy so the memory stays O(len(x)).
+    """
+    norm = 1.0 / (len(x) * bandwidth * np.sqrt(2.0 * np.pi))
+    return np.array([
+        np.exp(-0.5 * ((g - x) / bandwidth) ** 2).sum() for g in grid
+    ]) * norm
+
+def _mk_score_loop(y):
+    """
+    Mann-Kendall S statistic (concordant minus discordant pairs), for Numba.
+    """
+    n = y.shape[0]
+    s = 0
+    for i in range(n - 1):
+        yi = y[i]
+        for j in range(i + 1, n):
+            d = y[j] - yi
+            s += (d > 0) - (d < 0)
+
+    return s
+
+def _mk_score_outer(y):
+    """
+    Mann-Kendall S statistic from the full matrix of pairwise differences,
+    for series short enough that the n x n matrix fits comfortably in memory.
+    """
+    # Entry [i, j] is sign(y[j] - y[i]); the pairs with i < j lie above the diagonal
+    return int(np.triu(np.sign(y[np.newaxis, :] - y[:, np.newaxis]), 1).sum())
+
+def _mk_score_numpy(y):
+    """
+    Mann-Kendall S statistic, one row of pairs at a time in NumPy.
+    """
+    return int(sum(np.sign(y[i + 1:] - y[i]).sum() for i in range(len(y) - 1)))
+
+if njit is not None:
+    _lttb_jit = njit(cache=True)(_lttb_loop)
+    _iqr_outliers_jit = njit(cache=True)(_iqr_outliers_loop)
+    _bin_reduce_jit = njit(cache=True)(_bin_reduce_loop)
+    _kde_jit = njit(cache=True)(_kde_loop)
+    # Compiled up front for writable and read-only (e.g. pandas-backed)
+    # contiguous arrays, so neither triggers a compile on first use; NaNs are
+    # removed before the call, which makes fastmath safe here
+    _mk_score_jit = njit(
+        [
+            types.int64(types.float64[::1]),
+            types.int64(types.Array(types.float64, 1, 'C', readonly=True))
+        ],
+        cache=True,
+        fastmath=True
+    )(_mk_score_loop)
+
+def lttb_indices(x, y, n_out):
+    """
+    Select points with the Largest-Triangle-Three-Buckets algorithm.
+
+    Parameters:
+    - x: Numeric x values (e.g. timestamps as int64), sorted ascending
+    - y: Values to downsample
+    - n_out: Number of points to keep
+
+    Returns:
+    - Sorted array of the indices of the selected points
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+
+    if njit is not None:
+        return _lttb_jit(x, y, n_out, _lttb_edges(n, n_out))
+
+    return _lttb_numpy(x, y, n_out)
+
+def downsample_indices(x, y, n_out):
+    """
+    Get the indices of the points to plot for a long time series.
+
+    Parameters:
+    - x: Timestamps as int64, sorted ascending
+    - y: Values to downsample
+    - n_out: Maximum number of points to keep
+
+    Returns:
+    - Array of indices into x and y
+    """
+    if len(y) <= n_out:
+        return np.arange(len(y))
+
+    if MinMaxLTTBDownsampler is not None:
+        return MinMaxLTTBDownsampler().downsample(x, y, n_out=n_out)
+
+    # MinMaxLTTB: preselect the min and max of each bin, then run LTTB on
+    # the much shorter candidate set. The first and last points are always
+    # candidates, so the plot spans the whole series
+    if len(y) > 4 * n_out:
+        candidates = np.union1d(bin_reduce(y, 2 * n_out), [0, len(y) - 1])
+        return candidates[lttb_indices(x[candidates], y[candidates], n_out)]
+
+    return lttb_indices(x, y, n_out)
+
+def iqr_outliers(x, lower_bound, upper_bound):
+    """
+    Find the values outside the IQR fences.
+
+    Parameters:
+    - x: Values to check
+    - lower_bound: Lower fence
+    - upper_bound: Upper fence
+
+    Returns:
+    - Array of the indices of the outliers
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+
+    if njit is not None:
+        return _iqr_outliers_jit(x, float(lower_bound), float(upper_bound))
+
+    # A value is outside the fences when its distance from the midpoint
+    # exceeds half the width, so one comparison covers both sides
+    center = 0.5 * (lower_bound + upper_bound)
+    half_width = 0.5 * (upper_bound - lower_bound)
+    return np.flatnonzero(np.abs(x - center) > half_width)
+
+def bin_reduce(y, n_bins):
+    """
+    Min/max downsampling: keep the smallest and largest value of each bin.
+
+    Parameters:
+    - y: Values to downsample
+    - n_bins: Number of equal-count bins
+
+    Returns:
+    - Sorted array of at most 2 * n_bins indices
+    """
+    y = np.ascontiguousarray(y, dtype=np.float64)
+
+    if njit is not None:
+        return _bin_reduce_jit(y, n_bins)
+
+    return _bin_reduce_numpy(y, n_bins)
+
+def gaussian_kde(x, grid, bandwidth=None):
+    """
+    Gaussian kernel density estimate.
+
+    Parameters:
+    - x: Sample values (NaNs are ignored)
+    - grid: Points to evaluate the density at
+    - bandwidth: Kernel standard deviation (default: Scott's rule)
+
+    Returns:
+    - Array of densities, one per grid point (zeros when x has no spread)
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    x = x[np.isfinite(x)]
+    grid = np.ascontiguousarray(grid, dtype=np.float64)
+
+    if bandwidth is None:
+        bandwidth = np.std(x, ddof=1) * len(x) ** (-1 / 5) if len(x) > 1 else 0.0
+    if not bandwidth > 0:
+        return np.zeros(len(grid))
+
+    if njit is not None:
+        return _kde_jit(x, grid, float(bandwidth))
+
+    return _kde_numpy(x, grid, bandwidth)
+
+def mann_kendall(y):
+    """
+    Mann-Kendall trend test with the normal approximation and tie correction, or
+    SciPy's exact p-value where kendalltau's default method would use it (short
+    series without ties).
+
+    Parameters:
+    - y: Values in time order (NaNs are ignored)
+
+    Returns:
+    - Tuple of (Kendall's tau-b against time, two-sided p-value); NaNs for fewer than 3 values
+    """
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    y = y[~np.isnan(y)]
+    n = len(y)
+    if n < 3:
+        return np.nan, np.nan
+
+    # Against time (which has no ties) tau-b and its asymptotic p-value are the
+    # Mann-Kendall statistics below
+    if n > MK_OUTER_MAX_N and kendalltau is not None:
+        result = kendalltau(np.arange(n), y, variant='b', method='asymptotic')
+        return float(result.statistic), float(result.pvalue)
+    
+    if n <= MK_OUTER_MAX_N:
+        s = _mk_score_outer(y)
+    elif njit is not None:
+        s = _mk_score_jit(y)
+    else:
+        s = _mk_score_numpy(y)
+
+    # Tied values shrink both the tau denominator and the variance of S
+    _, ties = np.unique(y, return_counts=True)
+    ties = ties.astype(np.float64)
+    n_pairs = n * (n - 1) / 2
+    tied_pairs = (ties * (ties - 1) / 2).sum()
+    var_s = (n * (n - 1) * (2 * n + 5) - (ties * (ties - 1) * (2 * ties + 5)).sum()) / 18
+
+    if n_pairs == tied_pairs:
+        return np.nan, np.nan
+
+    # The normal approximation is poor for short series, where it can flip
+    # significance; without ties the exact distribution of S is known
+    discordant = (n_pairs - s) / 2
+    if kendalltau is not None and tied_pairs == 0 and (n <= 33 or min(discordant, n_pairs - discordant) <= 1):
+        result = kendalltau(np.arange(n), y, variant='b', method='exact')
+        return float(result.statistic), float(result.pvalue)
+
+    tau = s / math.sqrt(n_pairs * (n_pairs - tied_pairs))
+    p_value = math.erfc(abs(s / math.sqrt(var_s)) / math.sqrt(2))
+    return tau, p_value
+
+def frame_fingerprint(df):
+    """
+    Hash of a DataFrame's column names and contents, for cache keys that must
+    change whenever the data does (e.g. after it is regenerated or corrected).
+
+    Parameters:
+    - df: DataFrame to fingerprint
+
+    Returns:
+    - Hex digest string
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
@@ -1,9 +1,330 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 
+# Display names for the sensor parameters, in the order they are shown
+PARAM_DISPLAY = {
+    'ph': 'pH',
+    'humidity': 'ความชื้น',
+    'temp': 'อุณหภูมิ',
+    'conductivity': 'การนำไฟฟ้า',
+    'nitrogen': 'N',
+    'phosphorus': 'P',
+    'potassium': 'K',
+    'dissolved_oxygen': 'ออกซิเจนละลาย',
+    'turbidity': 'ความขุ่น',
+}
+
+# Title and y-axis label of the daily trend chart for each parameter
+DAILY_TREND_CHARTS = {
+    'ph': ("ค่าเฉลี่ย pH รายวัน (7 วันล่าสุด)", "pH"),
+    'humidity': ("ค่าเฉลี่ยความชื้นรายวัน (7 วันล่าสุด)", "ความชื้น (%)"),
+    'temp': ("ค่าเฉลี่ยอุณหภูมิรายวัน (7 วันล่าสุด)", "อุณหภูมิ (°C)"),
+    'conductivity': ("ค่าเฉลี่ยการนำไฟฟ้ารายวัน (7 วันล่าสุด)", "การนำไฟฟ้า (μS/cm)"),
+    'nitrogen': ("ค่าเฉลี่ยไนโตรเจนรายวัน (7 วันล่าสุด)", "ไนโตรเจน (mg/kg)"),
+    'phosphorus': ("ค่าเฉลี่ยฟอสฟอรัสรายวัน (7 วันล่าสุด)", "ฟอสฟอรัส (mg/kg)"),
+    'potassium': ("ค่าเฉลี่ยโพแทสเซียมรายวัน (7 วันล่าสุด)", "โพแทสเซียม (mg/kg)"),
+    'dissolved_oxygen': ("ค่าเฉลี่ยออกซิเจนละลายรายวัน (7 วันล่าสุด)", "ออกซิเจนละลาย (mg/L)"),
+    'turbidity': ("ค่าเฉลี่ยความขุ่นรายวัน (7 วันล่าสุด)", "ความขุ่น (NTU)"),
+}
+
+# Daily trend selector labels (in display order) and the parameter each one shows
+TREND_TAB_PARAMS = {
+    "pH": 'ph',
+    "ความชื้น": 'humidity',
+    "อุณหภูมิ": 'temp',
+    "การนำไฟฟ้า": 'conductivity',
+    "NPK": None,
+    "ออกซิเจนละลาย": 'dissolved_oxygen',
+    "ความขุ่น": 'turbidity',
+}
+NPK_TAB_PARAMS = {
+    "ไนโตรเจน (N)": 'nitrogen',
+    "ฟอสฟอรัส (P)": 'phosphorus',
+    "โพแทสเซียม (K)": 'potassium',
+}
+
+@st.cache_data(show_spinner=False)
+def _daily_fig_dict(param, l7_hash, sensors_present, _last_7_days, with_range=False):
+    """
+    Build the daily-average trend chart for one parameter as a plain figure dict.
+    
+    Parameters:
+    - param: Parameter suffix used in the daily summary columns (e.g. 'ph')
+    - l7_hash: Fingerprint of the 7-day window, used as the cache key
+    - sensors_present: Tuple of (sensor_id, display name) pairs that have data for the parameter
+    - _last_7_days: Daily summary rows to plot (not hashed by Streamlit)
+    - with_range: Whether to add a shaded min/max band for each sensor
+    
+    Returns:
+    - Figure as a dict, ready to be rehydrated with go.Figure
+    """
+    title, yaxis_title = DAILY_TREND_CHARTS[param]
+    dates = _last_7_days['date'].to_numpy()
+    
+    # Pull all sensors' averages for the parameter as one (days, sensors) matrix;
+    # float32 keeps ~7 significant digits, plenty for the readings, at half the payload
+    avg_matrix = _last_7_days[[f'sensor_{i}_{param}_avg' for i, _ in sensors_present]].to_numpy(dtype=np.float32)
+    
+    # The min/max band outline runs forward along the max and back along the min,
+    # so every sensor shares the same closed ring of dates
+    x_ring = np.concatenate([dates, dates[::-1]])
+    
+    traces = []
+    for (i, name), avg in zip(sensors_present, avg_matrix.T):
+        # Add a line for the average
+        traces.append(go.Scatter(
+            x=dates,
+            y=avg,
+            mode='lines+markers',
+            name=name
+        ))
+        
+        if with_range:
+            # Add a range for min/max
+            y_max = _last_7_days[f'sensor_{i}_{param}_max'].to_numpy(dtype=np.float32)
+            y_min = _last_7_days[f'sensor_{i}_{param}_min'].to_numpy(dtype=np.float32)
+            traces.append(go.Scatter(
+                x=x_ring,
+                y=np.concatenate([y_max, y_min[::-1]]),
+                fill='toself',
+                fillcolor=f'rgba(0, 100, 80, 0.2)',
+                line=dict(color='rgba(255, 255, 255, 0)'),
+                showlegend=False,
+                name=f"{name} Range"
+            ))
+    
+    fig = go.Figure(data=traces)
+    fig.update_layout(
+        title=title,
+        xaxis_title="วันที่",
+        yaxis_title=yaxis_title,
+        legend_title="เซ็นเซอร์",
+        hovermode="x unified"
+    )
+    
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False)
+def _sensor_ids(columns):
+    """
+    Get the IDs of the sensors present in the combined data.
+    
+    Parameters:
+    - columns: Tuple of combined data column names
+    
+    Returns:
+    - Sorted tuple of sensor IDs that have a pH column
+    """
+    return tuple(sorted(int(col.split('_')[1]) for col in columns if col.endswith('_ph')))
+
+@st.cache_resource(show_spinner=False)
+def _daily_trend_fig(param, l7_hash, sensors_present, _last_7_days, with_range=False, ref_lines=()):
+    """
+    Get the shared daily trend figure for one parameter.
+    
+    Parameters:
+    - param: Parameter suffix used in the daily summary columns (e.g. 'ph')
+    - l7_hash: Fingerprint of the 7-day window, used as the cache key
+    - sensors_present: Tuple of (sensor_id, display name) pairs that have data for the parameter
+    - _last_7_days: Daily summary rows to plot (not hashed by Streamlit)
+    - with_range: Whether to add a shaded min/max band for each sensor
+    - ref_lines: Y values at which to draw dashed red reference lines
+    
+    Returns:
+    - Plotly figure (shared between reruns, do not modify)
+    """
+    fig = go.Figure(_daily_fig_dict(param, l7_hash, sensors_present, _last_7_days, with_range=with_range))
+    
+    for y in ref_lines:
+        fig.add_shape(
+            type="line",
+            x0=_last_7_days['date'].min(),
+            y0=y,
+            x1=_last_7_days['date'].max(),
+            y1=y,
+            line=dict(color="red", width=2, dash="dash"),
+        )
+    
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def _build_map_fig(lat_bytes, lon_bytes, colors, names, hover_texts):
+    """
+    Build the sensor location map.
+    
+    Parameters:
+    - lat_bytes: Latitudes as float32 bytes
+    - lon_bytes: Longitudes as float32 bytes
+    - colors: Tuple with the pH status color of each sensor
+    - names: Tuple with the location name of each sensor
+    - hover_texts: Tuple with the hover text of each sensor
+    
+    Returns:
+    - Plotly figure (shared between reruns, do not modify)
+    """
+    # Add all sensors as a single trace colored per marker by status
+    fig = go.Figure(go.Scattermapbox(
+        lat=np.frombuffer(lat_bytes, dtype=np.float32),
+        lon=np.frombuffer(lon_bytes, dtype=np.float32),
+        mode='markers',
+        marker=dict(
+            size=15,
+            color=list(colors)
+        ),
+        text=names,
+        hovertext=hover_texts,
+        hoverinfo='text'
+    ))
+    
+    # Set map layout
+    fig.update_layout(
+        mapbox=dict(
+            style="open-street-map",
+            center={"lat": 15.8700, "lon": 100.9925},  # Center on Thailand
+            zoom=5
+        ),
+        margin={"r": 0, "t": 0, "l": 0, "b": 0},
+        height=400,
+        showlegend=False
+    )
+    
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _soil_type_counts(sensor_info):
+    """
+    Count the sensors of each soil type.
+    
+    Parameters:
+    - sensor_info: DataFrame with sensor metadata
+    
+    Returns:
+    - DataFrame with the soil type and number of sensors
+    """
+    return (
+        sensor_info['water_type'].value_counts()
+        .rename_axis('ประเภทดิน')
+        .reset_index(name='จำนวน')
+    )
+
+@st.cache_resource(show_spinner=False)
+def _build_soil_type_pie(soil_type_counts):
+    """
+    Build the pie chart of sensors per soil type.
+    
+    Parameters:
+    - soil_type_counts: DataFrame from _soil_type_counts
+    
+    Returns:
+    - Plotly figure (shared between reruns, do not modify)
+    """
+    return px.pie(
+        soil_type_counts,
+        values='จำนวน',
+        names='ประเภทดิน',
+        title='เซ็นเซอร์ตามประเภทดิน',
+        hole=0.4
+    )
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _parse_map_data(sensor_info, latest_data):
+    """
+    Build the sensor map table with coordinates and the latest pH status.
+    
+    Parameters:
+    - sensor_info: DataFrame with sensor metadata
+    - latest_data: Series with the latest reading of every sensor column
+    
+    Returns:
+    - DataFrame with latitude, longitude, latest_ph, status, color and hover_text
+    """
+    # Create a dataframe for the map
+    map_data = sensor_info.copy()
+    
+    # Extract latitude and longitude from coordinates
+    coords = map_data['coordinates'].str.extract(r'([-\d.]+)°\s*[NS]?,?\s+([-\d.]+)°')
+    map_data[['latitude', 'longitude']] = coords.astype('float32')
+    
+    # Add latest pH values and color them by status
+    ph_cols = [f'sensor_{sensor_id}_ph' for sensor_id in map_data['sensor_id']]
+    ph = latest_data.reindex(ph_cols).to_numpy(dtype=float)
+    conditions = [ph < 6.5, ph > 8.5]
+    map_data['latest_ph'] = ph
+    map_data['status'] = np.select(conditions, ["เป็นกรด", "เป็นด่าง"], default="ปกติ")
+    map_data['color'] = np.select(conditions, ["red", "purple"], default="green")
+    
+    # Create a new column for hover text that includes soil type
+    ph_str = map_data['latest_ph'].map('{:.2f}'.format)
+    map_data['hover_text'] = (
+        "ประเภทดิน: " + map_data['water_type']
+        + "<br>pH: " + ph_str
+        + "<br>สถานะ: " + map_data['status']
+    )
+    
+    return map_data
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _build_latest_df(latest_data, sensor_info, sensor_ids):
+    """
+    Build the latest-readings table with one row per sensor.
+    
+    Parameters:
+    - latest_data: Series with the latest reading of every sensor column
+    - sensor_info: DataFrame with sensor metadata
+    - sensor_ids: Tuple of sensor IDs, one row each
+    
+    Returns:
+    - DataFrame with the sensor ID, location and the latest value of each parameter
+    """
+    # Split the sensor columns into (sensor_id, param) pairs
+    parts = latest_data.index.to_series().str.extract(r'^sensor_(\d+)_(.+)$')
+    readings = pd.DataFrame({
+        'sensor_id': pd.to_numeric(parts[0]),
+        'param': parts[1],
+        'value': pd.to_numeric(latest_data, errors='coerce')
+    })
+    readings = readings[readings['param'].isin(PARAM_DISPLAY.keys())]
+    
+    # Reshape into one row per sensor with the parameters in display order
+    # (pH first, followed by humidity and temperature, then the rest)
+    latest_df = readings.pivot(index='sensor_id', columns='param', values='value')
+    latest_df = latest_df.reindex(
+        index=list(sensor_ids),
+        columns=[param for param in PARAM_DISPLAY if param in latest_df.columns]
+    ).rename(columns=PARAM_DISPLAY)
+    latest_df.columns.name = None
+    latest_df = latest_df.rename_axis('รหัสเซ็นเซอร์').reset_index()
+    
+    # Look up the location names for all sensors in one pass
+    loc_by_id = sensor_info.set_index('sensor_id')['location_name']
+    latest_df.insert(
+        1, 'ตำแหน่ง',
+        latest_df['รหัสเซ็นเซอร์'].map(loc_by_id).fillna('เซ็นเซอร์ ' + latest_df['รหัสเซ็นเซอร์'].astype(str))
+    )
+    
+    return latest_df
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _last_n_days(daily_summary, n=7):
+    """
+    Get the daily summary rows for the last n days.
+    
+    Parameters:
+    - daily_summary: DataFrame with the daily summary, sorted by date
+    - n: Number of days to keep (default: 7)
+    
+    Returns:
+    - DataFrame with the rows of the last n days
+    """
+    # The summary is sorted by date, so the window is a tail slice
+    dates = daily_summary['date']
+    start = dates.searchsorted(dates.iat[-1] - timedelta(days=n), side='left')
+    return daily_summary.iloc[start:]
+
 def show_overview_dashboard(data):
     """
     Display the overview dashboard showing summary of all sensors.
@@ -19,14 +340,18 @@ def show_overview_dashboard(data):
     sensor_info = data['sensor_info']
     daily_summary = data['daily_summary']
     
-    # Get the latest data for each sensor
-    latest_data = combined_data.iloc[-1].copy()
+    # Map sensor IDs to location names once for all lookups below
+    loc_map = dict(zip(sensor_info['sensor_id'].tolist(), sensor_info['location_name'].tolist()))
+    
+    # Get the latest data for each sensor (sensor columns only, read-only)
+    latest_data = combined_data.iloc[-1].drop(labels=['timestamp'], errors='ignore')
     
     # Create columns for the metrics
     col1, col2, col3, col4, col5 = st.columns(5)
     
     # Display the number of sensors
-    num_sensors = len([col for col in combined_data.columns if col.endswith('_ph')])
+    sensor_ids = _sensor_ids(tuple(combined_data.columns))
+    num_sensors = len(sensor_ids)
     col1.metric("จำนวนเซ็นเซอร์", num_sensors)
     
     # Display the total number of readings
@@ -40,7 +365,9 @@ def show_overview_dashboard(data):
     col3.metric("ช่วงวันที่", date_range)
     
     # Display the average reading frequency
-    time_diff = combined_data['timestamp'].diff().mean()
+    # Readings are in time order, so the mean interval is the total span over the gaps
+    ts = combined_data['timestamp']
+    time_diff = (ts.iat[-1] - ts.iat[0]) / max(len(ts) - 1, 1)
     minutes = int(time_diff.total_seconds() / 60)
     col4.metric("ความถี่การอ่านค่าเฉลี่ย", f"{minutes} นาที")
     
@@ -56,82 +383,20 @@ def show_overview_dashboard(data):
     with col1:
         st.subheader("ตำแหน่งเซ็นเซอร์")
         
-        # Create a dataframe for the map
-        map_data = sensor_info.copy()
-        
-        # Extract latitude and longitude from coordinates
-        map_data['latitude'] = map_data['coordinates'].apply(
-            lambda x: float(x.split('°')[0].strip())
-        )
-        map_data['longitude'] = map_data['coordinates'].apply(
-            lambda x: float(x.split('°')[1].strip().split(' ')[1])
-        )
-        
-        # Add latest pH values
-        for i, row in map_data.iterrows():
-            sensor_id = row['sensor_id']
-            ph_col = f'sensor_{sensor_id}_ph'
-            if ph_col in latest_data:
-                map_data.loc[i, 'latest_ph'] = latest_data[ph_col]
-                
-                # Add color based on pH value
-                ph = latest_data[ph_col]
-                if ph < 6.5:
-                    map_data.loc[i, 'status'] = "เป็นกรด"
-                    map_data.loc[i, 'color'] = "red"
-                elif ph > 8.5:
-                    map_data.loc[i, 'status'] = "เป็นด่าง"
-                    map_data.loc[i, 'color'] = "purple"
-                else:
-                    map_data.loc[i, 'status'] = "ปกติ"
-                    map_data.loc[i, 'color'] = "green"
-        
-        # Create a new column for hover text that includes soil type
-        map_data['hover_text'] = map_data.apply(
-            lambda row: f"ประเภทดิน: {row['water_type']}<br>pH: {row['latest_ph']:.2f}<br>สถานะ: {row['status']}",
-            axis=1
-        )
+        # Build the map data with the latest pH status of each sensor
+        map_data = _parse_map_data(sensor_info, latest_data)
         
         # Create the map centered on Thailand using Scattermapbox directly
-        fig = go.Figure()
-        
-        # Add points for each sensor
-        for status in ["ปกติ", "เป็นกรด", "เป็นด่าง"]:
-            df_status = map_data[map_data['status'] == status]
-            if not df_status.empty:
-                fig.add_trace(go.Scattermapbox(
-                    lat=df_status['latitude'],
-                    lon=df_status['longitude'],
-                    mode='markers',
-                    marker=dict(
-                        size=15,
-                        color={"ปกติ": "green", "เป็นกรด": "red", "เป็นด่าง": "purple"}[status]
-                    ),
-                    text=df_status['location_name'],
-                    hovertext=df_status['hover_text'],
-                    hoverinfo='text',
-                    name=status
-                ))
-        
-        # Set map layout
-        fig.update_layout(
-            mapbox=dict(
-                style="open-street-map",
-                center={"lat": 15.8700, "lon": 100.9925},  # Center on Thailand
-                zoom=5
-            ),
-            margin={"r": 0, "t": 0, "l": 0, "b": 0},
-            height=400,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
+        fig = _build_map_fig(
+            map_data['latitude'].to_numpy(dtype=np.float32).tobytes(),
+            map_data['longitude'].to_numpy(dtype=np.float32).tobytes(),
+            tuple(map_data['color']),
+            tuple(map_data['location_name']),
+            tuple(map_data['hover_text'])
         )
         
         st.plotly_chart(fig, use_container_width=True)
+        st.caption("🟢 ปกติ · 🔴 เป็นกรด · 🟣 เป็นด่าง")
     
     with col2:
         st.subheader("ข้อมูลเซ็นเซอร์")
@@ -145,16 +410,7 @@ def show_overview_dashboard(data):
         )
         
         # Display a pie chart of soil types
-        soil_type_counts = sensor_info['water_type'].value_counts().reset_index()
-        soil_type_counts.columns = ['ประเภทดิน', 'จำนวน']
-        
-        fig = px.pie(
-            soil_type_counts,
-            values='จำนวน',
-            names='ประเภทดิน',
-            title='เซ็นเซอร์ตามประเภทดิน',
-            hole=0.4
-        )
+        fig = _build_soil_type_pie(_soil_type_counts(sensor_info))
         
         st.plotly_chart(fig, use_container_width=True)
     
@@ -164,418 +420,76 @@ def show_overview_dashboard(data):
     st.subheader("ค่าล่าสุดจากเซ็นเซอร์")
     
     # Create a dataframe for the latest readings
-    latest_readings = []
+    latest_df = _build_latest_df(latest_data, sensor_info, sensor_ids)
     
-    for i in range(1, num_sensors + 1):
-        sensor_data = {}
-        sensor_data['รหัสเซ็นเซอร์'] = i
-        
-        # Get the location name
-        sensor_info_row = sensor_info[sensor_info['sensor_id'] == i]
-        if not sensor_info_row.empty:
-            sensor_data['ตำแหน่ง'] = sensor_info_row['location_name'].values[0]
-        else:
-            sensor_data['ตำแหน่ง'] = f"เซ็นเซอร์ {i}"
-        
-        # Get the latest readings in the specified order
-        # pH first, followed by humidity and temperature, then the rest
-        for param in ['ph', 'humidity', 'temp', 'conductivity', 'nitrogen', 'phosphorus', 'potassium', 'dissolved_oxygen', 'turbidity']:
-            col = f'sensor_{i}_{param}'
-            if col in latest_data:
-                # Format the parameter name for display
-                if param == 'ph':
-                    param_name = 'pH'
-                elif param == 'temp':
-                    param_name = 'อุณหภูมิ'
-                elif param == 'humidity':
-                    param_name = 'ความชื้น'
-                elif param == 'conductivity':
-                    param_name = 'การนำไฟฟ้า'
-                elif param == 'nitrogen':
-                    param_name = 'N'
-                elif param == 'phosphorus':
-                    param_name = 'P'
-                elif param == 'potassium':
-                    param_name = 'K'
-                elif param == 'dissolved_oxygen':
-                    param_name = 'ออกซิเจนละลาย'
-                elif param == 'turbidity':
-                    param_name = 'ความขุ่น'
-                else:
-                    param_name = param.capitalize()
-                
-                sensor_data[param_name] = latest_data[col]
-        
-        latest_readings.append(sensor_data)
-    
-    latest_df = pd.DataFrame(latest_readings)
-    
-    # Function to color code pH values
-    def color_ph(val):
-        if val < 6.5:
-            return 'background-color: rgba(255, 0, 0, 0.2)'
-        elif val > 8.5:
-            return 'background-color: rgba(128, 0, 128, 0.2)'
-        else:
-            return 'background-color: rgba(0, 128, 0, 0.2)'
-    
-    # Apply styling (using .map instead of .applymap which is deprecated)
-    # Check if 'pH' column exists in the DataFrame
+    # Show the pH status as a plain column instead of styling cells, which
+    # is much cheaper for st.dataframe to render
     if 'pH' in latest_df.columns:
-        styled_df = latest_df.style.map(
-            color_ph, subset=['pH']
+        ph = latest_df['pH'].to_numpy()
+        latest_df.insert(
+            latest_df.columns.get_loc('pH') + 1, 'สถานะ pH',
+            np.select([ph < 6.5, ph > 8.5], ["เป็นกรด", "เป็นด่าง"], default="ปกติ")
         )
-    else:
-        styled_df = latest_df.style
     
-    st.dataframe(styled_df, use_container_width=True)
+    st.dataframe(
+        latest_df,
+        use_container_width=True,
+        column_config={
+            'pH': st.column_config.NumberColumn('pH', format="%.2f")
+        }
+    )
     
     st.markdown("---")
     
     # Create a section for the daily trends
     st.subheader("แนวโน้มรายวัน")
     
-    # Create tabs for different parameters (in the specified order)
-    tabs = st.tabs(["pH", "ความชื้น", "อุณหภูมิ", "การนำไฟฟ้า", "NPK", "ออกซิเจนละลาย", "ความขุ่น"])
-    
     # Get the last 7 days of data
-    last_7_days = daily_summary[daily_summary['date'] >= (daily_summary['date'].max() - timedelta(days=7))]
-    
-    # pH tab
-    with tabs[0]:
-        fig = go.Figure()
-        
-        for i in range(1, num_sensors + 1):
-            avg_col = f'sensor_{i}_ph_avg'
-            min_col = f'sensor_{i}_ph_min'
-            max_col = f'sensor_{i}_ph_max'
-            
-            if avg_col in last_7_days.columns:
-                # Get the location name
-                sensor_info_row = sensor_info[sensor_info['sensor_id'] == i]
-                if not sensor_info_row.empty:
-                    name = f"เซ็นเซอร์ {i} ({sensor_info_row['location_name'].values[0]})"
-                else:
-                    name = f"เซ็นเซอร์ {i}"
-                
-                # Add a line for the average
-                fig.add_trace(go.Scatter(
-                    x=last_7_days['date'],
-                    y=last_7_days[avg_col],
-                    mode='lines+markers',
-                    name=name
-                ))
-                
-                # Add a range for min/max
-                fig.add_trace(go.Scatter(
-                    x=last_7_days['date'].tolist() + last_7_days['date'].tolist()[::-1],
-                    y=last_7_days[max_col].tolist() + last_7_days[min_col].tolist()[::-1],
-                    fill='toself',
-                    fillcolor=f'rgba(0, 100, 80, 0.2)',
-                    line=dict(color='rgba(255, 255, 255, 0)'),
-                    showlegend=False,
-                    name=f"{name} Range"
-                ))
-        
-        # Add reference lines for normal pH range
-        fig.add_shape(
-            type="line",
-            x0=last_7_days['date'].min(),
-            y0=6.5,
-            x1=last_7_days['date'].max(),
-            y1=6.5,
-            line=dict(color="red", width=2, dash="dash"),
-        )
-        
-        fig.add_shape(
-            type="line",
-            x0=last_7_days['date'].min(),
-            y0=8.5,
-            x1=last_7_days['date'].max(),
-            y1=8.5,
-            line=dict(color="red", width=2, dash="dash"),
+    last_7_days = _last_n_days(daily_summary, n=7)
+    
+    # Fingerprint the 7-day window so cached figures are reused until the data changes
+    l7_hash = int(pd.util.hash_pandas_object(last_7_days, index=False).sum())
+    
+    # Select the parameter (in the specified order); only the selected chart is built
+    active = st.radio(
+        "พารามิเตอร์",
+        list(TREND_TAB_PARAMS),
+        horizontal=True,
+        key='overview_trend_tab',
+        label_visibility="collapsed"
+    )
+    if active == "NPK":
+        # Second-level selection for N, P, K
+        active_npk = st.radio(
+            "ธาตุอาหาร",
+            list(NPK_TAB_PARAMS),
+            horizontal=True,
+            key='overview_trend_npk_tab',
+            label_visibility="collapsed"
         )
-        
-        fig.update_layout(
-            title="ค่าเฉลี่ย pH รายวัน (7 วันล่าสุด)",
-            xaxis_title="วันที่",
-            yaxis_title="pH",
-            legend_title="เซ็นเซอร์",
-            hovermode="x unified"
+        param = NPK_TAB_PARAMS[active_npk]
+    else:
+        param = TREND_TAB_PARAMS[active]
+    
+    # Resolve the sensors (and their display names) that have data for the parameter
+    sensors_present = tuple(
+        (i, f"เซ็นเซอร์ {i} ({loc_map[i]})" if i in loc_map else f"เซ็นเซอร์ {i}")
+        for i in sensor_ids
+        if f'sensor_{i}_{param}_avg' in last_7_days.columns
+    )
+    
+    if param == 'ph':
+        # Red dashed reference lines mark the normal pH range
+        fig = _daily_trend_fig(
+            'ph', l7_hash, sensors_present, last_7_days,
+            with_range=True, ref_lines=(6.5, 8.5)
         )
-        
         st.plotly_chart(fig, use_container_width=True)
         
         st.info(
             "เส้นประสีแดงแสดงช่วง pH ปกติ (6.5 - 8.5) "
             "ค่าที่อยู่นอกช่วงนี้อาจต้องได้รับการตรวจสอบ"
         )
-    
-    # Humidity tab (inserted after pH and before Temperature)
-    with tabs[1]:
-        fig = go.Figure()
-        
-        for i in range(1, num_sensors + 1):
-            avg_col = f'sensor_{i}_humidity_avg'
-            
-            if avg_col in last_7_days.columns:
-                # Get the location name
-                sensor_info_row = sensor_info[sensor_info['sensor_id'] == i]
-                if not sensor_info_row.empty:
-                    name = f"เซ็นเซอร์ {i} ({sensor_info_row['location_name'].values[0]})"
-                else:
-                    name = f"เซ็นเซอร์ {i}"
-                
-                # Add a line for the average
-                fig.add_trace(go.Scatter(
-                    x=last_7_days['date'],
-                    y=last_7_days[avg_col],
-                    mode='lines+markers',
-                    name=name
-                ))
-        
-        fig.update_layout(
-            title="ค่าเฉลี่ยความชื้นรายวัน (7 วันล่าสุด)",
-            xaxis_title="วันที่",
-            yaxis_title="ความชื้น (%)",
-            legend_title="เซ็นเซอร์",
-            hovermode="x unified"
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-    
-    # Temperature tab
-    with tabs[2]:
-        fig = go.Figure()
-        
-        for i in range(1, num_sensors + 1):
-            avg_col = f'sensor_{i}_temp_avg'
-            
-            if avg_col in last_7_days.columns:
-                # Get the location name
-                sensor_info_row = sensor_info[sensor_info['sensor_id'] == i]
-                if not sensor_info_row.empty:
-                    name = f"เซ็นเซอร์ {i} ({sensor_info_row['location_name'].values[0]})"
-                else:
-                    name = f"เซ็นเซอร์ {i}"
-                
-                # Add a line for the average
-                fig.add_trace(go.Scatter(
-                    x=last_7_days['date'],
-                    y=last_7_days[avg_col],
-                    mode='lines+markers',
-                    name=name
-                ))
-        
-        fig.update_layout(
-            title="ค่าเฉลี่ยอุณหภูมิรายวัน (7 วันล่าสุด)",
-            xaxis_title="วันที่",
-            yaxis_title="อุณหภูมิ (°C)",
-            legend_title="เซ็นเซอร์",
-            hovermode="x unified"
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-    
-    # Conductivity tab
-    with tabs[3]:
-        fig = go.Figure()
-        
-        for i in range(1, num_sensors + 1):
-            avg_col = f'sensor_{i}_conductivity_avg'
-            
-            if avg_col in last_7_days.columns:
-                # Get the location name
-                sensor_info_row = sensor_info[sensor_info['sensor_id'] == i]
-                if not sensor_info_row.empty:
-                    name = f"เซ็นเซอร์ {i} ({sensor_info_row['location_name'].values[0]})"
-                else:
-                    name = f"เซ็นเซอร์ {i}"
-                
-                # Add a line for the average
-                fig.add_trace(go.Scatter(
-                    x=last_7_days['date'],
-                    y=last_7_days[avg_col],
-                    mode='lines+markers',
-                    name=name
-                ))
-        
-        fig.update_layout(
-            title="ค่าเฉลี่ยการนำไฟฟ้ารายวัน (7 วันล่าสุด)",
-            xaxis_title="วันที่",
-            yaxis_title="การนำไฟฟ้า (μS/cm)",
-            legend_title="เซ็นเซอร์",
-            hovermode="x unified"
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-    
-    # NPK tab (Nitrogen, Phosphorus, Potassium)
-    with tabs[4]:
-        # Create subtabs for N, P, K
-        npk_tabs = st.tabs(["ไนโตรเจน (N)", "ฟอสฟอรัส (P)", "โพแทสเซียม (K)"])
-        
-        # Nitrogen subtab
-        with npk_tabs[0]:
-            fig = go.Figure()
-            
-            for i in range(1, num_sensors + 1):
-                avg_col = f'sensor_{i}_nitrogen_avg'
-                
-                if avg_col in last_7_days.columns:
-                    # Get the location name
-                    sensor_info_row = sensor_info[sensor_info['sensor_id'] == i]
-                    if not sensor_info_row.empty:
-                        name = f"เซ็นเซอร์ {i} ({sensor_info_row['location_name'].values[0]})"
-                    else:
-                        name = f"เซ็นเซอร์ {i}"
-                    
-                    # Add a line for the average
-                    fig.add_trace(go.Scatter(
-                        x=last_7_days['date'],
-                        y=last_7_days[avg_col],
-                        mode='lines+markers',
-                        name=name
-                    ))
-            
-            fig.update_layout(
-                title="ค่าเฉลี่ยไนโตรเจนรายวัน (7 วันล่าสุด)",
-                xaxis_title="วันที่",
-                yaxis_title="ไนโตรเจน (mg/kg)",
-                legend_title="เซ็นเซอร์",
-                hovermode="x unified"
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # Phosphorus subtab
-        with npk_tabs[1]:
-            fig = go.Figure()
-            
-            for i in range(1, num_sensors + 1):
-                avg_col = f'sensor_{i}_phosphorus_avg'
-                
-                if avg_col in last_7_days.columns:
-                    # Get the location name
-                    sensor_info_row = sensor_info[sensor_info['sensor_id'] == i]
-                    if not sensor_info_row.empty:
-                        name = f"เซ็นเซอร์ {i} ({sensor_info_row['location_name'].values[0]})"
-                    else:
-                        name = f"เซ็นเซอร์ {i}"
-                    
-                    # Add a line for the average
-                    fig.add_trace(go.Scatter(
-                        x=last_7_days['date'],
-                        y=last_7_days[avg_col],
-                        mode='lines+markers',
-                        name=name
-                    ))
-            
-            fig.update_layout(
-                title="ค่าเฉลี่ยฟอสฟอรัสรายวัน (7 วันล่าสุด)",
-                xaxis_title="วันที่",
-                yaxis_title="ฟอสฟอรัส (mg/kg)",
-                legend_title="เซ็นเซอร์",
-                hovermode="x unified"
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # Potassium subtab
-        with npk_tabs[2]:
-            fig = go.Figure()
-            
-            for i in range(1, num_sensors + 1):
-                avg_col = f'sensor_{i}_potassium_avg'
-                
-                if avg_col in last_7_days.columns:
-                    # Get the location name
-                    sensor_info_row = sensor_info[sensor_info['sensor_id'] == i]
-                    if not sensor_info_row.empty:
-                        name = f"เซ็นเซอร์ {i} ({sensor_info_row['location_name'].values[0]})"
-                    else:
-                        name = f"เซ็นเซอร์ {i}"
-                    
-                    # Add a line for the average
-                    fig.add_trace(go.Scatter(
-                        x=last_7_days['date'],
-                        y=last_7_days[avg_col],
-                        mode='lines+markers',
-                        name=name
-                    ))
-            
-            fig.update_layout(
-                title="ค่าเฉลี่ยโพแทสเซียมรายวัน (7 วันล่าสุด)",
-                xaxis_title="วันที่",
-                yaxis_title="โพแทสเซียม (mg/kg)",
-                legend_title="เซ็นเซอร์",
-                hovermode="x unified"
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-    
-    # Dissolved Oxygen tab
-    with tabs[5]:
-        fig = go.Figure()
-        
-        for i in range(1, num_sensors + 1):
-            avg_col = f'sensor_{i}_dissolved_oxygen_avg'
-            
-            if avg_col in last_7_days.columns:
-                # Get the location name
-                sensor_info_row = sensor_info[sensor_info['sensor_id'] == i]
-                if not sensor_info_row.empty:
-                    name = f"เซ็นเซอร์ {i} ({sensor_info_row['location_name'].values[0]})"
-                else:
-                    name = f"เซ็นเซอร์ {i}"
-                
-                # Add a line for the average
-                fig.add_trace(go.Scatter(
-                    x=last_7_days['date'],
-                    y=last_7_days[avg_col],
-                    mode='lines+markers',
-                    name=name
-                ))
-        
-        fig.update_layout(
-            title="ค่าเฉลี่ยออกซิเจนละลายรายวัน (7 วันล่าสุด)",
-            xaxis_title="วันที่",
-            yaxis_title="ออกซิเจนละลาย (mg/L)",
-            legend_title="เซ็นเซอร์",
-            hovermode="x unified"
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-    
-    # Turbidity tab
-    with tabs[6]:
-        fig = go.Figure()
-        
-        for i in range(1, num_sensors + 1):
-            avg_col = f'sensor_{i}_turbidity_avg'
-            
-            if avg_col in last_7_days.columns:
-                # Get the location name
-                sensor_info_row = sensor_info[sensor_info['sensor_id'] == i]
-                if not sensor_info_row.empty:
-                    name = f"เซ็นเซอร์ {i} ({sensor_info_row['location_name'].values[0]})"
-                else:
-                    name = f"เซ็นเซอร์ {i}"
-                
-                # Add a line for the average
-                fig.add_trace(go.Scatter(
-                    x=last_7_days['date'],
-                    y=last_7_days[avg_col],
-                    mode='lines+markers',
-                    name=name
-                ))
-        
-        fig.update_layout(
-            title="ค่าเฉลี่ยความขุ่นรายวัน (7 วันล่าสุด)",
-            xaxis_title="วันที่",
-            yaxis_title="ความขุ่น (NTU)",
-            legend_title="เซ็นเซอร์",
-            hovermode="x unified"
-        )
-        
+    else:
+        fig = _daily_trend_fig(param, l7_hash, sensors_present, last_7_days)
         st.plotly_chart(fig, use_container_width=True)
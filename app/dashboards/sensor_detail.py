@@ -3,253 +3,428 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
+import os
+import io
+import glob
 from datetime import datetime, timedelta
 
-def show_sensor_detail_dashboard(data, sensor_id):
+# Serialize figures with orjson when it is installed; it is much faster than
+# the default JSON encoder for figures with many points
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = 'orjson'
+except ImportError:
+    pass
+
+from ._kernels import downsample_indices, iqr_outliers, gaussian_kde, frame_fingerprint
+
+# Maximum number of points per time series trace sent to the browser
+MAX_PLOT_POINTS = 2000
+
+# Display name, unit and normal low/high limits (None when unbounded) of each parameter
+PARAM_META = {
+    'ph': ("pH", "", 6.5, 8.5),
+    'temp': ("Temperature", "°C", None, None),
+    'conductivity': ("Conductivity", "μS/cm", None, None),
+    'dissolved_oxygen': ("Dissolved Oxygen", "mg/L", 4.0, None),
+    'turbidity': ("Turbidity", "NTU", None, 10.0)
+}
+
+# Display spec for the current values: (param, label, format, low, high), where
+# low/high are (threshold, severity, status) or None when there is no limit
+CURRENT_VALUE_SPECS = (
+    ('ph', 'pH', '{:.2f}', (6.5, 'err', 'เป็นกรด'), (8.5, 'err', 'เป็นด่าง')),
+    ('temp', 'อุณหภูมิ', '{:.1f} °C', None, None),
+    ('conductivity', 'การนำไฟฟ้า', '{:.1f} μS/cm', None, None),
+    ('dissolved_oxygen', 'ออกซิเจนละลาย', '{:.2f} mg/L', (4.0, 'err', 'ต่ำ'), None),
+    ('turbidity', 'ความขุ่น', '{:.2f} NTU', None, (10.0, 'warn', 'สูง'))
+)
+
+# Static part of the pH gauge; the value and threshold value are filled in per sensor
+PH_GAUGE_BASE = {
+    'mode': "gauge+number",
+    'domain': {'x': [0, 1], 'y': [0, 1]},
+    'title': {'text': "pH"},
+    'gauge': {
+        'axis': {'range': [0, 14], 'tickwidth': 1, 'tickcolor': "darkblue"},
+        'bar': {'color': "darkblue"},
+        'bgcolor': "white",
+        'borderwidth': 2,
+        'bordercolor': "gray",
+        'steps': [
+            {'range': [0, 6.5], 'color': 'rgba(255, 0, 0, 0.3)'},
+            {'range': [6.5, 8.5], 'color': 'rgba(0, 255, 0, 0.3)'},
+            {'range': [8.5, 14], 'color': 'rgba(255, 0, 0, 0.3)'}
+        ],
+        'threshold': {
+            'line': {'color': "red", 'width': 4},
+            'thickness': 0.75
+        }
+    }
+}
+
+# Streamlit writer for each severity
+SEVERITY_WRITERS = {
+    None: st.markdown,
+    'ok': st.success,
+    'warn': st.warning,
+    'err': st.error
+}
+
+# Derived tables are also kept here so a new server process can skip recomputing them
+DISK_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'sensor_dashboard')
+
+def _to_plot(values):
     """
-    แสดงข้อมูลโดยละเอียดสำหรับเซ็นเซอร์เฉพาะ
+    Convert values to float32 for plotting, halving the figure payload.
+    """
+    return np.asarray(values, dtype=np.float32)
+
+def _render_current_value(value, spec):
+    """
+    Show one current value, colored by its status when the parameter has limits.
     
-    พารามิเตอร์:
-    - data: พจนานุกรมที่มีข้อมูลเซ็นเซอร์ทั้งหมด
-    - sensor_id: ID ของเซ็นเซอร์ที่ต้องการแสดง
+    Parameters:
+    - value: Latest reading of the parameter
+    - spec: Entry of CURRENT_VALUE_SPECS
     """
-    # Get the data
-    combined_data = data['combined_data']
-    sensor_info = data['sensor_info']
-    individual_sensors = data['individual_sensors']
+    param, label, fmt, low, high = spec
+    text = f"**{label}:** {fmt.format(value)}"
     
-    # Get the sensor data
-    sensor_key = f'sensor_{sensor_id}'
-    if sensor_key in individual_sensors:
-        sensor_data = individual_sensors[sensor_key]
-    else:
-        st.error(f"ไม่พบข้อมูลสำหรับเซ็นเซอร์ {sensor_id}")
+    if low is None and high is None:
+        SEVERITY_WRITERS[None](text)
         return
     
-    # Get the sensor info
-    sensor_info_row = sensor_info[sensor_info['sensor_id'] == sensor_id]
-    if not sensor_info_row.empty:
-        location_name = sensor_info_row['location_name'].values[0]
-        water_type = sensor_info_row['water_type'].values[0]
-        coordinates = sensor_info_row['coordinates'].values[0]
-        installation_date = sensor_info_row['installation_date'].values[0]
-        maintenance_interval = sensor_info_row['maintenance_interval_days'].values[0]
-        last_calibration = sensor_info_row['last_calibration'].values[0]
+    if low is not None and value < low[0]:
+        _, severity, status = low
+    elif high is not None and value > high[0]:
+        _, severity, status = high
     else:
-        location_name = f"Sensor {sensor_id}"
-        water_type = "Unknown"
-        coordinates = "Unknown"
-        installation_date = "Unknown"
-        maintenance_interval = "Unknown"
-        last_calibration = "Unknown"
+        severity, status = 'ok', 'ปกติ'
     
-    # แสดงส่วนหัวของเซ็นเซอร์
-    st.header(f"เซ็นเซอร์ {sensor_id}: {location_name}")
-    st.markdown(f"ข้อมูลโดยละเอียดและค่าที่อ่านได้สำหรับเซ็นเซอร์ {sensor_id} ที่ตั้งอยู่ที่ {location_name}")
+    SEVERITY_WRITERS[severity](f"{text} ({status})")
+
+def _reuse_figure(key, traces):
+    """
+    Get the figure kept in the session state under key with its trace data replaced.
     
-    # Create columns for the sensor info
-    col1, col2, col3 = st.columns(3)
+    Parameters:
+    - key: Session state key of the figure
+    - traces: Dictionary of trace name -> dict of trace data (e.g. x and y)
+    
+    Returns:
+    - The updated figure, or None when there is no figure for key or its traces differ
+    """
+    fig = st.session_state.get(key)
+    if fig is None or [trace.name for trace in fig.data] != list(traces):
+        return None
+    
+    # Only the trace data changes; the layout is left as it is
+    with fig.batch_update():
+        for trace in fig.data:
+            trace.update(traces[trace.name])
+    
+    return fig
+
+def _disk_cached(name, sensor_data, sensor_id, compute):
+    """
+    Read a derived table from the on-disk feather cache, computing and storing it on a miss.
+    
+    Parameters:
+    - name: Name of the table (part of the file name)
+    - sensor_data: DataFrame containing the sensor readings
+    - sensor_id: ID of the sensor
+    - compute: Function taking sensor_data and returning a DataFrame with a default index
+    
+    Returns:
+    - DataFrame returned by compute
+    """
+    # The file name carries the data fingerprint, so new or changed readings never hit a stale table
+    cache_dir = os.path.join(DISK_CACHE_DIR, f'sensor_{sensor_id}')
+    path = os.path.join(cache_dir, f'{name}_{frame_fingerprint(sensor_data)}.feather')
+    
+    if os.path.exists(path):
+        try:
+            return pd.read_feather(path)
+        except (OSError, ValueError):
+            pass
+    
+    df = compute(sensor_data)
+    
+    # The cache is best effort; a read-only home directory just means recomputing next time
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        for old_path in glob.glob(os.path.join(cache_dir, f'{name}_*.feather')):
+            os.remove(old_path)
+        df.to_feather(path)
+    except OSError:
+        pass
+    
+    return df
+
+@st.cache_data(show_spinner=False)
+def _sensor_info_by_id(sensor_info):
+    """
+    Index the sensor metadata by sensor ID for O(1) lookups.
+    
+    Parameters:
+    - sensor_info: DataFrame with sensor metadata
+    
+    Returns:
+    - DataFrame indexed by sensor_id (first row per ID), with water_type as a category
+    """
+    info = sensor_info.drop_duplicates('sensor_id').set_index('sensor_id')
+    info['water_type'] = info['water_type'].astype('category')
+    return info
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _hourly_stats(sensor_data, sensor_id):
+    """
+    Calculate the mean and standard deviation of each parameter per hour of day.
+    
+    Parameters:
+    - sensor_data: DataFrame containing the sensor readings
+    - sensor_id: ID of the sensor (part of the cache key)
+    
+    Returns:
+    - DataFrame with an 'hour' column and '<param>_mean'/'<param>_std' columns
+    """
+    return _disk_cached('hourly', sensor_data, sensor_id, _compute_hourly_stats)
+
+def _compute_hourly_stats(sensor_data):
+    """
+    Group the readings by hour of day; see _hourly_stats.
+    """
+    # Hour of day straight from the datetime64 values, without the .dt accessor
+    hours = sensor_data['timestamp'].to_numpy().astype('datetime64[h]').astype(np.int64) % 24
+    
+    hourly_data = sensor_data.groupby(hours).agg({
+        'ph': ['mean', 'std'],
+        'temp': ['mean', 'std'],
+        'conductivity': ['mean', 'std'],
+        'dissolved_oxygen': ['mean', 'std'],
+        'turbidity': ['mean', 'std']
+    })
+    
+    # Flatten the column names
+    hourly_data.columns = ['_'.join(col) for col in hourly_data.columns.values]
+    
+    return hourly_data.rename_axis('hour').reset_index()
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _corr_matrix(sensor_data, sensor_id):
+    """
+    Calculate the correlation matrix between the sensor parameters.
+    
+    Parameters:
+    - sensor_data: DataFrame containing the sensor readings
+    - sensor_id: ID of the sensor (part of the cache key)
+    
+    Returns:
+    - DataFrame with the pairwise correlations
+    """
+    corr_data = _disk_cached('corr', sensor_data, sensor_id, _compute_corr_matrix)
+    
+    # Feather needs a default index, so the parameter names are stored as a column
+    return corr_data.set_index('parameter').rename_axis(None)
+
+def _compute_corr_matrix(sensor_data):
+    """
+    Correlate the sensor parameters; see _corr_matrix.
+    """
+    cols = ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity']
+    
+    # One np.corrcoef over a contiguous float32 matrix instead of pandas' pairwise loop;
+    # missing readings are filled with the column mean
+    arr = np.ascontiguousarray(sensor_data[cols].to_numpy(dtype=np.float32))
+    if np.isnan(arr).any():
+        arr = np.where(np.isnan(arr), np.nanmean(arr, axis=0), arr)
+    
+    corr_data = pd.DataFrame(np.corrcoef(arr, rowvar=False), index=cols, columns=cols)
+    return corr_data.rename_axis('parameter').reset_index()
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _param_stats(sensor_data, sensor_id):
+    """
+    Calculate summary statistics for each sensor parameter.
+    
+    Parameters:
+    - sensor_data: DataFrame containing the sensor readings
+    - sensor_id: ID of the sensor (part of the cache key)
+    
+    Returns:
+    - DataFrame with one row of statistics per parameter
+    """
+    return _disk_cached('stats', sensor_data, sensor_id, _compute_param_stats)
+
+def _compute_param_stats(sensor_data):
+    """
+    Summarize each sensor parameter; see _param_stats.
+    """
+    params = [
+        param for param in ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity']
+        if param in sensor_data.columns
+    ]
+    
+    # One describe() call gives the mean, std, min, max and quartiles of every parameter
+    desc = sensor_data[params].describe(percentiles=[0.25, 0.5, 0.75]).T
+    
+    stats_df = pd.DataFrame({
+        'Parameter': desc.index,
+        'Display Name': desc.index.map({
+            'ph': 'pH',
+            'temp': 'Temperature (°C)',
+            'conductivity': 'Conductivity (μS/cm)',
+            'dissolved_oxygen': 'Dissolved Oxygen (mg/L)',
+            'turbidity': 'Turbidity (NTU)'
+        }),
+        'Mean': desc['mean'],
+        'Median': desc['50%'],
+        'Std Dev': desc['std'],
+        'Min': desc['min'],
+        'Q1': desc['25%'],
+        'Q3': desc['75%'],
+        'Max': desc['max'],
+        'Range': desc['max'] - desc['min'],
+        'IQR': desc['75%'] - desc['25%']
+    }).reset_index(drop=True)
+    
+    return stats_df
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _kde_curve(sensor_data, sensor_id, param, n_points=100):
+    """
+    Estimate the distribution of a parameter with a Gaussian KDE.
+    
+    Parameters:
+    - sensor_data: DataFrame containing the sensor readings
+    - sensor_id: ID of the sensor (part of the cache key)
+    - param: Parameter column to estimate
+    - n_points: Number of grid points (default: 100)
+    
+    Returns:
+    - Tuple of (grid, density) arrays spanning the parameter's min to max
+    """
+    values = sensor_data[param].to_numpy(dtype=np.float64)
+    grid = np.linspace(np.nanmin(values), np.nanmax(values), n_points)
+    return grid, gaussian_kde(values, grid)
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _csv_bytes(filtered_data, sensor_id):
+    """
+    Encode sensor readings as CSV for the download button.
+    
+    Parameters:
+    - filtered_data: DataFrame containing the sensor readings in the selected date range
+    - sensor_id: ID of the sensor (part of the cache key)
+    
+    Returns:
+    - UTF-8 encoded CSV bytes
+    """
+    # Write straight into a bytes buffer instead of building a str that
+    # Streamlit would then encode again
+    buf = io.BytesIO()
+    filtered_data.to_csv(buf, index=False, encoding='utf-8')
+    return buf.getvalue()
+
+@st.fragment
+def _show_time_series_tab(sensor_data, sensor_id, location_name):
+    """
+    Show the time series tab: date range filter, plot and CSV download.
+    
+    Parameters:
+    - sensor_data: DataFrame containing the sensor readings
+    - sensor_id: ID of the sensor
+    - location_name: Name of the sensor location
+    """
+    st.subheader("ข้อมูลอนุกรมเวลา")
+    
+    # Create date range selector
+    col1, col2 = st.columns(2)
     
     with col1:
-        st.subheader("ข้อมูลเซ็นเซอร์")
-        st.markdown(f"**ตำแหน่ง:** {location_name}")
-        st.markdown(f"**ประเภทดิน:** {water_type}")
-        st.markdown(f"**พิกัด:** {coordinates}")
-        st.markdown(f"**วันที่ติดตั้ง:** {installation_date}")
-        st.markdown(f"**ช่วงเวลาบำรุงรักษา:** {maintenance_interval} วัน")
-        st.markdown(f"**การปรับเทียบล่าสุด:** {last_calibration}")
-        
-        # Calculate days since last calibration
-        if last_calibration != "Unknown":
-            last_cal_date = datetime.strptime(last_calibration, "%Y-%m-%d")
-            days_since_cal = (datetime.now() - last_cal_date).days
-            
-            # แสดงสถานะการปรับเทียบ
-            if days_since_cal > maintenance_interval:
-                st.warning(f"⚠️ เกินกำหนดการปรับเทียบแล้ว {days_since_cal - maintenance_interval} วัน")
-            else:
-                st.success(f"✅ การปรับเทียบเป็นปัจจุบัน ({days_since_cal} วันนับจากการปรับเทียบครั้งล่าสุด)")
+        start_date = st.date_input(
+            "Start Date",
+            value=sensor_data['timestamp'].min().date(),
+            min_value=sensor_data['timestamp'].min().date(),
+            max_value=sensor_data['timestamp'].max().date()
+        )
     
     with col2:
-        st.subheader("ค่าปัจจุบัน")
-        
-        # Get the latest readings
-        latest_data = sensor_data.iloc[-1]
-        
-        # Display the latest readings
-        for param in ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity']:
-            if param in latest_data:
-                value = latest_data[param]
-                
-                # Format the value based on the parameter
-                if param == 'ph':
-                    formatted_value = f"{value:.2f}"
-                    if value < 6.5:
-                        st.error(f"**pH:** {formatted_value} (เป็นกรด)")
-                    elif value > 8.5:
-                        st.error(f"**pH:** {formatted_value} (เป็นด่าง)")
-                    else:
-                        st.success(f"**pH:** {formatted_value} (ปกติ)")
-                
-                elif param == 'temp':
-                    formatted_value = f"{value:.1f} °C"
-                    st.markdown(f"**อุณหภูมิ:** {formatted_value}")
-                
-                elif param == 'conductivity':
-                    formatted_value = f"{value:.1f} μS/cm"
-                    st.markdown(f"**การนำไฟฟ้า:** {formatted_value}")
-                
-                elif param == 'dissolved_oxygen':
-                    formatted_value = f"{value:.2f} mg/L"
-                    if value < 4.0:
-                        st.error(f"**ออกซิเจนละลาย:** {formatted_value} (ต่ำ)")
-                    else:
-                        st.success(f"**ออกซิเจนละลาย:** {formatted_value} (ปกติ)")
-                
-                elif param == 'turbidity':
-                    formatted_value = f"{value:.2f} NTU"
-                    if value > 10.0:
-                        st.warning(f"**ความขุ่น:** {formatted_value} (สูง)")
-                    else:
-                        st.success(f"**ความขุ่น:** {formatted_value} (ปกติ)")
-        
-        # แสดงเวลาที่อัปเดตล่าสุด
-        last_update = latest_data['timestamp']
-        st.markdown(f"**อัปเดตล่าสุด:** {last_update}")
-    
-    with col3:
-        st.subheader("สถานะพารามิเตอร์")
-        
-        # Create a gauge chart for pH
-        if 'ph' in latest_data:
-            ph_value = latest_data['ph']
-            
-            fig = go.Figure(go.Indicator(
-                mode="gauge+number",
-                value=ph_value,
-                domain={'x': [0, 1], 'y': [0, 1]},
-                title={'text': "pH"},
-                gauge={
-                    'axis': {'range': [0, 14], 'tickwidth': 1, 'tickcolor': "darkblue"},
-                    'bar': {'color': "darkblue"},
-                    'bgcolor': "white",
-                    'borderwidth': 2,
-                    'bordercolor': "gray",
-                    'steps': [
-                        {'range': [0, 6.5], 'color': 'rgba(255, 0, 0, 0.3)'},
-                        {'range': [6.5, 8.5], 'color': 'rgba(0, 255, 0, 0.3)'},
-                        {'range': [8.5, 14], 'color': 'rgba(255, 0, 0, 0.3)'}
-                    ],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': ph_value
-                    }
-                }
-            ))
-            
-            fig.update_layout(
-                height=200,
-                margin=dict(l=20, r=20, t=30, b=20)
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+        end_date = st.date_input(
+            "End Date",
+            value=sensor_data['timestamp'].max().date(),
+            min_value=sensor_data['timestamp'].min().date(),
+            max_value=sensor_data['timestamp'].max().date()
+        )
     
-    st.markdown("---")
+    # Filter data by date range; readings are sorted by time, so the
+    # range is a contiguous slice found by binary search
+    all_timestamps = sensor_data['timestamp'].to_numpy()
+    lo = np.searchsorted(all_timestamps, np.datetime64(start_date), side='left')
+    hi = np.searchsorted(all_timestamps, np.datetime64(end_date) + np.timedelta64(1, 'D'), side='left')
+    filtered_data = sensor_data.iloc[lo:hi]
     
-    # สร้างแท็บสำหรับการแสดงผลต่างๆ
-    tabs = st.tabs(["ข้อมูลอนุกรมเวลา", "รูปแบบรายชั่วโมง", "ความสัมพันธ์", "สถิติ"])
+    # Parameter selection
+    parameters = st.multiselect(
+        "Select Parameters",
+        ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity'],
+        default=['ph']
+    )
     
-    # แท็บข้อมูลอนุกรมเวลา
-    with tabs[0]:
-        st.subheader("ข้อมูลอนุกรมเวลา")
-        
-        # Create date range selector
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            start_date = st.date_input(
-                "Start Date",
-                value=sensor_data['timestamp'].min().date(),
-                min_value=sensor_data['timestamp'].min().date(),
-                max_value=sensor_data['timestamp'].max().date()
-            )
-        
-        with col2:
-            end_date = st.date_input(
-                "End Date",
-                value=sensor_data['timestamp'].max().date(),
-                min_value=sensor_data['timestamp'].min().date(),
-                max_value=sensor_data['timestamp'].max().date()
-            )
+    if not parameters:
+        st.warning("Please select at least one parameter.")
+    else:
+        timestamps = filtered_data['timestamp'].to_numpy()
+        timestamps_int = timestamps.astype(np.int64)
+        
+        # Trace data by name, downsampled to keep long date ranges responsive
+        traces = {}
+        for param in parameters:
+            if param in filtered_data.columns:
+                # Get the display name and unit
+                display_name, unit, _, _ = PARAM_META.get(param, (param.capitalize(), "", None, None))
+                
+                values = filtered_data[param].to_numpy()
+                idx = downsample_indices(timestamps_int, values, MAX_PLOT_POINTS)
+                name = f"{display_name} ({unit})" if unit else display_name
+                traces[name] = dict(x=timestamps[idx], y=_to_plot(values[idx]))
         
-        # Filter data by date range
-        filtered_data = sensor_data[
-            (sensor_data['timestamp'].dt.date >= start_date) &
-            (sensor_data['timestamp'].dt.date <= end_date)
-        ]
+        # Reuse the figure from the previous run when only the data changed
+        fig_key = f'fig_{sensor_id}_timeseries'
+        fig = _reuse_figure(fig_key, traces)
         
-        # Parameter selection
-        parameters = st.multiselect(
-            "Select Parameters",
-            ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity'],
-            default=['ph']
-        )
-        
-        if not parameters:
-            st.warning("Please select at least one parameter.")
-        else:
+        if fig is None:
             # Create the time series plot
             fig = go.Figure()
             
-            for param in parameters:
-                if param in filtered_data.columns:
-                    # Get the display name and unit
-                    if param == 'ph':
-                        display_name = "pH"
-                        unit = ""
-                    elif param == 'temp':
-                        display_name = "Temperature"
-                        unit = "°C"
-                    elif param == 'conductivity':
-                        display_name = "Conductivity"
-                        unit = "μS/cm"
-                    elif param == 'dissolved_oxygen':
-                        display_name = "Dissolved Oxygen"
-                        unit = "mg/L"
-                    elif param == 'turbidity':
-                        display_name = "Turbidity"
-                        unit = "NTU"
-                    else:
-                        display_name = param.capitalize()
-                        unit = ""
-                    
-                    # Add the trace
-                    fig.add_trace(go.Scatter(
-                        x=filtered_data['timestamp'],
-                        y=filtered_data[param],
-                        mode='lines',
-                        name=f"{display_name} ({unit})" if unit else display_name
-                    ))
+            for name, data in traces.items():
+                fig.add_trace(go.Scatter(mode='lines', name=name, **data))
             
-            # Add reference lines for pH if selected
+            # Add reference lines for pH if selected; they span the plot
+            # width, so they stay valid when the date range changes
             if 'ph' in parameters:
+                _, _, ph_min, ph_max = PARAM_META['ph']
+                
                 fig.add_shape(
                     type="line",
-                    x0=filtered_data['timestamp'].min(),
-                    y0=6.5,
-                    x1=filtered_data['timestamp'].max(),
-                    y1=6.5,
+                    xref="paper",
+                    x0=0,
+                    y0=ph_min,
+                    x1=1,
+                    y1=ph_min,
                     line=dict(color="red", width=1, dash="dash"),
                     name="Min Normal pH"
                 )
                 
                 fig.add_shape(
                     type="line",
-                    x0=filtered_data['timestamp'].min(),
-                    y0=8.5,
-                    x1=filtered_data['timestamp'].max(),
-                    y1=8.5,
+                    xref="paper",
+                    x0=0,
+                    y0=ph_max,
+                    x1=1,
+                    y1=ph_max,
                     line=dict(color="red", width=1, dash="dash"),
                     name="Max Normal pH"
                 )
@@ -260,85 +435,84 @@ def show_sensor_detail_dashboard(data, sensor_id):
                 xaxis_title="Timestamp",
                 yaxis_title="Value",
                 legend_title="Parameter",
-                hovermode="x unified"
+                hovermode="x unified",
+                uirevision='const'
             )
             
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Add a download button for the filtered data
-            csv = filtered_data.to_csv(index=False)
-            st.download_button(
-                label="Download Filtered Data as CSV",
-                data=csv,
-                file_name=f"sensor_{sensor_id}_data_{start_date}_to_{end_date}.csv",
-                mime="text/csv"
-            )
-    
-    # แท็บรูปแบบรายชั่วโมง
-    with tabs[1]:
-        st.subheader("รูปแบบรายชั่วโมง")
-        
-        # Group data by hour
-        sensor_data['hour'] = sensor_data['timestamp'].dt.hour
-        hourly_data = sensor_data.groupby('hour').agg({
-            'ph': ['mean', 'std'],
-            'temp': ['mean', 'std'],
-            'conductivity': ['mean', 'std'],
-            'dissolved_oxygen': ['mean', 'std'],
-            'turbidity': ['mean', 'std']
-        }).reset_index()
+            st.session_state[fig_key] = fig
         
-        # Flatten the column names
-        hourly_data.columns = ['_'.join(col).strip() for col in hourly_data.columns.values]
-        hourly_data.rename(columns={'hour_': 'hour'}, inplace=True)
+        st.plotly_chart(fig, use_container_width=True)
         
-        # Parameter selection
-        param = st.selectbox(
-            "Select Parameter",
-            ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity'],
-            index=0
+        # Add a download button for the filtered data
+        st.download_button(
+            label="Download Filtered Data as CSV",
+            data=_csv_bytes(filtered_data, sensor_id),
+            file_name=f"sensor_{sensor_id}_data_{start_date}_to_{end_date}.csv",
+            mime="text/csv"
         )
-        
-        # Get the display name and unit
-        if param == 'ph':
-            display_name = "pH"
-            unit = ""
-        elif param == 'temp':
-            display_name = "Temperature"
-            unit = "°C"
-        elif param == 'conductivity':
-            display_name = "Conductivity"
-            unit = "μS/cm"
-        elif param == 'dissolved_oxygen':
-            display_name = "Dissolved Oxygen"
-            unit = "mg/L"
-        elif param == 'turbidity':
-            display_name = "Turbidity"
-            unit = "NTU"
-        
+
+@st.fragment
+def _show_hourly_tab(sensor_data, sensor_id):
+    """
+    Show the hourly pattern tab.
+    
+    Parameters:
+    - sensor_data: DataFrame containing the sensor readings
+    - sensor_id: ID of the sensor
+    """
+    st.subheader("รูปแบบรายชั่วโมง")
+    
+    # Group data by hour
+    hourly_data = _hourly_stats(sensor_data, sensor_id)
+    
+    # Parameter selection
+    param = st.selectbox(
+        "Select Parameter",
+        ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity'],
+        index=0
+    )
+    
+    # Get the display name and unit
+    display_name, unit, _, _ = PARAM_META[param]
+    
+    hours = hourly_data['hour'].to_numpy()
+    mean = hourly_data[f'{param}_mean'].to_numpy()
+    std = hourly_data[f'{param}_std'].to_numpy()
+    
+    # Mean line, and the standard deviation range: upper edge forwards, lower edge backwards
+    traces = {
+        f"Mean {display_name}": dict(x=hours, y=_to_plot(mean)),
+        "±1 Std Dev": dict(
+            x=np.concatenate([hours, hours[::-1]]),
+            y=_to_plot(np.concatenate([mean + std, (mean - std)[::-1]]))
+        )
+    }
+    
+    # Reuse the figure from the previous run when only the data changed
+    fig_key = f'fig_{sensor_id}_hourly'
+    fig = _reuse_figure(fig_key, traces)
+    
+    if fig is None:
         # Create the hourly pattern plot
         fig = go.Figure()
         
         # Add the mean line
         fig.add_trace(go.Scatter(
-            x=hourly_data['hour'],
-            y=hourly_data[f'{param}_mean'],
             mode='lines+markers',
             name=f"Mean {display_name}",
-            line=dict(color='blue')
+            line=dict(color='blue'),
+            **traces[f"Mean {display_name}"]
         ))
         
         # Add the standard deviation range
         fig.add_trace(go.Scatter(
-            x=hourly_data['hour'].tolist() + hourly_data['hour'].tolist()[::-1],
-            y=(hourly_data[f'{param}_mean'] + hourly_data[f'{param}_std']).tolist() + 
-              (hourly_data[f'{param}_mean'] - hourly_data[f'{param}_std']).tolist()[::-1],
             fill='toself',
             fillcolor='rgba(0, 0, 255, 0.1)',
             line=dict(color='rgba(255, 255, 255, 0)'),
             hoverinfo='skip',
             showlegend=True,
-            name=f"±1 Std Dev"
+            name="±1 Std Dev",
+            **traces["±1 Std Dev"]
         ))
         
         # Update the layout
@@ -351,269 +525,426 @@ def show_sensor_detail_dashboard(data, sensor_id):
                 tickvals=list(range(24)),
                 ticktext=[f"{h:02d}:00" for h in range(24)]
             ),
-            hovermode="x unified"
+            hovermode="x unified",
+            uirevision='const'
         )
         
-        st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown(
-            f"This chart shows how {display_name.lower()} varies throughout the day. "
-            f"The blue line represents the average {display_name.lower()} for each hour, "
-            f"and the shaded area represents one standard deviation from the mean."
+        st.session_state[fig_key] = fig
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown(
+        f"This chart shows how {display_name.lower()} varies throughout the day. "
+        f"The blue line represents the average {display_name.lower()} for each hour, "
+        f"and the shaded area represents one standard deviation from the mean."
+    )
+
+@st.fragment
+def _show_correlations_tab(sensor_data, sensor_id):
+    """
+    Show the correlations tab: heatmap and parameter scatter plot.
+    
+    Parameters:
+    - sensor_data: DataFrame containing the sensor readings
+    - sensor_id: ID of the sensor
+    """
+    st.subheader("Parameter Correlations")
+    
+    # Calculate correlations
+    corr_data = _corr_matrix(sensor_data, sensor_id)
+    
+    # Create a heatmap
+    fig = px.imshow(
+        corr_data,
+        x=corr_data.columns,
+        y=corr_data.columns,
+        color_continuous_scale='RdBu_r',
+        zmin=-1,
+        zmax=1,
+        text_auto='.2f'
+    )
+    
+    fig.update_layout(
+        title="Correlation Matrix",
+        xaxis_title="Parameter",
+        yaxis_title="Parameter"
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown(
+        "This heatmap shows the correlation between different parameters. "
+        "A value close to 1 indicates a strong positive correlation, "
+        "a value close to -1 indicates a strong negative correlation, "
+        "and a value close to 0 indicates little to no correlation."
+    )
+    
+    # Create scatter plots for selected parameters
+    st.subheader("Parameter Relationships")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        x_param = st.selectbox(
+            "X-axis Parameter",
+            ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity'],
+            index=0
         )
     
-    # Correlations tab
-    with tabs[2]:
-        st.subheader("Parameter Correlations")
+    with col2:
+        y_param = st.selectbox(
+            "Y-axis Parameter",
+            ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity'],
+            index=1
+        )
+    
+    # Get the display names and units
+    x_display, x_unit, _, _ = PARAM_META[x_param]
+    y_display, y_unit, _, _ = PARAM_META[y_param]
+    
+    # Create the scatter plot (WebGL), colored continuously by time
+    x_values = sensor_data[x_param].to_numpy(dtype=np.float64)
+    y_values = sensor_data[y_param].to_numpy(dtype=np.float64)
+    timestamps = sensor_data['timestamp']
+    time_values = timestamps.to_numpy().astype(np.int64) // 10**9
+    tick_idx = np.linspace(0, len(timestamps) - 1, 5).astype(int)
+    
+    fig = go.Figure(go.Scattergl(
+        x=_to_plot(x_values),
+        y=_to_plot(y_values),
+        mode='markers',
+        marker=dict(
+            color=time_values,
+            colorscale='Viridis',
+            opacity=0.7,
+            colorbar=dict(
+                title="Time",
+                tickvals=time_values[tick_idx],
+                ticktext=timestamps.iloc[tick_idx].dt.strftime('%Y-%m-%d').tolist()
+            )
+        ),
+        name="Readings",
+        showlegend=False
+    ))
+    
+    # Add an OLS trendline fitted with NumPy
+    valid = np.isfinite(x_values) & np.isfinite(y_values)
+    if valid.sum() >= 2:
+        slope, intercept = np.polyfit(x_values[valid], y_values[valid], 1)
+        x_line = np.array([x_values[valid].min(), x_values[valid].max()])
+        fig.add_trace(go.Scattergl(
+            x=x_line,
+            y=slope * x_line + intercept,
+            mode='lines',
+            line=dict(color='red'),
+            name="OLS Trendline",
+            showlegend=False
+        ))
+    
+    fig.update_layout(
+        title=f"{y_display} vs {x_display}",
+        xaxis_title=f"{x_display} {f'({x_unit})' if x_unit else ''}",
+        yaxis_title=f"{y_display} {f'({y_unit})' if y_unit else ''}",
+        uirevision='const'
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Calculate and display the correlation coefficient
+    corr = sensor_data[[x_param, y_param]].corr().iloc[0, 1]
+    
+    if abs(corr) > 0.7:
+        strength = "strong"
+    elif abs(corr) > 0.3:
+        strength = "moderate"
+    else:
+        strength = "weak"
+    
+    direction = "positive" if corr > 0 else "negative"
+    
+    st.markdown(
+        f"The correlation coefficient between {x_display.lower()} and {y_display.lower()} is "
+        f"**{corr:.2f}**, indicating a {strength} {direction} correlation."
+    )
+
+@st.fragment
+def _show_statistics_tab(sensor_data, sensor_id):
+    """
+    Show the statistics tab: summary table, distribution plots and outliers.
+    
+    Parameters:
+    - sensor_data: DataFrame containing the sensor readings
+    - sensor_id: ID of the sensor
+    """
+    st.subheader("Statistical Analysis")
+    
+    # Calculate statistics for each parameter
+    stats_df = _param_stats(sensor_data, sensor_id)
+    
+    # Display the statistics
+    st.dataframe(stats_df, use_container_width=True)
+    
+    # Create box plots for each parameter
+    st.subheader("Distribution Analysis")
+    
+    # Parameter selection
+    param = st.selectbox(
+        "Select Parameter for Distribution Analysis",
+        ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity'],
+        key="dist_param",
+        index=0
+    )
+    
+    # Get the display name and unit
+    display_name, unit, _, _ = PARAM_META[param]
+    
+    param_stats = stats_df[stats_df['Parameter'] == param].iloc[0]
+    values = sensor_data[param].to_numpy(dtype=np.float64)
+    
+    # Find the outliers with the IQR rule
+    q1 = param_stats['Q1']
+    q3 = param_stats['Q3']
+    iqr = param_stats['IQR']
+    
+    lower_bound = q1 - 1.5 * iqr
+    upper_bound = q3 + 1.5 * iqr
+    
+    outlier_idx = iqr_outliers(values, lower_bound, upper_bound)
+    
+    # Create two columns for the box plot and histogram
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Create the box plot from the precomputed summary instead of sending every
+        # reading; the whiskers end at the most extreme readings inside the fences
+        inliers = values[(values >= lower_bound) & (values <= upper_bound)]
         
-        # Calculate correlations
-        corr_data = sensor_data[['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity']].corr()
+        fig = go.Figure()
         
-        # Create a heatmap
-        fig = px.imshow(
-            corr_data,
-            x=corr_data.columns,
-            y=corr_data.columns,
-            color_continuous_scale='RdBu_r',
-            zmin=-1,
-            zmax=1,
-            text_auto='.2f'
-        )
+        fig.add_trace(go.Box(
+            x=[display_name],
+            q1=[q1],
+            median=[param_stats['Median']],
+            q3=[q3],
+            lowerfence=[inliers.min() if len(inliers) else q1],
+            upperfence=[inliers.max() if len(inliers) else q3],
+            mean=[param_stats['Mean']],
+            name=display_name,
+            boxmean=True,
+            marker_color='#636efa'
+        ))
+        
+        # Add the outliers as points next to the box
+        if len(outlier_idx):
+            fig.add_trace(go.Scatter(
+                x=np.full(len(outlier_idx), display_name),
+                y=_to_plot(values[outlier_idx]),
+                mode='markers',
+                name="Outliers",
+                marker=dict(color='#636efa')
+            ))
         
         fig.update_layout(
-            title="Correlation Matrix",
-            xaxis_title="Parameter",
-            yaxis_title="Parameter"
+            title=f"Box Plot for {display_name}",
+            yaxis_title=f"{display_name} {f'({unit})' if unit else ''}",
+            showlegend=False,
+            uirevision='const'
         )
         
         st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        # Create the histogram from bin counts computed here, so only 30 bars are sent
+        counts, edges = np.histogram(values[np.isfinite(values)], bins=30)
         
-        st.markdown(
-            "This heatmap shows the correlation between different parameters. "
-            "A value close to 1 indicates a strong positive correlation, "
-            "a value close to -1 indicates a strong negative correlation, "
-            "and a value close to 0 indicates little to no correlation."
-        )
-        
-        # Create scatter plots for selected parameters
-        st.subheader("Parameter Relationships")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            x_param = st.selectbox(
-                "X-axis Parameter",
-                ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity'],
-                index=0
-            )
-        
-        with col2:
-            y_param = st.selectbox(
-                "Y-axis Parameter",
-                ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity'],
-                index=1
-            )
+        fig = go.Figure()
         
-        # Get the display names and units
-        params = {
-            'ph': {"name": "pH", "unit": ""},
-            'temp': {"name": "Temperature", "unit": "°C"},
-            'conductivity': {"name": "Conductivity", "unit": "μS/cm"},
-            'dissolved_oxygen': {"name": "Dissolved Oxygen", "unit": "mg/L"},
-            'turbidity': {"name": "Turbidity", "unit": "NTU"}
-        }
+        fig.add_trace(go.Bar(
+            x=_to_plot(0.5 * (edges[:-1] + edges[1:])),
+            y=counts,
+            width=_to_plot(np.diff(edges)),
+            name=display_name
+        ))
         
-        x_display = params[x_param]["name"]
-        x_unit = params[x_param]["unit"]
-        y_display = params[y_param]["name"]
-        y_unit = params[y_param]["unit"]
+        # Add a KDE curve, scaled from density to counts per histogram bin
+        kde_x, kde_y = _kde_curve(sensor_data, sensor_id, param)
+        bin_width = edges[1] - edges[0]
         
-        # Create the scatter plot
-        fig = px.scatter(
-            sensor_data,
-            x=x_param,
-            y=y_param,
-            color='timestamp',
-            color_continuous_scale='Viridis',
-            opacity=0.7,
-            trendline="ols"
-        )
+        fig.add_trace(go.Scatter(
+            x=_to_plot(kde_x),
+            y=_to_plot(kde_y * counts.sum() * bin_width),
+            mode='lines',
+            name='KDE',
+            line=dict(color='red')
+        ))
         
         fig.update_layout(
-            title=f"{y_display} vs {x_display}",
-            xaxis_title=f"{x_display} {f'({x_unit})' if x_unit else ''}",
-            yaxis_title=f"{y_display} {f'({y_unit})' if y_unit else ''}",
-            coloraxis_colorbar_title="Time"
+            title=f"Histogram for {display_name}",
+            xaxis_title=f"{display_name} {f'({unit})' if unit else ''}",
+            yaxis_title="Frequency",
+            showlegend=True,
+            uirevision='const'
         )
         
         st.plotly_chart(fig, use_container_width=True)
+    
+    # Display statistics for the selected parameter
+    st.markdown(f"### Statistics for {display_name}")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    col1.metric("Mean", f"{param_stats['Mean']:.2f}")
+    col2.metric("Median", f"{param_stats['Median']:.2f}")
+    col3.metric("Std Dev", f"{param_stats['Std Dev']:.2f}")
+    col4.metric("Range", f"{param_stats['Range']:.2f}")
+    
+    # Check for outliers
+    outliers = sensor_data.iloc[outlier_idx]
+    
+    if not outliers.empty:
+        st.warning(f"Found {len(outliers)} outliers in {display_name} data.")
         
-        # Calculate and display the correlation coefficient
-        corr = sensor_data[[x_param, y_param]].corr().iloc[0, 1]
-        
-        if abs(corr) > 0.7:
-            strength = "strong"
-        elif abs(corr) > 0.3:
-            strength = "moderate"
-        else:
-            strength = "weak"
-        
-        direction = "positive" if corr > 0 else "negative"
-        
-        st.markdown(
-            f"The correlation coefficient between {x_display.lower()} and {y_display.lower()} is "
-            f"**{corr:.2f}**, indicating a {strength} {direction} correlation."
+        # Display the outliers
+        st.dataframe(
+            outliers[['timestamp', param]].rename(columns={param: display_name}),
+            use_container_width=True
         )
+    else:
+        st.success(f"No outliers found in {display_name} data.")
+
+def show_sensor_detail_dashboard(data, sensor_id):
+    """
+    แสดงข้อมูลโดยละเอียดสำหรับเซ็นเซอร์เฉพาะ
     
-    # Statistics tab
-    with tabs[3]:
-        st.subheader("Statistical Analysis")
-        
-        # Calculate statistics for each parameter
-        stats = {}
-        
-        for param in ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity']:
-            if param in sensor_data.columns:
-                stats[param] = {
-                    'mean': sensor_data[param].mean(),
-                    'median': sensor_data[param].median(),
-                    'std': sensor_data[param].std(),
-                    'min': sensor_data[param].min(),
-                    'max': sensor_data[param].max(),
-                    'range': sensor_data[param].max() - sensor_data[param].min(),
-                    'q1': sensor_data[param].quantile(0.25),
-                    'q3': sensor_data[param].quantile(0.75),
-                    'iqr': sensor_data[param].quantile(0.75) - sensor_data[param].quantile(0.25)
-                }
-        
-        # Create a dataframe for the statistics
-        stats_df = pd.DataFrame(stats).T
-        stats_df.index.name = 'Parameter'
-        stats_df.reset_index(inplace=True)
-        
-        # Add display names
-        stats_df['Display Name'] = stats_df['Parameter'].map({
-            'ph': 'pH',
-            'temp': 'Temperature (°C)',
-            'conductivity': 'Conductivity (μS/cm)',
-            'dissolved_oxygen': 'Dissolved Oxygen (mg/L)',
-            'turbidity': 'Turbidity (NTU)'
-        })
-        
-        # Reorder columns
-        stats_df = stats_df[['Parameter', 'Display Name', 'mean', 'median', 'std', 'min', 'q1', 'q3', 'max', 'range', 'iqr']]
-        
-        # Rename columns
-        stats_df.columns = ['Parameter', 'Display Name', 'Mean', 'Median', 'Std Dev', 'Min', 'Q1', 'Q3', 'Max', 'Range', 'IQR']
-        
-        # Display the statistics
-        st.dataframe(stats_df, use_container_width=True)
-        
-        # Create box plots for each parameter
-        st.subheader("Distribution Analysis")
+    พารามิเตอร์:
+    - data: พจนานุกรมที่มีข้อมูลเซ็นเซอร์ทั้งหมด
+    - sensor_id: ID ของเซ็นเซอร์ที่ต้องการแสดง
+    """
+    # Get the data
+    combined_data = data['combined_data']
+    sensor_info = data['sensor_info']
+    individual_sensors = data['individual_sensors']
+    
+    # Get the sensor data
+    sensor_key = f'sensor_{sensor_id}'
+    if sensor_key in individual_sensors:
+        sensor_data = individual_sensors[sensor_key]
+    else:
+        st.error(f"ไม่พบข้อมูลสำหรับเซ็นเซอร์ {sensor_id}")
+        return
+    
+    # Get the sensor info
+    try:
+        row = _sensor_info_by_id(sensor_info).loc[sensor_id]
+    except KeyError:
+        row = None
+    
+    if row is not None:
+        location_name = row.at['location_name']
+        water_type = row.at['water_type']
+        coordinates = row.at['coordinates']
+        installation_date = row.at['installation_date']
+        maintenance_interval = row.at['maintenance_interval_days']
+        last_calibration = row.at['last_calibration']
+    else:
+        location_name = f"Sensor {sensor_id}"
+        water_type = "Unknown"
+        coordinates = "Unknown"
+        installation_date = "Unknown"
+        maintenance_interval = "Unknown"
+        last_calibration = "Unknown"
+    
+    # แสดงส่วนหัวของเซ็นเซอร์
+    st.header(f"เซ็นเซอร์ {sensor_id}: {location_name}")
+    st.markdown(f"ข้อมูลโดยละเอียดและค่าที่อ่านได้สำหรับเซ็นเซอร์ {sensor_id} ที่ตั้งอยู่ที่ {location_name}")
+    
+    # Create columns for the sensor info
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.subheader("ข้อมูลเซ็นเซอร์")
+        st.markdown(f"**ตำแหน่ง:** {location_name}")
+        st.markdown(f"**ประเภทดิน:** {water_type}")
+        st.markdown(f"**พิกัด:** {coordinates}")
+        st.markdown(f"**วันที่ติดตั้ง:** {installation_date}")
+        st.markdown(f"**ช่วงเวลาบำรุงรักษา:** {maintenance_interval} วัน")
+        st.markdown(f"**การปรับเทียบล่าสุด:** {last_calibration}")
         
-        # Parameter selection
-        param = st.selectbox(
-            "Select Parameter for Distribution Analysis",
-            ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity'],
-            key="dist_param",
-            index=0
-        )
+        # Calculate days since last calibration
+        if last_calibration != "Unknown":
+            last_cal_date = datetime.strptime(last_calibration, "%Y-%m-%d")
+            days_since_cal = (datetime.now() - last_cal_date).days
+            
+            # แสดงสถานะการปรับเทียบ
+            if days_since_cal > maintenance_interval:
+                st.warning(f"⚠️ เกินกำหนดการปรับเทียบแล้ว {days_since_cal - maintenance_interval} วัน")
+            else:
+                st.success(f"✅ การปรับเทียบเป็นปัจจุบัน ({days_since_cal} วันนับจากการปรับเทียบครั้งล่าสุด)")
+    
+    with col2:
+        st.subheader("ค่าปัจจุบัน")
         
-        # Get the display name and unit
-        display_info = {
-            'ph': {"name": "pH", "unit": ""},
-            'temp': {"name": "Temperature", "unit": "°C"},
-            'conductivity': {"name": "Conductivity", "unit": "μS/cm"},
-            'dissolved_oxygen': {"name": "Dissolved Oxygen", "unit": "mg/L"},
-            'turbidity': {"name": "Turbidity", "unit": "NTU"}
+        # Get the latest readings as plain scalars, without building a row Series
+        latest_data = {
+            col: sensor_data[col].iat[-1]
+            for col in ('ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity', 'timestamp')
+            if col in sensor_data.columns
         }
         
-        display_name = display_info[param]["name"]
-        unit = display_info[param]["unit"]
-        
-        # Create two columns for the box plot and histogram
-        col1, col2 = st.columns(2)
+        # Display the latest readings
+        for spec in CURRENT_VALUE_SPECS:
+            if spec[0] in latest_data:
+                _render_current_value(latest_data[spec[0]], spec)
         
-        with col1:
-            # Create the box plot
-            fig = go.Figure()
-            
-            fig.add_trace(go.Box(
-                y=sensor_data[param],
-                name=display_name,
-                boxmean=True,
-                boxpoints='outliers'
-            ))
-            
-            fig.update_layout(
-                title=f"Box Plot for {display_name}",
-                yaxis_title=f"{display_name} {f'({unit})' if unit else ''}",
-                showlegend=False
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+        # แสดงเวลาที่อัปเดตล่าสุด
+        last_update = latest_data['timestamp']
+        st.markdown(f"**อัปเดตล่าสุด:** {last_update}")
+    
+    with col3:
+        st.subheader("สถานะพารามิเตอร์")
         
-        with col2:
-            # Create the histogram
-            fig = go.Figure()
-            
-            fig.add_trace(go.Histogram(
-                x=sensor_data[param],
-                nbinsx=30,
-                name=display_name
-            ))
-            
-            # Add a KDE curve
-            kde_x = np.linspace(sensor_data[param].min(), sensor_data[param].max(), 100)
-            kde_y = stats_df.loc[stats_df['Parameter'] == param, 'Mean'].values[0] * np.ones_like(kde_x)
-            
-            fig.add_trace(go.Scatter(
-                x=kde_x,
-                y=kde_y,
-                mode='lines',
-                name='Mean',
-                line=dict(color='red', dash='dash')
-            ))
+        # Create a gauge chart for pH
+        if 'ph' in latest_data:
+            ph_value = latest_data['ph']
             
-            fig.update_layout(
-                title=f"Histogram for {display_name}",
-                xaxis_title=f"{display_name} {f'({unit})' if unit else ''}",
-                yaxis_title="Frequency",
-                showlegend=True
-            )
+            # Only the value changes between reruns, so the gauge is built once
+            # from the static spec and afterwards just gets the new value
+            fig = st.session_state.get('fig_ph_gauge')
+            if fig is None:
+                gauge = {
+                    **PH_GAUGE_BASE['gauge'],
+                    'threshold': {**PH_GAUGE_BASE['gauge']['threshold'], 'value': ph_value}
+                }
+                fig = go.Figure(go.Indicator(**{**PH_GAUGE_BASE, 'gauge': gauge, 'value': ph_value}))
+                
+                fig.update_layout(
+                    height=200,
+                    margin=dict(l=20, r=20, t=30, b=20)
+                )
+                
+                st.session_state['fig_ph_gauge'] = fig
+            else:
+                fig.update_traces(value=ph_value, gauge_threshold_value=ph_value)
             
             st.plotly_chart(fig, use_container_width=True)
-        
-        # Display statistics for the selected parameter
-        st.markdown(f"### Statistics for {display_name}")
-        
-        param_stats = stats_df[stats_df['Parameter'] == param].iloc[0]
-        
-        col1, col2, col3, col4 = st.columns(4)
-        
-        col1.metric("Mean", f"{param_stats['Mean']:.2f}")
-        col2.metric("Median", f"{param_stats['Median']:.2f}")
-        col3.metric("Std Dev", f"{param_stats['Std Dev']:.2f}")
-        col4.metric("Range", f"{param_stats['Range']:.2f}")
-        
-        # Check for outliers
-        q1 = param_stats['Q1']
-        q3 = param_stats['Q3']
-        iqr = param_stats['IQR']
-        
-        lower_bound = q1 - 1.5 * iqr
-        upper_bound = q3 + 1.5 * iqr
-        
-        outliers = sensor_data[(sensor_data[param] < lower_bound) | (sensor_data[param] > upper_bound)]
-        
-        if not outliers.empty:
-            st.warning(f"Found {len(outliers)} outliers in {display_name} data.")
-            
-            # Display the outliers
-            st.dataframe(
-                outliers[['timestamp', param]].rename(columns={param: display_name}),
-                use_container_width=True
-            )
-        else:
-            st.success(f"No outliers found in {display_name} data.")
+    
+    st.markdown("---")
+    
+    # สร้างแท็บสำหรับการแสดงผลต่างๆ
+    tabs = st.tabs(["ข้อมูลอนุกรมเวลา", "รูปแบบรายชั่วโมง", "ความสัมพันธ์", "สถิติ"])
+    
+    # แท็บข้อมูลอนุกรมเวลา
+    with tabs[0]:
+        _show_time_series_tab(sensor_data, sensor_id, location_name)
+    
+    # แท็บรูปแบบรายชั่วโมง
+    with tabs[1]:
+        _show_hourly_tab(sensor_data, sensor_id)
+    
+    # Correlations tab
+    with tabs[2]:
+        _show_correlations_tab(sensor_data, sensor_id)
+    
+    # Statistics tab
+    with tabs[3]:
+        _show_statistics_tab(sensor_data, sensor_id)
@@ -4,912 +4,1176 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from scipy import stats
 
-def show_trend_analysis_dashboard(data):
+from ._kernels import downsample_indices, mann_kendall, frame_fingerprint
+
+# Numba lets pandas compute wide rolling windows as one JIT-compiled table pass;
+# without it the default Cython rolling is used
+try:
+    import numba  # noqa: F401
+except ImportError:
+    numba = None
+
+# Row count above which the one-off Numba compilation pays for itself
+NUMBA_ROLLING_MIN_ROWS = 200_000
+
+# Maximum number of points per time series trace sent to the browser
+MAX_PLOT_POINTS = 2000
+
+# Parameter display name -> column suffix
+PARAM_MAP = {
+    "pH": "ph",
+    "Temperature": "temp",
+    "Conductivity": "conductivity",
+    "Dissolved Oxygen": "dissolved_oxygen",
+    "Turbidity": "turbidity"
+}
+
+# Parameter display name -> unit
+UNIT_MAP = {
+    "pH": "",
+    "Temperature": "°C",
+    "Conductivity": "μS/cm",
+    "Dissolved Oxygen": "mg/L",
+    "Turbidity": "NTU"
+}
+
+# Column suffix -> (display name, unit)
+PARAM_META = {
+    'ph': ("pH", ""),
+    'temp': ("Temperature", "°C"),
+    'conductivity': ("Conductivity", "μS/cm"),
+    'dissolved_oxygen': ("Dissolved Oxygen", "mg/L"),
+    'turbidity': ("Turbidity", "NTU")
+}
+
+# Labels for the day of week (Monday = 0) and month (January = 1) keys
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MONTH_NAMES = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+]
+
+@st.cache_data(show_spinner=False)
+def _sensor_id_to_name(sensor_info):
     """
-    แสดงแดชบอร์ดการวิเคราะห์แนวโน้มสำหรับเซ็นเซอร์ทั้งหมด
+    Map each sensor ID to its location name.
     
-    พารามิเตอร์:
-    - data: พจนานุกรมที่มีข้อมูลเซ็นเซอร์ทั้งหมด
+    Parameters:
+    - sensor_info: DataFrame with sensor metadata
+    
+    Returns:
+    - Dictionary of sensor_id -> location_name (the first row wins for duplicate IDs)
     """
-    st.header("แดชบอร์ดการวิเคราะห์แนวโน้ม")
-    st.markdown("แดชบอร์ดนี้ให้เครื่องมือสำหรับวิเคราะห์แนวโน้มของพารามิเตอร์คุณภาพดินตลอดเวลา")
+    ids = sensor_info['sensor_id'].tolist()
+    names = sensor_info['location_name'].tolist()
+    return dict(reversed(list(zip(ids, names))))
+
+def _group_stats(keys, values, n_groups, valid=None):
+    """
+    Calculate the mean, standard deviation and count of values per small integer key.
     
-    # Get the data
-    combined_data = data['combined_data']
-    sensor_info = data['sensor_info']
-    daily_summary = data['daily_summary']
+    Parameters:
+    - keys: Integer array of group keys in [0, n_groups)
+    - values: Float array of the values to aggregate (NaNs are ignored)
+    - n_groups: Number of possible keys
+    - valid: Boolean array flagging the non-NaN values (default: computed from values)
     
-    # สร้างแท็บสำหรับการวิเคราะห์แนวโน้มต่างๆ
-    tabs = st.tabs([
-        "การวิเคราะห์อนุกรมเวลา", 
-        "รูปแบบตามฤดูกาล", 
-        "การวิเคราะห์ความสัมพันธ์",
-        "การตรวจจับแนวโน้ม"
-    ])
-    # แท็บการวิเคราะห์การเปลี่ยนแปลงของข้อมูลในอนาคต
-    # แท็บการวิเคราะห์อนุกรมเวลา
-    with tabs[0]:
-        st.subheader("การวิเคราะห์อนุกรมเวลา")
-        
-        # Create date range selector
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            start_date = st.date_input(
-                "Start Date",
-                value=combined_data['timestamp'].min().date(),
-                min_value=combined_data['timestamp'].min().date(),
-                max_value=combined_data['timestamp'].max().date(),
-                key="ts_start_date"
-            )
-        
-        with col2:
-            end_date = st.date_input(
-                "End Date",
-                value=combined_data['timestamp'].max().date(),
-                min_value=combined_data['timestamp'].min().date(),
-                max_value=combined_data['timestamp'].max().date(),
-                key="ts_end_date"
-            )
-        
-        # Filter data by date range
-        filtered_data = combined_data[
-            (combined_data['timestamp'].dt.date >= start_date) &
-            (combined_data['timestamp'].dt.date <= end_date)
-        ]
-        
-        # Parameter and sensor selection
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            parameter = st.selectbox(
-                "Select Parameter",
-                ["pH", "Temperature", "Conductivity", "Dissolved Oxygen", "Turbidity"],
-                key="ts_parameter"
-            )
-        
-        with col2:
-            # Get the number of sensors
-            num_sensors = len([col for col in combined_data.columns if col.endswith('_ph')])
-            
-            # Create a list of sensor options with location names
-            sensor_options = []
-            for i in range(1, num_sensors + 1):
-                sensor_info_row = sensor_info[sensor_info['sensor_id'] == i]
-                if not sensor_info_row.empty:
-                    location_name = sensor_info_row['location_name'].values[0]
-                    sensor_options.append(f"Sensor {i} ({location_name})")
-                else:
-                    sensor_options.append(f"Sensor {i}")
-            
-            selected_sensors = st.multiselect(
-                "Select Sensors",
-                sensor_options,
-                default=sensor_options[:3],
-                key="ts_sensors"
-            )
-        
-        # Map parameter to column name
-        param_map = {
-            "pH": "ph",
-            "Temperature": "temp",
-            "Conductivity": "conductivity",
-            "Dissolved Oxygen": "dissolved_oxygen",
-            "Turbidity": "turbidity"
-        }
-        
-        param_code = param_map[parameter]
-        
-        # Map parameter to unit
-        unit_map = {
-            "pH": "",
-            "Temperature": "°C",
-            "Conductivity": "μS/cm",
-            "Dissolved Oxygen": "mg/L",
-            "Turbidity": "NTU"
-        }
-        
-        unit = unit_map[parameter]
-        
-        # Extract sensor IDs from selected sensors
-        selected_sensor_ids = [int(s.split()[1].split('(')[0]) for s in selected_sensors]
-        
-        if not selected_sensor_ids:
-            st.warning("Please select at least one sensor.")
-        else:
-            # Create the time series plot
-            fig = go.Figure()
-            
-            for sensor_id in selected_sensor_ids:
-                # Get the sensor info
-                sensor_info_row = sensor_info[sensor_info['sensor_id'] == sensor_id]
-                if not sensor_info_row.empty:
-                    location_name = sensor_info_row['location_name'].values[0]
-                else:
-                    location_name = f"Sensor {sensor_id}"
-                
-                # Get the column name
-                col_name = f'sensor_{sensor_id}_{param_code}'
-                
-                if col_name in filtered_data.columns:
-                    # Add the trace
-                    fig.add_trace(go.Scatter(
-                        x=filtered_data['timestamp'],
-                        y=filtered_data[col_name],
-                        mode='lines',
-                        name=f"Sensor {sensor_id} ({location_name})"
-                    ))
-            
-            # Add reference lines for pH if selected
-            if parameter == "pH":
-                fig.add_shape(
-                    type="line",
-                    x0=filtered_data['timestamp'].min(),
-                    y0=6.5,
-                    x1=filtered_data['timestamp'].max(),
-                    y1=6.5,
-                    line=dict(color="red", width=1, dash="dash"),
-                    name="Min Normal pH"
-                )
-                
-                fig.add_shape(
-                    type="line",
-                    x0=filtered_data['timestamp'].min(),
-                    y0=8.5,
-                    x1=filtered_data['timestamp'].max(),
-                    y1=8.5,
-                    line=dict(color="red", width=1, dash="dash"),
-                    name="Max Normal pH"
-                )
-            
-            # Update the layout
-            fig.update_layout(
-                title=f"{parameter} Time Series",
-                xaxis_title="Timestamp",
-                yaxis_title=f"{parameter} {f'({unit})' if unit else ''}",
-                legend_title="Sensor",
-                hovermode="x unified"
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Add options for moving averages
-            st.subheader("Moving Averages")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                show_ma = st.checkbox("Show Moving Averages", value=False)
-            
-            if show_ma:
-                with col2:
-                    ma_window = st.slider(
-                        "Window Size (hours)",
-                        min_value=1,
-                        max_value=48,
-                        value=6,
-                        step=1
-                    )
-                
-                # Calculate the number of data points in the window
-                # Assuming data is recorded every 15 minutes
-                window_size = int(ma_window * 60 / 15)
-                
-                # Create the moving average plot
-                fig = go.Figure()
-                
-                for sensor_id in selected_sensor_ids:
-                    # Get the sensor info
-                    sensor_info_row = sensor_info[sensor_info['sensor_id'] == sensor_id]
-                    if not sensor_info_row.empty:
-                        location_name = sensor_info_row['location_name'].values[0]
-                    else:
-                        location_name = f"Sensor {sensor_id}"
-                    
-                    # Get the column name
-                    col_name = f'sensor_{sensor_id}_{param_code}'
-                    
-                    if col_name in filtered_data.columns:
-                        # Calculate the moving average
-                        ma_values = filtered_data[col_name].rolling(window=window_size, center=True).mean()
-                        
-                        # Add the trace
-                        fig.add_trace(go.Scatter(
-                            x=filtered_data['timestamp'],
-                            y=ma_values,
-                            mode='lines',
-                            name=f"Sensor {sensor_id} ({location_name}) - {ma_window}h MA"
-                        ))
-                
-                # Add reference lines for pH if selected
-                if parameter == "pH":
-                    fig.add_shape(
-                        type="line",
-                        x0=filtered_data['timestamp'].min(),
-                        y0=6.5,
-                        x1=filtered_data['timestamp'].max(),
-                        y1=6.5,
-                        line=dict(color="red", width=1, dash="dash"),
-                        name="Min Normal pH"
-                    )
-                    
-                    fig.add_shape(
-                        type="line",
-                        x0=filtered_data['timestamp'].min(),
-                        y0=8.5,
-                        x1=filtered_data['timestamp'].max(),
-                        y1=8.5,
-                        line=dict(color="red", width=1, dash="dash"),
-                        name="Max Normal pH"
-                    )
-                
-                # Update the layout
-                fig.update_layout(
-                    title=f"{parameter} {ma_window}-Hour Moving Average",
-                    xaxis_title="Timestamp",
-                    yaxis_title=f"{parameter} {f'({unit})' if unit else ''}",
-                    legend_title="Sensor",
-                    hovermode="x unified"
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
+    Returns:
+    - DataFrame with columns key, mean, std and count for every key that has values
+    """
+    # Nothing is copied when every reading is present
+    if valid is None:
+        valid = ~np.isnan(values)
+    if not valid.all():
+        keys = keys[valid]
+        values = values[valid]
     
-    # แท็บรูปแบบตามฤดูกาล
-    with tabs[1]:
-        st.subheader("รูปแบบตามฤดูกาล")
-        
-        # Parameter and sensor selection
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            parameter = st.selectbox(
-                "Select Parameter",
-                ["pH", "Temperature", "Conductivity", "Dissolved Oxygen", "Turbidity"],
-                key="sp_parameter"
-            )
-        
-        with col2:
-            # Get the number of sensors
-            num_sensors = len([col for col in combined_data.columns if col.endswith('_ph')])
-            
-            # Create a list of sensor options with location names
-            sensor_options = []
-            for i in range(1, num_sensors + 1):
-                sensor_info_row = sensor_info[sensor_info['sensor_id'] == i]
-                if not sensor_info_row.empty:
-                    location_name = sensor_info_row['location_name'].values[0]
-                    sensor_options.append(f"Sensor {i} ({location_name})")
-                else:
-                    sensor_options.append(f"Sensor {i}")
-            
-            selected_sensor = st.selectbox(
-                "Select Sensor",
-                sensor_options,
-                index=0,
-                key="sp_sensor"
-            )
-        
-        # Map parameter to column name
-        param_map = {
-            "pH": "ph",
-            "Temperature": "temp",
-            "Conductivity": "conductivity",
-            "Dissolved Oxygen": "dissolved_oxygen",
-            "Turbidity": "turbidity"
-        }
-        
-        param_code = param_map[parameter]
-        
-        # Map parameter to unit
-        unit_map = {
-            "pH": "",
-            "Temperature": "°C",
-            "Conductivity": "μS/cm",
-            "Dissolved Oxygen": "mg/L",
-            "Turbidity": "NTU"
-        }
-        
-        unit = unit_map[parameter]
-        
-        # Extract sensor ID from selected sensor
-        sensor_id = int(selected_sensor.split()[1].split('(')[0])
-        
-        # Get the column name
-        col_name = f'sensor_{sensor_id}_{param_code}'
-        
-        if col_name in combined_data.columns:
-            # Create a copy of the data with additional time components
-            pattern_data = combined_data.copy()
-            pattern_data['hour'] = pattern_data['timestamp'].dt.hour
-            pattern_data['day_of_week'] = pattern_data['timestamp'].dt.dayofweek
-            pattern_data['day_name'] = pattern_data['timestamp'].dt.day_name()
-            pattern_data['month'] = pattern_data['timestamp'].dt.month
-            pattern_data['month_name'] = pattern_data['timestamp'].dt.month_name()
-            
-            # Create tabs for different patterns
-            pattern_tabs = st.tabs(["Hourly", "Daily", "Monthly"])
-            
-            # Hourly pattern tab
-            with pattern_tabs[0]:
-                st.subheader("Hourly Pattern")
-                
-                # Group by hour
-                hourly_data = pattern_data.groupby('hour')[col_name].agg(['mean', 'std', 'count']).reset_index()
-                
-                # Create the hourly pattern plot
-                fig = go.Figure()
-                
-                # Add the mean line
-                fig.add_trace(go.Scatter(
-                    x=hourly_data['hour'],
-                    y=hourly_data['mean'],
-                    mode='lines+markers',
-                    name=f"Mean {parameter}",
-                    line=dict(color='blue')
-                ))
-                
-                # Add the standard deviation range
-                fig.add_trace(go.Scatter(
-                    x=hourly_data['hour'].tolist() + hourly_data['hour'].tolist()[::-1],
-                    y=(hourly_data['mean'] + hourly_data['std']).tolist() + 
-                      (hourly_data['mean'] - hourly_data['std']).tolist()[::-1],
-                    fill='toself',
-                    fillcolor='rgba(0, 0, 255, 0.1)',
-                    line=dict(color='rgba(255, 255, 255, 0)'),
-                    hoverinfo='skip',
-                    showlegend=True,
-                    name=f"±1 Std Dev"
-                ))
-                
-                # Update the layout
-                fig.update_layout(
-                    title=f"Hourly Pattern for {parameter} - {selected_sensor}",
-                    xaxis_title="Hour of Day",
-                    yaxis_title=f"{parameter} {f'({unit})' if unit else ''}",
-                    xaxis=dict(
-                        tickmode='array',
-                        tickvals=list(range(24)),
-                        ticktext=[f"{h:02d}:00" for h in range(24)]
-                    ),
-                    hovermode="x unified"
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-                
-                st.markdown(
-                    f"This chart shows how {parameter.lower()} varies throughout the day. "
-                    f"The blue line represents the average {parameter.lower()} for each hour, "
-                    f"and the shaded area represents one standard deviation from the mean."
-                )
-            
-            # Daily pattern tab
-            with pattern_tabs[1]:
-                st.subheader("Daily Pattern")
-                
-                # Group by day of week
-                daily_data = pattern_data.groupby(['day_of_week', 'day_name'])[col_name].agg(['mean', 'std', 'count']).reset_index()
-                
-                # Sort by day of week
-                daily_data = daily_data.sort_values('day_of_week')
-                
-                # Create the daily pattern plot
-                fig = go.Figure()
-                
-                # Add the mean line
-                fig.add_trace(go.Scatter(
-                    x=daily_data['day_name'],
-                    y=daily_data['mean'],
-                    mode='lines+markers',
-                    name=f"Mean {parameter}",
-                    line=dict(color='blue')
-                ))
-                
-                # Add the standard deviation range
-                fig.add_trace(go.Scatter(
-                    x=daily_data['day_name'].tolist() + daily_data['day_name'].tolist()[::-1],
-                    y=(daily_data['mean'] + daily_data['std']).tolist() + 
-                      (daily_data['mean'] - daily_data['std']).tolist()[::-1],
-                    fill='toself',
-                    fillcolor='rgba(0, 0, 255, 0.1)',
-                    line=dict(color='rgba(255, 255, 255, 0)'),
-                    hoverinfo='skip',
-                    showlegend=True,
-                    name=f"±1 Std Dev"
-                ))
-                
-                # Update the layout
-                fig.update_layout(
-                    title=f"Daily Pattern for {parameter} - {selected_sensor}",
-                    xaxis_title="Day of Week",
-                    yaxis_title=f"{parameter} {f'({unit})' if unit else ''}",
-                    hovermode="x unified"
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-                
-                st.markdown(
-                    f"This chart shows how {parameter.lower()} varies throughout the week. "
-                    f"The blue line represents the average {parameter.lower()} for each day, "
-                    f"and the shaded area represents one standard deviation from the mean."
-                )
-            
-            # Monthly pattern tab
-            with pattern_tabs[2]:
-                st.subheader("Monthly Pattern")
-                
-                # Group by month
-                monthly_data = pattern_data.groupby(['month', 'month_name'])[col_name].agg(['mean', 'std', 'count']).reset_index()
-                
-                # Sort by month
-                monthly_data = monthly_data.sort_values('month')
-                
-                # Create the monthly pattern plot
-                fig = go.Figure()
-                
-                # Add the mean line
-                fig.add_trace(go.Scatter(
-                    x=monthly_data['month_name'],
-                    y=monthly_data['mean'],
-                    mode='lines+markers',
-                    name=f"Mean {parameter}",
-                    line=dict(color='blue')
-                ))
-                
-                # Add the standard deviation range
-                fig.add_trace(go.Scatter(
-                    x=monthly_data['month_name'].tolist() + monthly_data['month_name'].tolist()[::-1],
-                    y=(monthly_data['mean'] + monthly_data['std']).tolist() + 
-                      (monthly_data['mean'] - monthly_data['std']).tolist()[::-1],
-                    fill='toself',
-                    fillcolor='rgba(0, 0, 255, 0.1)',
-                    line=dict(color='rgba(255, 255, 255, 0)'),
-                    hoverinfo='skip',
-                    showlegend=True,
-                    name=f"±1 Std Dev"
-                ))
-                
-                # Update the layout
-                fig.update_layout(
-                    title=f"Monthly Pattern for {parameter} - {selected_sensor}",
-                    xaxis_title="Month",
-                    yaxis_title=f"{parameter} {f'({unit})' if unit else ''}",
-                    hovermode="x unified"
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-                
-                st.markdown(
-                    f"This chart shows how {parameter.lower()} varies throughout the year. "
-                    f"The blue line represents the average {parameter.lower()} for each month, "
-                    f"and the shaded area represents one standard deviation from the mean."
-                )
+    # np.bincount sums each group in one pass instead of a hashed groupby; the
+    # std uses a second pass over the deviations so it stays numerically stable
+    count = np.bincount(keys, minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(keys, weights=values, minlength=n_groups) / count
+        sq_dev = np.bincount(keys, weights=(values - mean[keys]) ** 2, minlength=n_groups)
+        std = np.sqrt(sq_dev / (count - 1))
     
-    # แท็บการวิเคราะห์ความสัมพันธ์
-    with tabs[2]:
-        st.subheader("การวิเคราะห์ความสัมพันธ์")
-        
-        # Sensor selection
-        # Get the number of sensors
-        num_sensors = len([col for col in combined_data.columns if col.endswith('_ph')])
-        
-        # Create a list of sensor options with location names
-        sensor_options = []
-        for i in range(1, num_sensors + 1):
-            sensor_info_row = sensor_info[sensor_info['sensor_id'] == i]
-            if not sensor_info_row.empty:
-                location_name = sensor_info_row['location_name'].values[0]
-                sensor_options.append(f"Sensor {i} ({location_name})")
-            else:
-                sensor_options.append(f"Sensor {i}")
-        
-        selected_sensor = st.selectbox(
-            "Select Sensor",
-            sensor_options,
-            index=0,
-            key="corr_sensor"
-        )
-        
-        # Extract sensor ID from selected sensor
-        sensor_id = int(selected_sensor.split()[1].split('(')[0])
-        
-        # Create a dataframe with all parameters for the selected sensor
-        sensor_data = combined_data[['timestamp']].copy()
-        
-        for param in ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity']:
-            col_name = f'sensor_{sensor_id}_{param}'
-            if col_name in combined_data.columns:
-                sensor_data[param] = combined_data[col_name]
-        
-        # Calculate correlations
-        corr_data = sensor_data.drop('timestamp', axis=1).corr()
-        
-        # Create a heatmap
-        fig = px.imshow(
-            corr_data,
-            x=corr_data.columns,
-            y=corr_data.columns,
-            color_continuous_scale='RdBu_r',
-            zmin=-1,
-            zmax=1,
-            text_auto='.2f'
-        )
-        
-        fig.update_layout(
-            title=f"Correlation Matrix for {selected_sensor}",
-            xaxis_title="Parameter",
-            yaxis_title="Parameter"
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown(
-            "This heatmap shows the correlation between different parameters. "
-            "A value close to 1 indicates a strong positive correlation, "
-            "a value close to -1 indicates a strong negative correlation, "
-            "and a value close to 0 indicates little to no correlation."
-        )
-        
-        # Create scatter plots for selected parameters
-        st.subheader("Parameter Relationships")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            x_param = st.selectbox(
-                "X-axis Parameter",
-                ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity'],
-                index=0,
-                key="corr_x_param"
-            )
-        
-        with col2:
-            y_param = st.selectbox(
-                "Y-axis Parameter",
-                ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity'],
-                index=1,
-                key="corr_y_param"
-            )
-        
-        # Get the display names and units
-        params = {
-            'ph': {"name": "pH", "unit": ""},
-            'temp': {"name": "Temperature", "unit": "°C"},
-            'conductivity': {"name": "Conductivity", "unit": "μS/cm"},
-            'dissolved_oxygen': {"name": "Dissolved Oxygen", "unit": "mg/L"},
-            'turbidity': {"name": "Turbidity", "unit": "NTU"}
-        }
-        
-        x_display = params[x_param]["name"]
-        x_unit = params[x_param]["unit"]
-        y_display = params[y_param]["name"]
-        y_unit = params[y_param]["unit"]
-        
-        # Create the scatter plot
-        fig = px.scatter(
-            sensor_data,
-            x=x_param,
-            y=y_param,
-            color='timestamp',
-            color_continuous_scale='Viridis',
-            opacity=0.7,
-            trendline="ols"
+    present = np.flatnonzero(count)
+    return pd.DataFrame({
+        'key': present,
+        'mean': mean[present],
+        'std': std[present],
+        'count': count[present]
+    })
+
+def _std_band(x, mean, std):
+    """
+    Build the outline of a mean ± std band for a filled Plotly trace.
+    
+    Parameters:
+    - x: Array of x values
+    - mean: Array of means, one per x value
+    - std: Array of standard deviations, one per x value
+    
+    Returns:
+    - Tuple of (x, y) arrays tracing the upper edge forwards and the lower edge back
+    """
+    x = np.asarray(x)
+    mean = np.asarray(mean)
+    std = np.asarray(std)
+    return np.concatenate([x, x[::-1]]), np.concatenate([mean + std, (mean - std)[::-1]])
+
+def _ph_reference_shapes(timestamps):
+    """
+    Build the dashed lines marking the normal pH range (6.5 to 8.5).
+    
+    Parameters:
+    - timestamps: Series of the plotted timestamps
+    
+    Returns:
+    - List of Plotly line shape dictionaries spanning the plotted time range
+    """
+    x0, x1 = timestamps.min(), timestamps.max()
+    return [
+        dict(type="line", x0=x0, y0=6.5, x1=x1, y1=6.5,
+             line=dict(color="red", width=1, dash="dash"), name="Min Normal pH"),
+        dict(type="line", x0=x0, y0=8.5, x1=x1, y1=8.5,
+             line=dict(color="red", width=1, dash="dash"), name="Max Normal pH")
+    ]
+
+def _rolling_mean(data, window_size):
+    """
+    Calculate a centered moving average of every column at once.
+    
+    Parameters:
+    - data: DataFrame of numeric columns
+    - window_size: Window length in rows
+    
+    Returns:
+    - DataFrame of moving averages with the same index and columns
+    """
+    # The Numba table method runs all columns in one parallel pass, but its first
+    # call compiles for several seconds, so it is only used on large frames
+    if numba is not None and len(data) >= NUMBA_ROLLING_MIN_ROWS:
+        return data.rolling(window=window_size, center=True, method='table').mean(
+            engine='numba',
+            engine_kwargs={'nopython': True, 'nogil': True, 'parallel': True}
         )
-        
-        fig.update_layout(
-            title=f"{y_display} vs {x_display} for {selected_sensor}",
-            xaxis_title=f"{x_display} {f'({x_unit})' if x_unit else ''}",
-            yaxis_title=f"{y_display} {f'({y_unit})' if y_unit else ''}",
-            coloraxis_colorbar_title="Time"
+    
+    return data.rolling(window=window_size, center=True).mean()
+
+def _pearson_corr(data):
+    """
+    Calculate the Pearson correlation matrix of the columns of a DataFrame.
+    
+    Parameters:
+    - data: DataFrame of numeric columns
+    
+    Returns:
+    - DataFrame with the pairwise correlations, labelled by the column names
+    """
+    arr = data.to_numpy(dtype=np.float32)
+    
+    # pandas' pairwise-complete handling is needed when readings are missing
+    if np.isnan(arr).any() or len(arr) < 2:
+        return data.corr()
+    
+    # Standardize the columns, then one single-precision matrix product gives
+    # every correlation
+    arr = arr - arr.mean(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        arr /= arr.std(axis=0, ddof=1)
+    corr = (arr.T @ arr) / (len(arr) - 1)
+    
+    return pd.DataFrame(corr.astype(np.float64), index=data.columns, columns=data.columns)
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _downcast_readings(combined_data):
+    """
+    Store the sensor readings as float32.
+    
+    Parameters:
+    - combined_data: DataFrame with 'sensor_<id>_<param>' columns
+    
+    Returns:
+    - Copy of combined_data with every float sensor column as float32
+    """
+    # The readings carry about three significant digits, so single precision
+    # loses nothing visible and halves the memory the plots and correlations read
+    return combined_data.astype({
+        col: 'float32' for col in combined_data.columns
+        if col.startswith('sensor_') and combined_data[col].dtype == np.float64
+    })
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _valid_masks(combined_data):
+    """
+    Flag the non-missing readings of every sensor column.
+    
+    Parameters:
+    - combined_data: DataFrame with 'sensor_<id>_<param>' columns
+    
+    Returns:
+    - Dictionary of column name -> boolean array, True where the reading is not NaN
+    """
+    # One NaN scan over all sensor columns, reused by every tab instead of
+    # each aggregation checking its own column again
+    cols = [col for col in combined_data.columns if col.startswith('sensor_')]
+    valid = ~np.isnan(combined_data[cols].to_numpy())
+    return {col: valid[:, k] for k, col in enumerate(cols)}
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _time_features(combined_data):
+    """
+    Derive the calendar components of every reading as small integer arrays.
+    
+    Parameters:
+    - combined_data: DataFrame with a 'timestamp' column
+    
+    Returns:
+    - Dictionary with the arrays hour (0-23), day_of_week (Monday = 0),
+      month (January = 1) and day_id (days since 1970-01-01)
+    """
+    ns = combined_data['timestamp'].to_numpy().view(np.int64)
+    
+    # Integer arithmetic on the nanosecond timestamps instead of one .dt
+    # accessor per component; 1970-01-01 was a Thursday (day of week 3)
+    day_id = ns // (86_400 * 10**9)
+    months = combined_data['timestamp'].to_numpy().astype('datetime64[M]').view(np.int64)
+    return {
+        'hour': (ns // (3_600 * 10**9) % 24).astype(np.int8),
+        'day_of_week': ((day_id + 3) % 7).astype(np.int8),
+        'month': (months % 12 + 1).astype(np.int8),
+        'day_id': day_id.astype(np.int32)
+    }
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _daily_means(combined_data, col_name):
+    """
+    Average one column per calendar day.
+    
+    Parameters:
+    - combined_data: DataFrame with a 'timestamp' column, sorted by time
+    - col_name: Column to average
+    
+    Returns:
+    - DataFrame with the day (at midnight) in 'timestamp' and its mean in col_name,
+      for every day that has readings
+    """
+    day_id = _time_features(combined_data)['day_id']
+    values = combined_data[col_name].to_numpy(dtype=np.float64)
+    
+    # The data is sorted, so each day is a contiguous run and one reduceat sums them all
+    starts = np.flatnonzero(np.r_[True, day_id[1:] != day_id[:-1]])
+    valid = _valid_masks(combined_data)[col_name]
+    sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+    counts = np.add.reduceat(valid.astype(np.int64), starts)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+    
+    return pd.DataFrame({
+        'timestamp': day_id[starts].astype('datetime64[D]').astype('datetime64[ns]'),
+        col_name: means
+    })
+
+@st.cache_data(show_spinner=False)
+def _trend_test(values):
+    """
+    Mann-Kendall trend test of a daily series, cached by the values.
+    
+    Parameters:
+    - values: Array of daily means in time order
+    
+    Returns:
+    - Tuple of (tau, p-value)
+    """
+    return mann_kendall(values)
+
+@st.cache_data(show_spinner=False)
+def _decompose(series_bytes, period):
+    """
+    Additive seasonal decomposition of a series.
+    
+    Parameters:
+    - series_bytes: float64 values of the series as raw bytes (hashable, so
+      reruns with the same data are served from the cache)
+    - period: Length of the seasonal cycle in samples
+    
+    Returns:
+    - Tuple of (observed, trend, seasonal, resid) arrays
+    """
+    from statsmodels.tsa.seasonal import seasonal_decompose
+    
+    values = pd.Series(np.frombuffer(series_bytes, dtype=np.float64))
+    result = seasonal_decompose(values, model='additive', period=period)
+    return (
+        result.observed.to_numpy(),
+        result.trend.to_numpy(),
+        result.seasonal.to_numpy(),
+        result.resid.to_numpy()
+    )
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _cross_sensor_corr(combined_data, param_code, num_sensors, name_map):
+    """
+    Correlate one parameter between all sensors.
+    
+    Parameters:
+    - combined_data: DataFrame with 'sensor_<id>_<param>' columns
+    - param_code: Column suffix of the parameter
+    - num_sensors: Number of sensors in the combined data
+    - name_map: Dictionary of sensor_id -> location_name
+    
+    Returns:
+    - Correlation matrix labelled "Sensor <id> (<location>)"
+    """
+    sensor_ids = [
+        i for i in range(1, num_sensors + 1)
+        if f'sensor_{i}_{param_code}' in combined_data.columns
+    ]
+    labels = [f"Sensor {i} ({name_map.get(i, f'Sensor {i}')})" for i in sensor_ids]
+    
+    corr = _pearson_corr(combined_data[[f'sensor_{i}_{param_code}' for i in sensor_ids]])
+    corr.index = labels
+    corr.columns = labels
+    return corr
+
+@st.cache_data(show_spinner=False)
+def _build_sensor_options(sensor_info, num_sensors):
+    """
+    Build the sensor selector labels, e.g. "Sensor 1 (Chiang Mai Rice Field)".
+    
+    Parameters:
+    - sensor_info: DataFrame with sensor metadata
+    - num_sensors: Number of sensors in the combined data
+    
+    Returns:
+    - Tuple of (list of labels for sensors 1 to num_sensors, dictionary of label -> sensor ID)
+    """
+    name_map = _sensor_id_to_name(sensor_info)
+    label_to_id = {
+        (f"Sensor {i} ({name_map[i]})" if i in name_map else f"Sensor {i}"): i
+        for i in range(1, num_sensors + 1)
+    }
+    return list(label_to_id), label_to_id
+
+@st.fragment
+def _show_time_series_tab(combined_data, name_map, sensor_options, label_to_id):
+    """
+    Show the time series tab: date range filter, sensor plot and moving averages.
+    
+    Parameters:
+    - combined_data: DataFrame with the combined sensor readings
+    - name_map: Dictionary of sensor_id -> location_name
+    - sensor_options: Sensor selector labels
+    - label_to_id: Dictionary of sensor selector label -> sensor ID
+    """
+    st.subheader("การวิเคราะห์อนุกรมเวลา")
+    
+    # Create date range selector
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        start_date = st.date_input(
+            "Start Date",
+            value=combined_data['timestamp'].min().date(),
+            min_value=combined_data['timestamp'].min().date(),
+            max_value=combined_data['timestamp'].max().date(),
+            key="ts_start_date"
         )
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Calculate and display the correlation coefficient
-        corr = sensor_data[[x_param, y_param]].corr().iloc[0, 1]
-        
-        if abs(corr) > 0.7:
-            strength = "strong"
-        elif abs(corr) > 0.3:
-            strength = "moderate"
-        else:
-            strength = "weak"
-        
-        direction = "positive" if corr > 0 else "negative"
-        
-        st.markdown(
-            f"The correlation coefficient between {x_display.lower()} and {y_display.lower()} is "
-            f"**{corr:.2f}**, indicating a {strength} {direction} correlation."
+    
+    with col2:
+        end_date = st.date_input(
+            "End Date",
+            value=combined_data['timestamp'].max().date(),
+            min_value=combined_data['timestamp'].min().date(),
+            max_value=combined_data['timestamp'].max().date(),
+            key="ts_end_date"
         )
-        
-        # Cross-correlation between sensors
-        st.subheader("Cross-Sensor Correlation")
-        
-        # Parameter selection
+    
+    # Filter data by date range; readings are sorted by time, so the
+    # range is a contiguous slice found by binary search
+    all_timestamps = combined_data['timestamp'].to_numpy()
+    lo = np.searchsorted(all_timestamps, np.datetime64(start_date), side='left')
+    hi = np.searchsorted(all_timestamps, np.datetime64(end_date) + np.timedelta64(1, 'D'), side='left')
+    filtered_data = combined_data.iloc[lo:hi]
+    
+    # Parameter and sensor selection
+    col1, col2 = st.columns(2)
+    
+    with col1:
         parameter = st.selectbox(
             "Select Parameter",
             ["pH", "Temperature", "Conductivity", "Dissolved Oxygen", "Turbidity"],
-            key="cross_corr_parameter"
+            key="ts_parameter"
         )
-        
-        param_code = param_map[parameter]
-        
-        # Create a dataframe with the selected parameter for all sensors
-        cross_corr_data = pd.DataFrame()
-        
-        for i in range(1, num_sensors + 1):
-            col_name = f'sensor_{i}_{param_code}'
-            if col_name in combined_data.columns:
-                # Get the sensor info
-                sensor_info_row = sensor_info[sensor_info['sensor_id'] == i]
-                if not sensor_info_row.empty:
-                    location_name = sensor_info_row['location_name'].values[0]
-                else:
-                    location_name = f"Sensor {i}"
-                
-                cross_corr_data[f"Sensor {i} ({location_name})"] = combined_data[col_name]
-        
-        # Calculate correlations
-        cross_corr_matrix = cross_corr_data.corr()
-        
-        # Create a heatmap
-        fig = px.imshow(
-            cross_corr_matrix,
-            x=cross_corr_matrix.columns,
-            y=cross_corr_matrix.columns,
-            color_continuous_scale='RdBu_r',
-            zmin=-1,
-            zmax=1,
-            text_auto='.2f'
+    
+    with col2:
+        selected_sensors = st.multiselect(
+            "Select Sensors",
+            sensor_options,
+            default=sensor_options[:3],
+            key="ts_sensors"
         )
+    
+    # Map the parameter to its column suffix and unit
+    param_code = PARAM_MAP[parameter]
+    unit = UNIT_MAP[parameter]
+    
+    # Extract sensor IDs from selected sensors
+    selected_sensor_ids = [label_to_id[s] for s in selected_sensors]
+    
+    if not selected_sensor_ids:
+        st.warning("Please select at least one sensor.")
+    else:
+        # Collect one trace per sensor, then build the figure in one call
+        traces = []
+        
+        # Sensors that record the parameter; their readings are copied once
+        # into a 2-D array with one column per sensor
+        plot_ids = [
+            sensor_id for sensor_id in selected_sensor_ids
+            if f'sensor_{sensor_id}_{param_code}' in filtered_data.columns
+        ]
+        plot_cols = [f'sensor_{sensor_id}_{param_code}' for sensor_id in plot_ids]
+        timestamps = filtered_data['timestamp'].to_numpy()
+        readings = filtered_data[plot_cols].to_numpy()
+        reading_masks = _valid_masks(combined_data)
+        
+        for k, sensor_id in enumerate(plot_ids):
+            # Get the sensor info
+            location_name = name_map.get(sensor_id, f"Sensor {sensor_id}")
+            
+            # Drop missing readings, then downsample so long date
+            # ranges stay responsive
+            values = readings[:, k]
+            valid = reading_masks[plot_cols[k]][lo:hi]
+            x, y = timestamps[valid], values[valid]
+            idx = downsample_indices(x.astype(np.int64), y, MAX_PLOT_POINTS)
+            
+            # Add the trace
+            traces.append(go.Scatter(
+                x=x[idx],
+                y=y[idx],
+                mode='lines',
+                name=f"Sensor {sensor_id} ({location_name})"
+            ))
         
-        fig.update_layout(
-            title=f"Cross-Sensor Correlation Matrix for {parameter}",
-            xaxis_title="Sensor",
-            yaxis_title="Sensor"
-        )
+        # Create the time series plot, with reference lines for pH if selected
+        fig = go.Figure(data=traces, layout=dict(
+            title=f"{parameter} Time Series",
+            xaxis_title="Timestamp",
+            yaxis_title=f"{parameter} {f'({unit})' if unit else ''}",
+            legend_title="Sensor",
+            hovermode="x unified",
+            shapes=_ph_reference_shapes(filtered_data['timestamp']) if parameter == "pH" else []
+        ))
         
         st.plotly_chart(fig, use_container_width=True)
         
-        st.markdown(
-            f"This heatmap shows the correlation of {parameter.lower()} readings between different sensors. "
-            "A high correlation indicates that sensors are measuring similar patterns, "
-            "while a low correlation may indicate different water conditions or sensor issues."
-        )
-    
-    # แท็บการตรวจจับแนวโน้ม
-    with tabs[3]:
-        st.subheader("การตรวจจับแนวโน้ม")
+        # Add options for moving averages
+        st.subheader("Moving Averages")
         
-        # Parameter and sensor selection
         col1, col2 = st.columns(2)
         
         with col1:
-            parameter = st.selectbox(
-                "Select Parameter",
-                ["pH", "Temperature", "Conductivity", "Dissolved Oxygen", "Turbidity"],
-                key="trend_parameter"
+            show_ma = st.checkbox("Show Moving Averages", value=False)
+        
+        if show_ma:
+            with col2:
+                ma_window = st.slider(
+                    "Window Size (hours)",
+                    min_value=1,
+                    max_value=48,
+                    value=6,
+                    step=1
+                )
+            
+            # Calculate the number of data points in the window
+            # Assuming data is recorded every 15 minutes
+            window_size = int(ma_window * 60 / 15)
+            
+            # Calculate the moving averages of all selected sensors in one call
+            ma_values = _rolling_mean(filtered_data[plot_cols], window_size).to_numpy()
+            
+            # Collect one trace per sensor, then build the figure in one call
+            traces = []
+            
+            for k, sensor_id in enumerate(plot_ids):
+                # Get the sensor info
+                location_name = name_map.get(sensor_id, f"Sensor {sensor_id}")
+                
+                # Add the trace
+                traces.append(go.Scatter(
+                    x=timestamps,
+                    y=ma_values[:, k],
+                    mode='lines',
+                    name=f"Sensor {sensor_id} ({location_name}) - {ma_window}h MA"
+                ))
+            
+            # Create the moving average plot, with reference lines for pH if selected
+            fig = go.Figure(data=traces, layout=dict(
+                title=f"{parameter} {ma_window}-Hour Moving Average",
+                xaxis_title="Timestamp",
+                yaxis_title=f"{parameter} {f'({unit})' if unit else ''}",
+                legend_title="Sensor",
+                hovermode="x unified",
+                shapes=_ph_reference_shapes(filtered_data['timestamp']) if parameter == "pH" else []
+            ))
+            
+            st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def _show_seasonal_tab(combined_data, sensor_options, label_to_id):
+    """
+    Show the seasonal pattern tab: hourly, daily and monthly patterns of one sensor.
+    
+    Parameters:
+    - combined_data: DataFrame with the combined sensor readings
+    - sensor_options: Sensor selector labels
+    - label_to_id: Dictionary of sensor selector label -> sensor ID
+    """
+    st.subheader("รูปแบบตามฤดูกาล")
+    
+    # Parameter and sensor selection
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        parameter = st.selectbox(
+            "Select Parameter",
+            ["pH", "Temperature", "Conductivity", "Dissolved Oxygen", "Turbidity"],
+            key="sp_parameter"
+        )
+    
+    with col2:
+        selected_sensor = st.selectbox(
+            "Select Sensor",
+            sensor_options,
+            index=0,
+            key="sp_sensor"
+        )
+    
+    # Map the parameter to its column suffix and unit
+    param_code = PARAM_MAP[parameter]
+    unit = UNIT_MAP[parameter]
+    
+    # Extract sensor ID from selected sensor
+    sensor_id = label_to_id[selected_sensor]
+    
+    # Get the column name
+    col_name = f'sensor_{sensor_id}_{param_code}'
+    
+    if col_name in combined_data.columns:
+        # Group the selected column by the cached calendar components, skipping
+        # the readings flagged missing by the cached NaN mask
+        time_features = _time_features(combined_data)
+        values = combined_data[col_name].to_numpy(dtype=np.float64)
+        valid = _valid_masks(combined_data)[col_name]
+        
+        # Create tabs for different patterns
+        pattern_tabs = st.tabs(["Hourly", "Daily", "Monthly"])
+        
+        # Hourly pattern tab
+        with pattern_tabs[0]:
+            st.subheader("Hourly Pattern")
+            
+            # Group by hour
+            hourly_data = _group_stats(time_features['hour'], values, 24, valid).rename(columns={'key': 'hour'})
+            
+            # Create the hourly pattern plot
+            fig = go.Figure()
+            
+            # Add the mean line
+            fig.add_trace(go.Scatter(
+                x=hourly_data['hour'],
+                y=hourly_data['mean'],
+                mode='lines+markers',
+                name=f"Mean {parameter}",
+                line=dict(color='blue')
+            ))
+            
+            # Add the standard deviation range
+            band_x, band_y = _std_band(hourly_data['hour'], hourly_data['mean'], hourly_data['std'])
+            fig.add_trace(go.Scatter(
+                x=band_x,
+                y=band_y,
+                fill='toself',
+                fillcolor='rgba(0, 0, 255, 0.1)',
+                line=dict(color='rgba(255, 255, 255, 0)'),
+                hoverinfo='skip',
+                showlegend=True,
+                name=f"±1 Std Dev"
+            ))
+            
+            # Update the layout
+            fig.update_layout(
+                title=f"Hourly Pattern for {parameter} - {selected_sensor}",
+                xaxis_title="Hour of Day",
+                yaxis_title=f"{parameter} {f'({unit})' if unit else ''}",
+                xaxis=dict(
+                    tickmode='array',
+                    tickvals=list(range(24)),
+                    ticktext=[f"{h:02d}:00" for h in range(24)]
+                ),
+                hovermode="x unified"
             )
-        
-        with col2:
-            # Get the number of sensors
-            num_sensors = len([col for col in combined_data.columns if col.endswith('_ph')])
-            
-            # Create a list of sensor options with location names
-            sensor_options = []
-            for i in range(1, num_sensors + 1):
-                sensor_info_row = sensor_info[sensor_info['sensor_id'] == i]
-                if not sensor_info_row.empty:
-                    location_name = sensor_info_row['location_name'].values[0]
-                    sensor_options.append(f"Sensor {i} ({location_name})")
-                else:
-                    sensor_options.append(f"Sensor {i}")
             
-            selected_sensor = st.selectbox(
-                "Select Sensor",
-                sensor_options,
-                index=0,
-                key="trend_sensor"
+            st.plotly_chart(fig, use_container_width=True)
+            
+            st.markdown(
+                f"This chart shows how {parameter.lower()} varies throughout the day. "
+                f"The blue line represents the average {parameter.lower()} for each hour, "
+                f"and the shaded area represents one standard deviation from the mean."
             )
         
-        # Map parameter to column name
-        param_map = {
-            "pH": "ph",
-            "Temperature": "temp",
-            "Conductivity": "conductivity",
-            "Dissolved Oxygen": "dissolved_oxygen",
-            "Turbidity": "turbidity"
-        }
-        
-        param_code = param_map[parameter]
-        
-        # Map parameter to unit
-        unit_map = {
-            "pH": "",
-            "Temperature": "°C",
-            "Conductivity": "μS/cm",
-            "Dissolved Oxygen": "mg/L",
-            "Turbidity": "NTU"
-        }
-        
-        unit = unit_map[parameter]
-        
-        # Extract sensor ID from selected sensor
-        sensor_id = int(selected_sensor.split()[1].split('(')[0])
-        
-        # Get the column name
-        col_name = f'sensor_{sensor_id}_{param_code}'
-        
-        if col_name in combined_data.columns:
-            # Create a copy of the data with the selected parameter
-            trend_data = combined_data[['timestamp', col_name]].copy()
-            
-            # Resample to daily data for trend analysis
-            trend_data.set_index('timestamp', inplace=True)
-            daily_data = trend_data.resample('D').mean().reset_index()
-            
-            # Perform Mann-Kendall trend test
-            # This test checks if there's a monotonic upward or downward trend
-            x = np.arange(len(daily_data))
-            y = daily_data[col_name].values
-            
-            # Calculate the Mann-Kendall test
-            result = stats.kendalltau(x, y)
-            tau, p_value = result
-            
-            # Determine if there's a significant trend
-            alpha = 0.05
-            if p_value < alpha:
-                if tau > 0:
-                    trend_direction = "increasing"
-                    trend_color = "red"
-                else:
-                    trend_direction = "decreasing"
-                    trend_color = "blue"
-                
-                trend_message = (
-                    f"**Significant {trend_direction} trend detected** "
-                    f"(p-value: {p_value:.4f}, tau: {tau:.4f})"
-                )
-            else:
-                trend_direction = "no significant"
-                trend_color = "gray"
-                trend_message = (
-                    f"**No significant trend detected** "
-                    f"(p-value: {p_value:.4f}, tau: {tau:.4f})"
-                )
+        # Daily pattern tab
+        with pattern_tabs[1]:
+            st.subheader("Daily Pattern")
             
-            # Display the trend result
-            st.markdown(f"### Trend Analysis for {parameter} - {selected_sensor}")
+            # Group by day of week
+            daily_data = _group_stats(time_features['day_of_week'], values, 7, valid).rename(columns={'key': 'day_of_week'})
             
-            st.markdown(trend_message)
+            # Label each day of week (the groups are already in order)
+            daily_data.insert(1, 'day_name', np.array(DAY_NAMES)[daily_data['day_of_week']])
             
-            # Create the trend plot
+            # Create the daily pattern plot
             fig = go.Figure()
             
-            # Add the daily data
+            # Add the mean line
             fig.add_trace(go.Scatter(
-                x=daily_data['timestamp'],
-                y=daily_data[col_name],
-                mode='markers',
-                name=f"Daily {parameter}",
-                marker=dict(color='black', size=5)
+                x=daily_data['day_name'],
+                y=daily_data['mean'],
+                mode='lines+markers',
+                name=f"Mean {parameter}",
+                line=dict(color='blue')
             ))
             
-            # Add a linear regression line
-            z = np.polyfit(x, y, 1)
-            p = np.poly1d(z)
-            
+            # Add the standard deviation range
+            band_x, band_y = _std_band(daily_data['day_name'], daily_data['mean'], daily_data['std'])
             fig.add_trace(go.Scatter(
-                x=daily_data['timestamp'],
-                y=p(x),
-                mode='lines',
-                name=f"Trend Line (slope: {z[0]:.4f})",
-                line=dict(color=trend_color, width=2)
+                x=band_x,
+                y=band_y,
+                fill='toself',
+                fillcolor='rgba(0, 0, 255, 0.1)',
+                line=dict(color='rgba(255, 255, 255, 0)'),
+                hoverinfo='skip',
+                showlegend=True,
+                name=f"±1 Std Dev"
             ))
             
             # Update the layout
             fig.update_layout(
-                title=f"Trend Analysis for {parameter} - {selected_sensor}",
-                xaxis_title="Date",
+                title=f"Daily Pattern for {parameter} - {selected_sensor}",
+                xaxis_title="Day of Week",
                 yaxis_title=f"{parameter} {f'({unit})' if unit else ''}",
-                legend_title="Parameter",
                 hovermode="x unified"
             )
             
             st.plotly_chart(fig, use_container_width=True)
             
-            # Add explanation
             st.markdown(
-                f"This chart shows the daily average {parameter.lower()} values and the overall trend. "
-                f"The trend line shows the general direction of change over time."
+                f"This chart shows how {parameter.lower()} varies throughout the week. "
+                f"The blue line represents the average {parameter.lower()} for each day, "
+                f"and the shaded area represents one standard deviation from the mean."
             )
+        
+        # Monthly pattern tab
+        with pattern_tabs[2]:
+            st.subheader("Monthly Pattern")
             
-            # Add seasonal decomposition
-            st.subheader("Seasonal Decomposition")
+            # Group by month
+            monthly_data = _group_stats(time_features['month'], values, 13, valid).rename(columns={'key': 'month'})
             
-            st.markdown(
-                "Seasonal decomposition breaks down a time series into trend, seasonal, and residual components. "
-                "This can help identify underlying patterns in the data."
+            # Label each month (the groups are already in order)
+            monthly_data.insert(1, 'month_name', np.array(MONTH_NAMES)[monthly_data['month'] - 1])
+            
+            # Create the monthly pattern plot
+            fig = go.Figure()
+            
+            # Add the mean line
+            fig.add_trace(go.Scatter(
+                x=monthly_data['month_name'],
+                y=monthly_data['mean'],
+                mode='lines+markers',
+                name=f"Mean {parameter}",
+                line=dict(color='blue')
+            ))
+            
+            # Add the standard deviation range
+            band_x, band_y = _std_band(monthly_data['month_name'], monthly_data['mean'], monthly_data['std'])
+            fig.add_trace(go.Scatter(
+                x=band_x,
+                y=band_y,
+                fill='toself',
+                fillcolor='rgba(0, 0, 255, 0.1)',
+                line=dict(color='rgba(255, 255, 255, 0)'),
+                hoverinfo='skip',
+                showlegend=True,
+                name=f"±1 Std Dev"
+            ))
+            
+            # Update the layout
+            fig.update_layout(
+                title=f"Monthly Pattern for {parameter} - {selected_sensor}",
+                xaxis_title="Month",
+                yaxis_title=f"{parameter} {f'({unit})' if unit else ''}",
+                hovermode="x unified"
             )
             
-            # Check if we have enough data for seasonal decomposition
-            if len(daily_data) >= 14:  # Need at least 2 weeks of data
-                try:
-                    # Create a button to perform seasonal decomposition
-                    if st.button("Perform Seasonal Decomposition"):
-                        from statsmodels.tsa.seasonal import seasonal_decompose
-                        
-                        # Set the index to timestamp for decomposition
-                        decomp_data = daily_data.set_index('timestamp')
-                        
-                        # Perform seasonal decomposition
-                        # Period is set to 7 for weekly seasonality
-                        result = seasonal_decompose(decomp_data[col_name], model='additive', period=7)
-                        
-                        # Create a figure with subplots
-                        fig = go.Figure()
-                        
-                        # Add the observed data
-                        fig.add_trace(go.Scatter(
-                            x=decomp_data.index,
-                            y=result.observed,
-                            mode='lines',
-                            name='Observed'
-                        ))
-                        
-                        # Add the trend component
-                        fig.add_trace(go.Scatter(
-                            x=decomp_data.index,
-                            y=result.trend,
-                            mode='lines',
-                            name='Trend',
-                            line=dict(color='red')
-                        ))
-                        
-                        # Add the seasonal component
-                        fig.add_trace(go.Scatter(
-                            x=decomp_data.index,
-                            y=result.seasonal,
-                            mode='lines',
-                            name='Seasonal',
-                            line=dict(color='green')
-                        ))
-                        
-                        # Add the residual component
-                        fig.add_trace(go.Scatter(
-                            x=decomp_data.index,
-                            y=result.resid,
-                            mode='lines',
-                            name='Residual',
-                            line=dict(color='purple')
-                        ))
-                        
-                        # Update the layout
-                        fig.update_layout(
-                            title=f"Seasonal Decomposition for {parameter} - {selected_sensor}",
-                            xaxis_title="Date",
-                            yaxis_title="Component Value",
-                            legend_title="Component",
-                            hovermode="x unified"
-                        )
-                        
-                        st.plotly_chart(fig, use_container_width=True)
-                        
-                        st.markdown(
-                            "**Components:**\n"
-                            "- **Observed**: The original data\n"
-                            "- **Trend**: The overall direction of the data\n"
-                            "- **Seasonal**: Repeating patterns in the data\n"
-                            "- **Residual**: The remaining variation after removing trend and seasonal components"
-                        )
-                    else:
-                        st.info("Click the button to perform seasonal decomposition.")
-                except Exception as e:
-                    st.error(f"Error performing seasonal decomposition: {str(e)}")
+            st.plotly_chart(fig, use_container_width=True)
+            
+            st.markdown(
+                f"This chart shows how {parameter.lower()} varies throughout the year. "
+                f"The blue line represents the average {parameter.lower()} for each month, "
+                f"and the shaded area represents one standard deviation from the mean."
+            )
+
+@st.fragment
+def _show_correlation_tab(combined_data, name_map, num_sensors, sensor_options, label_to_id):
+    """
+    Show the correlation tab: parameter correlations of one sensor and between sensors.
+    
+    Parameters:
+    - combined_data: DataFrame with the combined sensor readings
+    - name_map: Dictionary of sensor_id -> location_name
+    - num_sensors: Number of sensors in the combined data
+    - sensor_options: Sensor selector labels
+    - label_to_id: Dictionary of sensor selector label -> sensor ID
+    """
+    st.subheader("การวิเคราะห์ความสัมพันธ์")
+    
+    # Sensor selection
+    selected_sensor = st.selectbox(
+        "Select Sensor",
+        sensor_options,
+        index=0,
+        key="corr_sensor"
+    )
+    
+    # Extract sensor ID from selected sensor
+    sensor_id = label_to_id[selected_sensor]
+    
+    # Gather all parameters of the selected sensor into one contiguous float32
+    # array (one column per parameter) instead of assigning DataFrame columns
+    params = [
+        param for param in ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity']
+        if f'sensor_{sensor_id}_{param}' in combined_data.columns
+    ]
+    readings = np.ascontiguousarray(
+        combined_data[[f'sensor_{sensor_id}_{param}' for param in params]].to_numpy(dtype=np.float32)
+    )
+    
+    # Calculate correlations
+    corr_data = _pearson_corr(pd.DataFrame(readings, columns=params, copy=False))
+    
+    # Create a heatmap
+    fig = px.imshow(
+        corr_data,
+        x=corr_data.columns,
+        y=corr_data.columns,
+        color_continuous_scale='RdBu_r',
+        zmin=-1,
+        zmax=1,
+        text_auto='.2f'
+    )
+    
+    fig.update_layout(
+        title=f"Correlation Matrix for {selected_sensor}",
+        xaxis_title="Parameter",
+        yaxis_title="Parameter"
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown(
+        "This heatmap shows the correlation between different parameters. "
+        "A value close to 1 indicates a strong positive correlation, "
+        "a value close to -1 indicates a strong negative correlation, "
+        "and a value close to 0 indicates little to no correlation."
+    )
+    
+    # Create scatter plots for selected parameters
+    st.subheader("Parameter Relationships")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        x_param = st.selectbox(
+            "X-axis Parameter",
+            ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity'],
+            index=0,
+            key="corr_x_param"
+        )
+    
+    with col2:
+        y_param = st.selectbox(
+            "Y-axis Parameter",
+            ['ph', 'temp', 'conductivity', 'dissolved_oxygen', 'turbidity'],
+            index=1,
+            key="corr_y_param"
+        )
+    
+    # Get the display names and units
+    x_display, x_unit = PARAM_META[x_param]
+    y_display, y_unit = PARAM_META[y_param]
+    
+    # Create the scatter plot (WebGL), colored continuously by time
+    x_values = readings[:, params.index(x_param)]
+    y_values = readings[:, params.index(y_param)]
+    timestamps = combined_data['timestamp']
+    time_values = timestamps.to_numpy().astype(np.int64) // 10**9
+    tick_idx = np.linspace(0, len(timestamps) - 1, 5).astype(int)
+    
+    fig = go.Figure(go.Scattergl(
+        x=x_values,
+        y=y_values,
+        mode='markers',
+        marker=dict(
+            color=time_values,
+            colorscale='Viridis',
+            opacity=0.7,
+            colorbar=dict(
+                title="Time",
+                tickvals=time_values[tick_idx],
+                ticktext=timestamps.iloc[tick_idx].dt.strftime('%Y-%m-%d').tolist()
+            )
+        ),
+        name="Readings",
+        showlegend=False
+    ))
+    
+    # Rows where both parameters are present, from the cached NaN masks
+    reading_masks = _valid_masks(combined_data)
+    valid = reading_masks[f'sensor_{sensor_id}_{x_param}'] & reading_masks[f'sensor_{sensor_id}_{y_param}']
+    
+    # Add an OLS trendline fitted with NumPy
+    if valid.sum() >= 2:
+        slope, intercept = np.polyfit(x_values[valid].astype(np.float64), y_values[valid].astype(np.float64), 1)
+        x_line = np.array([x_values[valid].min(), x_values[valid].max()], dtype=np.float64)
+        fig.add_trace(go.Scattergl(
+            x=x_line,
+            y=slope * x_line + intercept,
+            mode='lines',
+            line=dict(color='red'),
+            name="OLS Trendline",
+            showlegend=False
+        ))
+    
+    fig.update_layout(
+        title=f"{y_display} vs {x_display} for {selected_sensor}",
+        xaxis_title=f"{x_display} {f'({x_unit})' if x_unit else ''}",
+        yaxis_title=f"{y_display} {f'({y_unit})' if y_unit else ''}"
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Calculate and display the correlation coefficient over the rows where both are present
+    corr = np.corrcoef(x_values[valid], y_values[valid])[0, 1] if valid.sum() >= 2 else np.nan
+    
+    if abs(corr) > 0.7:
+        strength = "strong"
+    elif abs(corr) > 0.3:
+        strength = "moderate"
+    else:
+        strength = "weak"
+    
+    direction = "positive" if corr > 0 else "negative"
+    
+    st.markdown(
+        f"The correlation coefficient between {x_display.lower()} and {y_display.lower()} is "
+        f"**{corr:.2f}**, indicating a {strength} {direction} correlation."
+    )
+    
+    # Cross-correlation between sensors
+    st.subheader("Cross-Sensor Correlation")
+    
+    # Parameter selection
+    parameter = st.selectbox(
+        "Select Parameter",
+        ["pH", "Temperature", "Conductivity", "Dissolved Oxygen", "Turbidity"],
+        key="cross_corr_parameter"
+    )
+    
+    param_code = PARAM_MAP[parameter]
+    
+    # Calculate correlations of the selected parameter between all sensors
+    cross_corr_matrix = _cross_sensor_corr(combined_data, param_code, num_sensors, name_map)
+    
+    # Create a heatmap
+    fig = px.imshow(
+        cross_corr_matrix,
+        x=cross_corr_matrix.columns,
+        y=cross_corr_matrix.columns,
+        color_continuous_scale='RdBu_r',
+        zmin=-1,
+        zmax=1,
+        text_auto='.2f'
+    )
+    
+    fig.update_layout(
+        title=f"Cross-Sensor Correlation Matrix for {parameter}",
+        xaxis_title="Sensor",
+        yaxis_title="Sensor"
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown(
+        f"This heatmap shows the correlation of {parameter.lower()} readings between different sensors. "
+        "A high correlation indicates that sensors are measuring similar patterns, "
+        "while a low correlation may indicate different water conditions or sensor issues."
+    )
+
+@st.fragment
+def _show_trend_detection_tab(combined_data, sensor_options, label_to_id):
+    """
+    Show the trend detection tab: Mann-Kendall test, linear trend and seasonal decomposition.
+    
+    Parameters:
+    - combined_data: DataFrame with the combined sensor readings
+    - sensor_options: Sensor selector labels
+    - label_to_id: Dictionary of sensor selector label -> sensor ID
+    """
+    st.subheader("การตรวจจับแนวโน้ม")
+    
+    # Parameter and sensor selection
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        parameter = st.selectbox(
+            "Select Parameter",
+            ["pH", "Temperature", "Conductivity", "Dissolved Oxygen", "Turbidity"],
+            key="trend_parameter"
+        )
+    
+    with col2:
+        selected_sensor = st.selectbox(
+            "Select Sensor",
+            sensor_options,
+            index=0,
+            key="trend_sensor"
+        )
+    
+    # Map the parameter to its column suffix and unit
+    param_code = PARAM_MAP[parameter]
+    unit = UNIT_MAP[parameter]
+    
+    # Extract sensor ID from selected sensor
+    sensor_id = label_to_id[selected_sensor]
+    
+    # Get the column name
+    col_name = f'sensor_{sensor_id}_{param_code}'
+    
+    if col_name in combined_data.columns:
+        # Average to daily data for trend analysis
+        daily_data = _daily_means(combined_data, col_name)
+        
+        # Perform Mann-Kendall trend test
+        # This test checks if there's a monotonic upward or downward trend
+        x = (daily_data['timestamp'] - daily_data['timestamp'].iloc[0]).dt.days.to_numpy()
+        y = daily_data[col_name].to_numpy()
+        
+        # Calculate the Mann-Kendall test
+        tau, p_value = _trend_test(y)
+        
+        # Determine if there's a significant trend
+        alpha = 0.05
+        if p_value < alpha:
+            if tau > 0:
+                trend_direction = "increasing"
+                trend_color = "red"
             else:
-                st.warning(
-                    "Not enough data for seasonal decomposition. "
-                    "At least 14 days of data are required."
-                )
+                trend_direction = "decreasing"
+                trend_color = "blue"
+            
+            trend_message = (
+                f"**Significant {trend_direction} trend detected** "
+                f"(p-value: {p_value:.4f}, tau: {tau:.4f})"
+            )
+        else:
+            trend_direction = "no significant"
+            trend_color = "gray"
+            trend_message = (
+                f"**No significant trend detected** "
+                f"(p-value: {p_value:.4f}, tau: {tau:.4f})"
+            )
+        
+        # Display the trend result
+        st.markdown(f"### Trend Analysis for {parameter} - {selected_sensor}")
+        
+        st.markdown(trend_message)
+        
+        # Create the trend plot
+        fig = go.Figure()
+        
+        # Add the daily data (WebGL, so long histories don't become one SVG node per day)
+        fig.add_trace(go.Scattergl(
+            x=daily_data['timestamp'],
+            y=daily_data[col_name],
+            mode='markers',
+            name=f"Daily {parameter}",
+            marker=dict(color='black', size=5)
+        ))
+        
+        # Add a linear regression line (closed-form least squares); a straight
+        # line only needs its two end points
+        xc = x - x.mean()
+        slope = (xc * (y - y.mean())).sum() / (xc * xc).sum()
+        intercept = y.mean() - slope * x.mean()
+        x_ends = x[[0, -1]]
+        
+        fig.add_trace(go.Scatter(
+            x=daily_data['timestamp'].iloc[[0, -1]],
+            y=intercept + slope * x_ends,
+            mode='lines',
+            name=f"Trend Line (slope: {slope:.4f})",
+            line=dict(color=trend_color, width=2)
+        ))
+        
+        # Update the layout
+        fig.update_layout(
+            title=f"Trend Analysis for {parameter} - {selected_sensor}",
+            xaxis_title="Date",
+            yaxis_title=f"{parameter} {f'({unit})' if unit else ''}",
+            legend_title="Parameter",
+            hovermode="x unified"
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Add explanation
+        st.markdown(
+            f"This chart shows the daily average {parameter.lower()} values and the overall trend. "
+            f"The trend line shows the general direction of change over time."
+        )
+        
+        # Add seasonal decomposition
+        st.subheader("Seasonal Decomposition")
+        
+        st.markdown(
+            "Seasonal decomposition breaks down a time series into trend, seasonal, and residual components. "
+            "This can help identify underlying patterns in the data."
+        )
+        
+        # Check if we have enough data for seasonal decomposition
+        if len(daily_data) >= 14:  # Need at least 2 weeks of data
+            try:
+                # Create a button to perform seasonal decomposition
+                if st.button("Perform Seasonal Decomposition"):
+                    # Perform seasonal decomposition
+                    # Period is set to 7 for weekly seasonality
+                    observed, trend, seasonal, resid = _decompose(
+                        daily_data[col_name].to_numpy(dtype=np.float64).tobytes(), 7
+                    )
+                    dates = daily_data['timestamp']
+                    
+                    # Create a figure with subplots
+                    fig = go.Figure()
+                    
+                    # Add the observed data
+                    fig.add_trace(go.Scatter(
+                        x=dates,
+                        y=observed,
+                        mode='lines',
+                        name='Observed'
+                    ))
+                    
+                    # Add the trend component
+                    fig.add_trace(go.Scatter(
+                        x=dates,
+                        y=trend,
+                        mode='lines',
+                        name='Trend',
+                        line=dict(color='red')
+                    ))
+                    
+                    # Add the seasonal component
+                    fig.add_trace(go.Scatter(
+                        x=dates,
+                        y=seasonal,
+                        mode='lines',
+                        name='Seasonal',
+                        line=dict(color='green')
+                    ))
+                    
+                    # Add the residual component
+                    fig.add_trace(go.Scatter(
+                        x=dates,
+                        y=resid,
+                        mode='lines',
+                        name='Residual',
+                        line=dict(color='purple')
+                    ))
+                    
+                    # Update the layout
+                    fig.update_layout(
+                        title=f"Seasonal Decomposition for {parameter} - {selected_sensor}",
+                        xaxis_title="Date",
+                        yaxis_title="Component Value",
+                        legend_title="Component",
+                        hovermode="x unified"
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                    
+                    st.markdown(
+                        "**Components:**\n"
+                        "- **Observed**: The original data\n"
+                        "- **Trend**: The overall direction of the data\n"
+                        "- **Seasonal**: Repeating patterns in the data\n"
+                        "- **Residual**: The remaining variation after removing trend and seasonal components"
+                    )
+                else:
+                    st.info("Click the button to perform seasonal decomposition.")
+            except Exception as e:
+                st.error(f"Error performing seasonal decomposition: {str(e)}")
+        else:
+            st.warning(
+                "Not enough data for seasonal decomposition. "
+                "At least 14 days of data are required."
+            )
+
+def show_trend_analysis_dashboard(data):
+    """
+    แสดงแดชบอร์ดการวิเคราะห์แนวโน้มสำหรับเซ็นเซอร์ทั้งหมด
+    
+    พารามิเตอร์:
+    - data: พจนานุกรมที่มีข้อมูลเซ็นเซอร์ทั้งหมด
+    """
+    st.header("แดชบอร์ดการวิเคราะห์แนวโน้ม")
+    st.markdown("แดชบอร์ดนี้ให้เครื่องมือสำหรับวิเคราะห์แนวโน้มของพารามิเตอร์คุณภาพดินตลอดเวลา")
+    
+    # Get the data
+    combined_data = _downcast_readings(data['combined_data'])
+    sensor_info = data['sensor_info']
+    daily_summary = data['daily_summary']
+    
+    # Sensor ID -> location name, the number of sensors in the combined data,
+    # and the sensor selector labels (with their sensor IDs) shared by all tabs
+    name_map = _sensor_id_to_name(sensor_info)
+    num_sensors = sum(col.endswith('_ph') for col in combined_data.columns)
+    sensor_options, label_to_id = _build_sensor_options(sensor_info, num_sensors)
+    
+    # สร้างแท็บสำหรับการวิเคราะห์แนวโน้มต่างๆ
+    tabs = st.tabs([
+        "การวิเคราะห์อนุกรมเวลา", 
+        "รูปแบบตามฤดูกาล", 
+        "การวิเคราะห์ความสัมพันธ์",
+        "การตรวจจับแนวโน้ม"
+    ])
+    # แท็บการวิเคราะห์การเปลี่ยนแปลงของข้อมูลในอนาคต
+    # แท็บการวิเคราะห์อนุกรมเวลา
+    with tabs[0]:
+        _show_time_series_tab(combined_data, name_map, sensor_options, label_to_id)
+    
+    # แท็บรูปแบบตามฤดูกาล
+    with tabs[1]:
+        _show_seasonal_tab(combined_data, sensor_options, label_to_id)
+    
+    # แท็บการวิเคราะห์ความสัมพันธ์
+    with tabs[2]:
+        _show_correlation_tab(combined_data, name_map, num_sensors, sensor_options, label_to_id)
+    
+    # แท็บการตรวจจับแนวโน้ม
+    with tabs[3]:
+        _show_trend_detection_tab(combined_data, sensor_options, label_to_id)
@@ -1,10 +1,106 @@
 import numpy as np
 import pandas as pd
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import random
+from datetime import date
 
-def generate_ph_data(days=730, frequency_minutes=720, num_sensors=20, seed=42):
+# Numba is optional: the sequential pH fix loop is JIT-compiled when it is installed
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# PyArrow is optional: its multithreaded CSV writer is used for the numeric tables when installed
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+# Generated datasets are cached here as Parquet; set SENSOR_CACHE_BYPASS=1 to always regenerate
+GENERATED_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'sensor_dashboard', 'generated')
+
+def _generated_cache_path(days, frequency_minutes, num_sensors, seed):
+    """
+    Get the cache file of a generated dataset.
+    
+    Parameters:
+    - days: Number of days of data
+    - frequency_minutes: Data recording frequency in minutes
+    - num_sensors: Number of sensors
+    - seed: Random seed
+    
+    Returns:
+    - Path of the Parquet file, or None when caching is bypassed
+    """
+    if os.environ.get('SENSOR_CACHE_BYPASS') == '1':
+        return None
+    
+    # The timestamps end at the time of generation, so the date is part of the
+    # key and a dataset is regenerated at most once a day
+    name = f'{date.today():%Y%m%d}_{days}d_{frequency_minutes}min_{num_sensors}s_{seed}.parquet'
+    return os.path.join(GENERATED_CACHE_DIR, name)
+
+def _apply_ph_fixes(base_values, ph_threshold_low, ph_threshold_high):
+    """
+    Simulate the fixes applied when pH stays outside its thresholds.
+    
+    Parameters:
+    - base_values: pH values before any fix (array or list), in time order
+    - ph_threshold_low: pH below which a reading counts as out of range
+    - ph_threshold_high: pH above which a reading counts as out of range
+    
+    Returns:
+    - Array of pH values with the decaying fix effects applied
+    """
+    n = len(base_values)
+    ph_values = np.empty(n, dtype=np.float64)
+    
+    # Track when a threshold was exceeded to apply fixes
+    days_over_threshold = 0
+    fix_applied = False
+    fix_decay_factor = 0.0
+    
+    for k in range(n):
+        base_value = base_values[k]
+        
+        # Apply fix decay if a fix was previously applied
+        if fix_applied:
+            base_value -= fix_decay_factor
+            fix_decay_factor *= 0.9  # Gradually reduce the effect of the fix
+            
+            # If the fix effect is very small, consider it complete
+            if fix_decay_factor < 0.05:
+                fix_applied = False
+                fix_decay_factor = 0.0
+        
+        # Check if pH is outside threshold and track days
+        if base_value > ph_threshold_high or base_value < ph_threshold_low:
+            days_over_threshold += 1
+            
+            # After 7 days over threshold, apply a fix
+            if days_over_threshold >= 14 and not fix_applied:  # 14 readings = 7 days with 2 readings per day
+                fix_applied = True
+                
+                # Calculate fix magnitude based on how far from threshold
+                if base_value > ph_threshold_high:
+                    fix_decay_factor = (base_value - ph_threshold_high) + 0.5
+                else:
+                    fix_decay_factor = (ph_threshold_low - base_value) + 0.5
+        else:
+            # Reset counter if pH returns to normal range naturally
+            days_over_threshold = 0
+        
+        ph_values[k] = base_value
+    
+    return ph_values
+
+if njit is not None:
+    _apply_ph_fixes_jit = njit(cache=True)(_apply_ph_fixes)
+
+def generate_ph_data(days=730, frequency_minutes=720, num_sensors=20, seed=42, rng=None):
     """
     Generate realistic pH sensor data for multiple sensors.
     
@@ -13,111 +109,437 @@ def generate_ph_data(days=730, frequency_minutes=720, num_sensors=20, seed=42):
     - frequency_minutes: Data recording frequency in minutes (default: 720 minutes = 12 hours, 2 readings per day)
     - num_sensors: Number of pH sensors to simulate (default: 20)
     - seed: Random seed for reproducibility
+    - rng: NumPy Generator to draw from instead of one seeded with seed
     
     Returns:
     - DataFrame with timestamp and pH values for each sensor
     """
-    np.random.seed(seed)
+    if rng is None:
+        rng = np.random.default_rng(seed)
     
     # Create timestamp range
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
     
-    # Generate timestamps at specified frequency
-    timestamps = []
-    current = start_date
-    while current <= end_date:
-        timestamps.append(current)
-        current += timedelta(minutes=frequency_minutes)
+    # Generate timestamps at specified frequency, from start_date up to and including end_date
+    n = int(days * 24 * 60 // frequency_minutes) + 1
+    ts = pd.date_range(start=start_date, periods=n, freq=f'{frequency_minutes}min')
     
-    data = {'timestamp': timestamps}
+    data = {'timestamp': ts}
+    features = _time_features(ts)
     
-    # Generate pH data for each sensor with realistic patterns
-    for i in range(1, num_sensors + 1):
-        # Base pH value (slightly different for each sensor)
-        base_ph = 7.0 + np.random.uniform(-0.5, 0.5)
-        
-        # Different trend factors for each sensor (some increase, some decrease over time)
-        trend_factor = np.random.uniform(-0.0005, 0.0005)
-        
-        # Threshold for when a fix should be applied (different for each sensor)
-        ph_threshold_high = 8.5 + np.random.uniform(-0.3, 0.3)
-        ph_threshold_low = 5.5 + np.random.uniform(-0.3, 0.3)
-        
-        # Generate pH values with patterns, trends, and fixes
-        ph_values = []
-        
-        # Track when a threshold was exceeded to apply fixes
-        days_over_threshold = 0
-        fix_applied = False
-        fix_decay_factor = 0
-        
-        for idx, timestamp in enumerate(timestamps):
-            # Daily pattern (pH might vary slightly throughout the day)
-            hour_effect = 0.2 * np.sin(2 * np.pi * timestamp.hour / 24)
-            
-            # Weekly pattern (e.g., different operations on weekends)
-            day_of_week_effect = 0.1 * np.sin(2 * np.pi * timestamp.weekday() / 7)
-            
-            # Random noise
-            noise = np.random.normal(0, 0.1)
-            
-            # Occasional anomalies (1% chance)
-            anomaly = 0
-            if np.random.random() < 0.01:
-                anomaly = np.random.uniform(-1.0, 1.0)
-            
-            # Long-term trend (different for each sensor)
-            days_passed = (timestamp - start_date).days
-            trend = trend_factor * days_passed
-            
-            # Seasonal effect (annual cycle)
-            day_of_year = timestamp.timetuple().tm_yday
-            seasonal_effect = 0.3 * np.sin(2 * np.pi * day_of_year / 365)
-            
-            # Calculate base pH value before applying fixes
-            base_value = base_ph + hour_effect + day_of_week_effect + noise + anomaly + trend + seasonal_effect
-            
-            # Apply fix decay if a fix was previously applied
-            if fix_applied:
-                base_value -= fix_decay_factor
-                fix_decay_factor *= 0.9  # Gradually reduce the effect of the fix
-                
-                # If the fix effect is very small, consider it complete
-                if fix_decay_factor < 0.05:
-                    fix_applied = False
-                    fix_decay_factor = 0
-            
-            # Check if pH is outside threshold and track days
-            if base_value > ph_threshold_high or base_value < ph_threshold_low:
-                days_over_threshold += 1
-                
-                # After 7 days over threshold, apply a fix
-                if days_over_threshold >= 14 and not fix_applied:  # 14 readings = 7 days with 2 readings per day
-                    fix_applied = True
-                    
-                    # Calculate fix magnitude based on how far from threshold
-                    if base_value > ph_threshold_high:
-                        fix_decay_factor = (base_value - ph_threshold_high) + 0.5
-                    else:
-                        fix_decay_factor = (ph_threshold_low - base_value) + 0.5
-            else:
-                # Reset counter if pH returns to normal range naturally
-                days_over_threshold = 0
-            
-            # Calculate final pH value
-            ph = base_value
-            
-            # Ensure pH stays within realistic bounds (0-14)
-            ph = max(0, min(14, ph))
-            
-            ph_values.append(round(ph, 2))
+    # Daily pattern (pH might vary slightly throughout the day)
+    hour_effect = _calendar_wave(features['hour'], 0.2, 24)
+    
+    # Weekly pattern (e.g., different operations on weekends)
+    day_of_week_effect = _calendar_wave(features['weekday'], 0.1, 7)
+    
+    # Seasonal effect (annual cycle)
+    seasonal_effect = _calendar_wave(features['day_of_year'], 0.3, 365)
+    
+    # Days since the start, for the long-term trend
+    days_passed = features['days_passed']
+    
+    # Per-sensor values are drawn for all sensors at once; the readings form a
+    # (num_sensors, n) matrix with one row per sensor
+    shape = (num_sensors, n)
+    
+    # Base pH value (slightly different for each sensor)
+    base_ph = 7.0 + rng.uniform(-0.5, 0.5, (num_sensors, 1))
+    
+    # Different trend factors for each sensor (some increase, some decrease over time)
+    trend_factor = rng.uniform(-0.0005, 0.0005, (num_sensors, 1))
+    
+    # Threshold for when a fix should be applied (different for each sensor)
+    ph_threshold_high = 8.5 + rng.uniform(-0.3, 0.3, num_sensors)
+    ph_threshold_low = 5.5 + rng.uniform(-0.3, 0.3, num_sensors)
+    
+    # Random noise
+    noise = rng.normal(0, 0.1, shape)
+    
+    # Occasional anomalies (1% chance), drawing magnitudes only where one occurs
+    anomaly = np.zeros(shape)
+    is_anomaly = rng.random(shape) < 0.01
+    anomaly[is_anomaly] = rng.uniform(-1.0, 1.0, np.count_nonzero(is_anomaly))
+    
+    # Long-term trend (different for each sensor)
+    trend = trend_factor * days_passed
+    
+    # Calculate base pH values before applying fixes, accumulating into the
+    # noise matrix so no further (num_sensors, n) temporaries are allocated
+    base_values = noise
+    base_values += base_ph
+    base_values += hour_effect + day_of_week_effect + seasonal_effect
+    base_values += anomaly
+    base_values += trend
+    
+    for i in range(num_sensors):
+        # Fixes depend on the readings before them, so they are applied in one
+        # sequential pass per sensor (compiled when Numba is available)
+        if njit is not None:
+            ph_values = _apply_ph_fixes_jit(base_values[i], ph_threshold_low[i], ph_threshold_high[i])
+        else:
+            ph_values = _apply_ph_fixes(base_values[i].tolist(), ph_threshold_low[i], ph_threshold_high[i])
         
-        data[f'sensor_{i}_ph'] = ph_values
+        # Ensure pH stays within realistic bounds (0-14)
+        np.clip(ph_values, 0, 14, out=ph_values)
+        data[f'sensor_{i + 1}_ph'] = np.round(ph_values, 2, out=ph_values).astype(np.float32)
     
     return pd.DataFrame(data)
 
-def generate_temperature_data(ph_df, correlation=0.3, seed=42):
+def _time_features(timestamps):
+    """
+    Calendar fields of the readings, read once from the timestamps.
+    
+    Parameters:
+    - timestamps: Timestamps of the readings
+    
+    Returns:
+    - Dictionary of field name -> integer array with one value per reading
+    """
+    ts = pd.DatetimeIndex(timestamps)
+    
+    return {
+        'hour': ts.hour.to_numpy(),
+        'weekday': ts.weekday.to_numpy(),
+        'month': ts.month.to_numpy(),
+        'day_of_year': ts.dayofyear.to_numpy(),
+        'days_passed': (ts - ts[0]).days.to_numpy()
+    }
+
+def _calendar_wave(values, amplitude, period, shift=0):
+    """
+    Sine wave over an integer calendar field, such as the day of the year.
+    
+    Parameters:
+    - values: Integer array of the field, one value per reading
+    - amplitude: Amplitude of the wave
+    - period: Period of the wave in units of the field
+    - shift: Value of the field where the wave crosses zero going up
+    
+    Returns:
+    - Array with the wave at each reading
+    """
+    # The field takes few distinct values, so the sine is evaluated once per
+    # value and gathered instead of once per reading
+    levels = np.arange(values.max() + 1)
+    return (amplitude * np.sin(2 * np.pi * (levels - shift) / period))[values]
+
+def _sensor_effects(features):
+    """
+    Calendar effects shared by all sensors, computed once per dataset.
+    
+    Parameters:
+    - features: Calendar fields of the readings, from _time_features
+    
+    Returns:
+    - Dictionary of effect name -> array with one value per reading
+    """
+    hours = features['hour']
+    months = features['month']
+    day_of_year = features['day_of_year']
+    
+    effects = {
+        # Daily temperature pattern (higher during day, lower at night)
+        'temp_hour': _calendar_wave(hours, 2.0, 24, 12),
+        # Seasonal temperature effect (if data spans multiple months)
+        'temp_month': _calendar_wave(months, 5.0, 12, 6),
+        # Humidity might be higher at night and early morning
+        'humidity_hour': _calendar_wave(hours, -5.0, 24, 6),
+        # Photosynthesis during daylight hours increases DO
+        'do_hour': _calendar_wave(hours, 0.5, 24, 14),
+        # Seasonal nutrient cycles
+        'nitrogen_season': _calendar_wave(day_of_year, 10.0, 365, 120),
+        'phosphorus_season': _calendar_wave(day_of_year, 3.0, 365, 90),
+        'potassium_season': _calendar_wave(day_of_year, 15.0, 365, 150)
+    }
+    
+    # Stored as float32 so the sensor arithmetic stays in single precision
+    return {name: effect.astype(np.float32) for name, effect in effects.items()}
+
+def _sensor_matrix(df, param, num_sensors):
+    """
+    Readings of one parameter for all sensors as a float32 matrix with one row
+    per sensor.
+    """
+    cols = [f'sensor_{i}_{param}' for i in range(1, num_sensors + 1)]
+    return np.ascontiguousarray(df[cols].to_numpy(dtype=np.float32).T)
+
+def _sensor_offsets(rng, num_sensors, center, spread):
+    """
+    Per-sensor base level drawn uniformly around center, as a float32 column
+    that broadcasts over the readings.
+    """
+    return (center + rng.uniform(-spread, spread, (num_sensors, 1))).astype(np.float32)
+
+def _sensor_noise(rng, scale, shape):
+    """
+    Gaussian noise with standard deviation scale, drawn directly in float32.
+    """
+    noise = rng.standard_normal(shape, dtype=np.float32)
+    noise *= scale
+    return noise
+
+def _temperature_values(rng, ph, effects, correlation):
+    """
+    Temperature readings of all sensors, one row per sensor.
+    """
+    # Base temperature (different for each sensor)
+    base_temp = _sensor_offsets(rng, len(ph), 25.0, 3)
+    
+    # Correlation with pH (higher pH might correlate with higher temperature)
+    ph_effect = correlation * (ph - 7.0) * 3
+    
+    # Random noise
+    noise = _sensor_noise(rng, 0.5, ph.shape)
+    
+    # Calculate temperature, summing into the noise matrix in place
+    temp = noise
+    temp += base_temp
+    temp += effects['temp_hour']
+    temp += effects['temp_month']
+    temp += ph_effect
+    
+    return np.round(temp, 1, out=temp)
+
+def _conductivity_values(rng, ph, temp):
+    """
+    Conductivity readings of all sensors, one row per sensor.
+    """
+    # Base conductivity (different for each sensor, in μS/cm)
+    base_cond = _sensor_offsets(rng, len(ph), 500.0, 100)
+    
+    # pH effect (conductivity often increases as pH deviates from neutral)
+    ph_effect = 50.0 * np.abs(ph - 7.0)
+    
+    # Temperature effect (conductivity increases with temperature)
+    temp_effect = 10.0 * (temp - 25.0)
+    
+    # Random noise
+    noise = _sensor_noise(rng, 20.0, ph.shape)
+    
+    # Calculate conductivity, summing into the noise matrix in place
+    cond = noise
+    cond += base_cond
+    cond += ph_effect
+    cond += temp_effect
+    
+    # Ensure conductivity is positive
+    np.maximum(cond, 10, out=cond)
+    return np.round(cond, 1, out=cond)
+
+def _dissolved_oxygen_values(rng, ph, temp, effects):
+    """
+    Dissolved oxygen readings of all sensors, one row per sensor.
+    """
+    # Base DO (mg/L) - temperature dependent (DO decreases as temperature increases)
+    # Approximate relationship based on water at atmospheric pressure
+    base_do = 14.6 * 0.65 ** (0.04 * (temp - 20))
+    
+    # pH effect (slight effect)
+    ph_effect = 0.2 * (ph - 7.0)
+    
+    # Random noise
+    noise = _sensor_noise(rng, 0.3, ph.shape)
+    
+    # Calculate DO, summing into the noise matrix in place
+    do = noise
+    do += base_do
+    do += ph_effect
+    do += effects['do_hour']
+    
+    # Ensure DO is positive and within realistic bounds
+    np.clip(do, 0.1, 20, out=do)
+    return np.round(do, 2, out=do)
+
+def _turbidity_values(rng, ph):
+    """
+    Turbidity readings of all sensors, one row per sensor.
+    """
+    shape = ph.shape
+    
+    # Base turbidity (NTU)
+    base_turb = _sensor_offsets(rng, len(ph), 5.0, 2)
+    
+    # pH effect (higher pH might correlate with lower turbidity in some cases)
+    ph_effect = -0.5 * (ph - 7.0)
+    
+    # Random events (e.g., rain, disturbance) causing spikes in turbidity (5% chance),
+    # drawing spike sizes only where an event occurs
+    event = np.zeros(shape, dtype=np.float32)
+    is_event = rng.random(shape) < 0.05
+    event[is_event] = rng.exponential(10, np.count_nonzero(is_event))
+    
+    # Random noise
+    noise = _sensor_noise(rng, 1.0, shape)
+    
+    # Calculate turbidity, summing into the noise matrix in place
+    turb = noise
+    turb += base_turb
+    turb += ph_effect
+    turb += event
+    
+    # Ensure turbidity is positive
+    np.maximum(turb, 0.1, out=turb)
+    return np.round(turb, 2, out=turb)
+
+def _humidity_values(rng, ph, temp, effects):
+    """
+    Soil humidity readings of all sensors, one row per sensor.
+    """
+    # Base humidity (different for each sensor, in %)
+    base_humidity = _sensor_offsets(rng, len(ph), 50.0, 10)
+    
+    # Temperature effect (humidity decreases as temperature increases)
+    temp_effect = -0.5 * (temp - 25.0)
+    
+    # pH effect (slight effect)
+    ph_effect = -2.0 * (ph - 7.0)
+    
+    # Random noise
+    noise = _sensor_noise(rng, 3.0, ph.shape)
+    
+    # Calculate humidity, summing into the noise matrix in place
+    humidity = noise
+    humidity += base_humidity
+    humidity += effects['humidity_hour']
+    humidity += temp_effect
+    humidity += ph_effect
+    
+    # Ensure humidity is within realistic bounds (0-100%)
+    np.clip(humidity, 0, 100, out=humidity)
+    return np.round(humidity, 1, out=humidity)
+
+def _nitrogen_values(rng, ph, humidity, effects):
+    """
+    Soil nitrogen readings of all sensors, one row per sensor.
+    """
+    # Base nitrogen level (different for each sensor, in mg/kg)
+    base_nitrogen = _sensor_offsets(rng, len(ph), 40.0, 10)
+    
+    # pH effect (nitrogen availability is affected by pH)
+    # Optimal pH for nitrogen availability is around 6.0-7.0
+    ph_effect = -5.0 * np.abs(ph - 6.5)
+    
+    # Humidity effect (higher humidity can increase nitrogen availability)
+    humidity_effect = 0.2 * (humidity - 50)
+    
+    # Random noise
+    noise = _sensor_noise(rng, 3.0, ph.shape)
+    
+    # Calculate nitrogen, summing into the noise matrix in place
+    nitrogen = noise
+    nitrogen += base_nitrogen
+    nitrogen += ph_effect
+    nitrogen += humidity_effect
+    nitrogen += effects['nitrogen_season']
+    
+    # Ensure nitrogen is positive
+    np.maximum(nitrogen, 0, out=nitrogen)
+    return np.round(nitrogen, 1, out=nitrogen)
+
+def _phosphorus_ph_effect(ph_values):
+    """
+    Piecewise effect of pH on phosphorus availability, for the compiled path.
+    
+    Parameters:
+    - ph_values: 1-D array of pH readings
+    
+    Returns:
+    - Array with the phosphorus pH effect of each reading
+    """
+    effect = np.empty_like(ph_values)
+    
+    # One branch per reading instead of evaluating all three pieces everywhere
+    for k in range(len(ph_values)):
+        ph = ph_values[k]
+        if ph < 5.5:
+            effect[k] = -5.0 * (5.5 - ph)
+        elif ph > 7.5:
+            effect[k] = -3.0 * (ph - 7.5)
+        else:
+            effect[k] = 2.0 * (1 - abs(ph - 6.5) / 1.0)
+    
+    return effect
+
+if njit is not None:
+    # nogil, since the fused generator runs this on a worker thread
+    _phosphorus_ph_effect_jit = njit(cache=True, nogil=True)(_phosphorus_ph_effect)
+
+def _phosphorus_values(rng, ph, humidity, effects):
+    """
+    Soil phosphorus readings of all sensors, one row per sensor.
+    """
+    # Base phosphorus level (different for each sensor, in mg/kg)
+    base_phosphorus = _sensor_offsets(rng, len(ph), 15.0, 5)
+    
+    # pH effect (phosphorus availability is highly affected by pH)
+    # Optimal pH for phosphorus availability is around 6.0-7.0
+    # Phosphorus becomes less available at high pH (> 7.5) and low pH (< 5.5)
+    if njit is not None:
+        ph_effect = _phosphorus_ph_effect_jit(ph.ravel()).reshape(ph.shape)
+    else:
+        ph_effect = np.select(
+            [ph < 5.5, ph > 7.5],
+            [-5.0 * (5.5 - ph), -3.0 * (ph - 7.5)],
+            2.0 * (1 - np.abs(ph - 6.5) / 1.0)
+        )
+    
+    # Humidity effect (moderate effect)
+    humidity_effect = 0.1 * (humidity - 50)
+    
+    # Random noise
+    noise = _sensor_noise(rng, 1.5, ph.shape)
+    
+    # Calculate phosphorus, summing into the noise matrix in place
+    phosphorus = noise
+    phosphorus += base_phosphorus
+    phosphorus += ph_effect
+    phosphorus += humidity_effect
+    phosphorus += effects['phosphorus_season']
+    
+    # Ensure phosphorus is positive
+    np.maximum(phosphorus, 0, out=phosphorus)
+    return np.round(phosphorus, 1, out=phosphorus)
+
+def _potassium_values(rng, ph, humidity, effects):
+    """
+    Soil potassium readings of all sensors, one row per sensor.
+    """
+    # Base potassium level (different for each sensor, in mg/kg)
+    base_potassium = _sensor_offsets(rng, len(ph), 150.0, 30)
+    
+    # pH effect (potassium availability is moderately affected by pH)
+    # Potassium is generally available across a wide pH range
+    ph_effect = -10.0 * np.abs(ph - 6.5) / 6.5
+    
+    # Humidity effect (higher humidity can increase potassium availability)
+    humidity_effect = 0.3 * (humidity - 50)
+    
+    # Random noise
+    noise = _sensor_noise(rng, 10.0, ph.shape)
+    
+    # Calculate potassium, summing into the noise matrix in place
+    potassium = noise
+    potassium += base_potassium
+    potassium += ph_effect
+    potassium += humidity_effect
+    potassium += effects['potassium_season']
+    
+    # Ensure potassium is positive
+    np.maximum(potassium, 0, out=potassium)
+    return np.round(potassium, 1, out=potassium)
+
+def _sensor_columns(values, param, index):
+    """
+    DataFrame with one 'sensor_<id>_<param>' column per row of values.
+    """
+    return pd.DataFrame(
+        {f'sensor_{i + 1}_{param}': row for i, row in enumerate(values)},
+        index=index
+    )
+
+def generate_temperature_data(ph_df, correlation=0.3, seed=42, rng=None, num_sensors=None):
     """
     Generate temperature data with some correlation to pH values.
     
@@ -125,52 +547,27 @@ def generate_temperature_data(ph_df, correlation=0.3, seed=42):
     - ph_df: DataFrame containing pH data
     - correlation: Correlation coefficient between pH and temperature
     - seed: Random seed for reproducibility
+    - rng: NumPy Generator to draw from instead of one seeded with seed
+    - num_sensors: Number of sensors, counted from the pH columns when not given
     
     Returns:
     - DataFrame with temperature data for each sensor
     """
-    np.random.seed(seed)
+    if rng is None:
+        rng = np.random.default_rng(seed)
     
-    temp_df = ph_df.copy()
+    # Get the number of sensors from the pH dataframe unless the caller knows it
+    if num_sensors is None:
+        num_sensors = sum(1 for col in ph_df.columns if col.endswith('_ph'))
+    effects = _sensor_effects(_time_features(ph_df['timestamp']))
     
-    # Get the number of sensors from the pH dataframe
-    num_sensors = sum(1 for col in ph_df.columns if col.endswith('_ph'))
-    
-    for i in range(1, num_sensors + 1):
-        ph_col = f'sensor_{i}_ph'
-        
-        # Base temperature (different for each sensor)
-        base_temp = 25.0 + np.random.uniform(-3, 3)
-        
-        # Generate temperature with daily patterns and correlation to pH
-        temp_values = []
-        
-        for idx, row in ph_df.iterrows():
-            timestamp = row['timestamp']
-            ph = row[ph_col]
-            
-            # Daily temperature pattern (higher during day, lower at night)
-            hour_effect = 2.0 * np.sin(2 * np.pi * (timestamp.hour - 12) / 24)
-            
-            # Seasonal effect (if data spans multiple months)
-            month_effect = 5.0 * np.sin(2 * np.pi * (timestamp.month - 6) / 12)
-            
-            # Correlation with pH (higher pH might correlate with higher temperature)
-            ph_effect = correlation * (ph - 7.0) * 3
-            
-            # Random noise
-            noise = np.random.normal(0, 0.5)
-            
-            # Calculate temperature
-            temp = base_temp + hour_effect + month_effect + ph_effect + noise
-            
-            temp_values.append(round(temp, 1))
-        
-        temp_df[f'sensor_{i}_temp'] = temp_values
+    ph = _sensor_matrix(ph_df, 'ph', num_sensors)
+    values = _temperature_values(rng, ph, effects, correlation)
     
-    return temp_df
+    # Add the new columns in one concat rather than one insert per sensor
+    return pd.concat([ph_df, _sensor_columns(values, 'temp', ph_df.index)], axis=1)
 
-def generate_conductivity_data(ph_df, temp_df, seed=42):
+def generate_conductivity_data(ph_df, temp_df, seed=42, rng=None, num_sensors=None):
     """
     Generate conductivity data with correlation to pH and temperature.
     
@@ -178,53 +575,27 @@ def generate_conductivity_data(ph_df, temp_df, seed=42):
     - ph_df: DataFrame containing pH data
     - temp_df: DataFrame containing temperature data
     - seed: Random seed for reproducibility
+    - rng: NumPy Generator to draw from instead of one seeded with seed
+    - num_sensors: Number of sensors, counted from the pH columns when not given
     
     Returns:
     - DataFrame with conductivity data for each sensor
     """
-    np.random.seed(seed)
-    
-    cond_df = ph_df.copy()
+    if rng is None:
+        rng = np.random.default_rng(seed)
     
-    # Get the number of sensors from the pH dataframe
-    num_sensors = sum(1 for col in ph_df.columns if col.endswith('_ph'))
+    # Get the number of sensors from the pH dataframe unless the caller knows it
+    if num_sensors is None:
+        num_sensors = sum(1 for col in ph_df.columns if col.endswith('_ph'))
     
-    for i in range(1, num_sensors + 1):
-        ph_col = f'sensor_{i}_ph'
-        temp_col = f'sensor_{i}_temp'
-        
-        # Base conductivity (different for each sensor, in μS/cm)
-        base_cond = 500.0 + np.random.uniform(-100, 100)
-        
-        # Generate conductivity with correlation to pH and temperature
-        cond_values = []
-        
-        for idx, row in ph_df.iterrows():
-            ph = row[ph_col]
-            temp = temp_df.loc[idx, temp_col]
-            
-            # pH effect (conductivity often increases as pH deviates from neutral)
-            ph_effect = 50.0 * abs(ph - 7.0)
-            
-            # Temperature effect (conductivity increases with temperature)
-            temp_effect = 10.0 * (temp - 25.0)
-            
-            # Random noise
-            noise = np.random.normal(0, 20.0)
-            
-            # Calculate conductivity
-            cond = base_cond + ph_effect + temp_effect + noise
-            
-            # Ensure conductivity is positive
-            cond = max(10, cond)
-            
-            cond_values.append(round(cond, 1))
-        
-        cond_df[f'sensor_{i}_conductivity'] = cond_values
+    ph = _sensor_matrix(ph_df, 'ph', num_sensors)
+    temp = _sensor_matrix(temp_df, 'temp', num_sensors)
+    values = _conductivity_values(rng, ph, temp)
     
-    return cond_df
+    # Add the new columns in one concat rather than one insert per sensor
+    return pd.concat([ph_df, _sensor_columns(values, 'conductivity', ph_df.index)], axis=1)
 
-def generate_dissolved_oxygen_data(ph_df, temp_df, seed=42):
+def generate_dissolved_oxygen_data(ph_df, temp_df, seed=42, rng=None, num_sensors=None):
     """
     Generate dissolved oxygen (DO) data with correlation to pH and temperature.
     
@@ -232,109 +603,54 @@ def generate_dissolved_oxygen_data(ph_df, temp_df, seed=42):
     - ph_df: DataFrame containing pH data
     - temp_df: DataFrame containing temperature data
     - seed: Random seed for reproducibility
+    - rng: NumPy Generator to draw from instead of one seeded with seed
+    - num_sensors: Number of sensors, counted from the pH columns when not given
     
     Returns:
     - DataFrame with DO data for each sensor
     """
-    np.random.seed(seed)
+    if rng is None:
+        rng = np.random.default_rng(seed)
     
-    do_df = ph_df.copy()
+    # Get the number of sensors from the pH dataframe unless the caller knows it
+    if num_sensors is None:
+        num_sensors = sum(1 for col in ph_df.columns if col.endswith('_ph'))
+    effects = _sensor_effects(_time_features(ph_df['timestamp']))
     
-    # Get the number of sensors from the pH dataframe
-    num_sensors = sum(1 for col in ph_df.columns if col.endswith('_ph'))
+    ph = _sensor_matrix(ph_df, 'ph', num_sensors)
+    temp = _sensor_matrix(temp_df, 'temp', num_sensors)
+    values = _dissolved_oxygen_values(rng, ph, temp, effects)
     
-    for i in range(1, num_sensors + 1):
-        ph_col = f'sensor_{i}_ph'
-        temp_col = f'sensor_{i}_temp'
-        
-        # Generate DO with correlation to pH and temperature
-        do_values = []
-        
-        for idx, row in ph_df.iterrows():
-            timestamp = row['timestamp']
-            ph = row[ph_col]
-            temp = temp_df.loc[idx, temp_col]
-            
-            # Base DO (mg/L) - temperature dependent (DO decreases as temperature increases)
-            # Approximate relationship based on water at atmospheric pressure
-            base_do = 14.6 * 0.65 ** (0.04 * (temp - 20))
-            
-            # pH effect (slight effect)
-            ph_effect = 0.2 * (ph - 7.0)
-            
-            # Daily pattern (photosynthesis during daylight hours increases DO)
-            hour_effect = 0.5 * np.sin(2 * np.pi * (timestamp.hour - 14) / 24)
-            
-            # Random noise
-            noise = np.random.normal(0, 0.3)
-            
-            # Calculate DO
-            do = base_do + ph_effect + hour_effect + noise
-            
-            # Ensure DO is positive and within realistic bounds
-            do = max(0.1, min(20, do))
-            
-            do_values.append(round(do, 2))
-        
-        do_df[f'sensor_{i}_dissolved_oxygen'] = do_values
-    
-    return do_df
+    # Add the new columns in one concat rather than one insert per sensor
+    return pd.concat([ph_df, _sensor_columns(values, 'dissolved_oxygen', ph_df.index)], axis=1)
 
-def generate_turbidity_data(ph_df, seed=42):
+def generate_turbidity_data(ph_df, seed=42, rng=None, num_sensors=None):
     """
     Generate turbidity data with some correlation to pH.
     
     Parameters:
     - ph_df: DataFrame containing pH data
     - seed: Random seed for reproducibility
+    - rng: NumPy Generator to draw from instead of one seeded with seed
+    - num_sensors: Number of sensors, counted from the pH columns when not given
     
     Returns:
     - DataFrame with turbidity data for each sensor
     """
-    np.random.seed(seed)
-    
-    turb_df = ph_df.copy()
+    if rng is None:
+        rng = np.random.default_rng(seed)
     
-    # Get the number of sensors from the pH dataframe
-    num_sensors = sum(1 for col in ph_df.columns if col.endswith('_ph'))
+    # Get the number of sensors from the pH dataframe unless the caller knows it
+    if num_sensors is None:
+        num_sensors = sum(1 for col in ph_df.columns if col.endswith('_ph'))
     
-    for i in range(1, num_sensors + 1):
-        ph_col = f'sensor_{i}_ph'
-        
-        # Base turbidity (NTU)
-        base_turb = 5.0 + np.random.uniform(-2, 2)
-        
-        # Generate turbidity with some correlation to pH
-        turb_values = []
-        
-        for idx, row in ph_df.iterrows():
-            timestamp = row['timestamp']
-            ph = row[ph_col]
-            
-            # pH effect (higher pH might correlate with lower turbidity in some cases)
-            ph_effect = -0.5 * (ph - 7.0)
-            
-            # Random events (e.g., rain, disturbance) causing spikes in turbidity
-            event = 0
-            if np.random.random() < 0.05:  # 5% chance of an event
-                event = np.random.exponential(10)
-            
-            # Random noise
-            noise = np.random.normal(0, 1.0)
-            
-            # Calculate turbidity
-            turb = base_turb + ph_effect + event + noise
-            
-            # Ensure turbidity is positive
-            turb = max(0.1, turb)
-            
-            turb_values.append(round(turb, 2))
-        
-        turb_df[f'sensor_{i}_turbidity'] = turb_values
+    ph = _sensor_matrix(ph_df, 'ph', num_sensors)
+    values = _turbidity_values(rng, ph)
     
-    return turb_df
+    # Add the new columns in one concat rather than one insert per sensor
+    return pd.concat([ph_df, _sensor_columns(values, 'turbidity', ph_df.index)], axis=1)
 
-def generate_humidity_data(ph_df, temp_df, seed=42):
+def generate_humidity_data(ph_df, temp_df, seed=42, rng=None, num_sensors=None):
     """
     Generate soil humidity data with correlation to pH and temperature.
     
@@ -342,57 +658,28 @@ def generate_humidity_data(ph_df, temp_df, seed=42):
     - ph_df: DataFrame containing pH data
     - temp_df: DataFrame containing temperature data
     - seed: Random seed for reproducibility
+    - rng: NumPy Generator to draw from instead of one seeded with seed
+    - num_sensors: Number of sensors, counted from the pH columns when not given
     
     Returns:
     - DataFrame with humidity data for each sensor
     """
-    np.random.seed(seed)
+    if rng is None:
+        rng = np.random.default_rng(seed)
     
-    humidity_df = ph_df.copy()
+    # Get the number of sensors from the pH dataframe unless the caller knows it
+    if num_sensors is None:
+        num_sensors = sum(1 for col in ph_df.columns if col.endswith('_ph'))
+    effects = _sensor_effects(_time_features(ph_df['timestamp']))
     
-    # Get the number of sensors from the pH dataframe
-    num_sensors = sum(1 for col in ph_df.columns if col.endswith('_ph'))
+    ph = _sensor_matrix(ph_df, 'ph', num_sensors)
+    temp = _sensor_matrix(temp_df, 'temp', num_sensors)
+    values = _humidity_values(rng, ph, temp, effects)
     
-    for i in range(1, num_sensors + 1):
-        ph_col = f'sensor_{i}_ph'
-        temp_col = f'sensor_{i}_temp'
-        
-        # Base humidity (different for each sensor, in %)
-        base_humidity = 50.0 + np.random.uniform(-10, 10)
-        
-        # Generate humidity with correlation to pH and temperature
-        humidity_values = []
-        
-        for idx, row in ph_df.iterrows():
-            timestamp = row['timestamp']
-            ph = row[ph_col]
-            temp = temp_df.loc[idx, temp_col]
-            
-            # Daily pattern (humidity might be higher at night and early morning)
-            hour_effect = -5.0 * np.sin(2 * np.pi * (timestamp.hour - 6) / 24)
-            
-            # Temperature effect (humidity decreases as temperature increases)
-            temp_effect = -0.5 * (temp - 25.0)
-            
-            # pH effect (slight effect)
-            ph_effect = -2.0 * (ph - 7.0)
-            
-            # Random noise
-            noise = np.random.normal(0, 3.0)
-            
-            # Calculate humidity
-            humidity = base_humidity + hour_effect + temp_effect + ph_effect + noise
-            
-            # Ensure humidity is within realistic bounds (0-100%)
-            humidity = max(0, min(100, humidity))
-            
-            humidity_values.append(round(humidity, 1))
-        
-        humidity_df[f'sensor_{i}_humidity'] = humidity_values
-    
-    return humidity_df
+    # Add the new columns in one concat rather than one insert per sensor
+    return pd.concat([ph_df, _sensor_columns(values, 'humidity', ph_df.index)], axis=1)
 
-def generate_nitrogen_data(ph_df, humidity_df, seed=42):
+def generate_nitrogen_data(ph_df, humidity_df, seed=42, rng=None, num_sensors=None):
     """
     Generate soil nitrogen (N) data with correlation to pH and humidity.
     
@@ -400,59 +687,28 @@ def generate_nitrogen_data(ph_df, humidity_df, seed=42):
     - ph_df: DataFrame containing pH data
     - humidity_df: DataFrame containing humidity data
     - seed: Random seed for reproducibility
+    - rng: NumPy Generator to draw from instead of one seeded with seed
+    - num_sensors: Number of sensors, counted from the pH columns when not given
     
     Returns:
     - DataFrame with nitrogen data for each sensor
     """
-    np.random.seed(seed)
+    if rng is None:
+        rng = np.random.default_rng(seed)
     
-    nitrogen_df = ph_df.copy()
+    # Get the number of sensors from the pH dataframe unless the caller knows it
+    if num_sensors is None:
+        num_sensors = sum(1 for col in ph_df.columns if col.endswith('_ph'))
+    effects = _sensor_effects(_time_features(ph_df['timestamp']))
     
-    # Get the number of sensors from the pH dataframe
-    num_sensors = sum(1 for col in ph_df.columns if col.endswith('_ph'))
+    ph = _sensor_matrix(ph_df, 'ph', num_sensors)
+    humidity = _sensor_matrix(humidity_df, 'humidity', num_sensors)
+    values = _nitrogen_values(rng, ph, humidity, effects)
     
-    for i in range(1, num_sensors + 1):
-        ph_col = f'sensor_{i}_ph'
-        humidity_col = f'sensor_{i}_humidity'
-        
-        # Base nitrogen level (different for each sensor, in mg/kg)
-        base_nitrogen = 40.0 + np.random.uniform(-10, 10)
-        
-        # Generate nitrogen with correlation to pH and humidity
-        nitrogen_values = []
-        
-        for idx, row in ph_df.iterrows():
-            timestamp = row['timestamp']
-            ph = row[ph_col]
-            humidity = humidity_df.loc[idx, humidity_col]
-            
-            # pH effect (nitrogen availability is affected by pH)
-            # Optimal pH for nitrogen availability is around 6.0-7.0
-            ph_effect = -5.0 * abs(ph - 6.5)
-            
-            # Humidity effect (higher humidity can increase nitrogen availability)
-            humidity_effect = 0.2 * (humidity - 50)
-            
-            # Seasonal effect
-            day_of_year = timestamp.timetuple().tm_yday
-            seasonal_effect = 10.0 * np.sin(2 * np.pi * (day_of_year - 120) / 365)
-            
-            # Random noise
-            noise = np.random.normal(0, 3.0)
-            
-            # Calculate nitrogen
-            nitrogen = base_nitrogen + ph_effect + humidity_effect + seasonal_effect + noise
-            
-            # Ensure nitrogen is positive
-            nitrogen = max(0, nitrogen)
-            
-            nitrogen_values.append(round(nitrogen, 1))
-        
-        nitrogen_df[f'sensor_{i}_nitrogen'] = nitrogen_values
-    
-    return nitrogen_df
+    # Add the new columns in one concat rather than one insert per sensor
+    return pd.concat([ph_df, _sensor_columns(values, 'nitrogen', ph_df.index)], axis=1)
 
-def generate_phosphorus_data(ph_df, humidity_df, seed=42):
+def generate_phosphorus_data(ph_df, humidity_df, seed=42, rng=None, num_sensors=None):
     """
     Generate soil phosphorus (P) data with correlation to pH and humidity.
     
@@ -460,65 +716,28 @@ def generate_phosphorus_data(ph_df, humidity_df, seed=42):
     - ph_df: DataFrame containing pH data
     - humidity_df: DataFrame containing humidity data
     - seed: Random seed for reproducibility
+    - rng: NumPy Generator to draw from instead of one seeded with seed
+    - num_sensors: Number of sensors, counted from the pH columns when not given
     
     Returns:
     - DataFrame with phosphorus data for each sensor
     """
-    np.random.seed(seed)
+    if rng is None:
+        rng = np.random.default_rng(seed)
     
-    phosphorus_df = ph_df.copy()
+    # Get the number of sensors from the pH dataframe unless the caller knows it
+    if num_sensors is None:
+        num_sensors = sum(1 for col in ph_df.columns if col.endswith('_ph'))
+    effects = _sensor_effects(_time_features(ph_df['timestamp']))
     
-    # Get the number of sensors from the pH dataframe
-    num_sensors = sum(1 for col in ph_df.columns if col.endswith('_ph'))
-    
-    for i in range(1, num_sensors + 1):
-        ph_col = f'sensor_{i}_ph'
-        humidity_col = f'sensor_{i}_humidity'
-        
-        # Base phosphorus level (different for each sensor, in mg/kg)
-        base_phosphorus = 15.0 + np.random.uniform(-5, 5)
-        
-        # Generate phosphorus with correlation to pH and humidity
-        phosphorus_values = []
-        
-        for idx, row in ph_df.iterrows():
-            timestamp = row['timestamp']
-            ph = row[ph_col]
-            humidity = humidity_df.loc[idx, humidity_col]
-            
-            # pH effect (phosphorus availability is highly affected by pH)
-            # Optimal pH for phosphorus availability is around 6.0-7.0
-            # Phosphorus becomes less available at high pH (> 7.5) and low pH (< 5.5)
-            if ph < 5.5:
-                ph_effect = -5.0 * (5.5 - ph)
-            elif ph > 7.5:
-                ph_effect = -3.0 * (ph - 7.5)
-            else:
-                ph_effect = 2.0 * (1 - abs(ph - 6.5) / 1.0)
-            
-            # Humidity effect (moderate effect)
-            humidity_effect = 0.1 * (humidity - 50)
-            
-            # Seasonal effect
-            day_of_year = timestamp.timetuple().tm_yday
-            seasonal_effect = 3.0 * np.sin(2 * np.pi * (day_of_year - 90) / 365)
-            
-            # Random noise
-            noise = np.random.normal(0, 1.5)
-            
-            # Calculate phosphorus
-            phosphorus = base_phosphorus + ph_effect + humidity_effect + seasonal_effect + noise
-            
-            # Ensure phosphorus is positive
-            phosphorus = max(0, phosphorus)
-            
-            phosphorus_values.append(round(phosphorus, 1))
-        
-        phosphorus_df[f'sensor_{i}_phosphorus'] = phosphorus_values
+    ph = _sensor_matrix(ph_df, 'ph', num_sensors)
+    humidity = _sensor_matrix(humidity_df, 'humidity', num_sensors)
+    values = _phosphorus_values(rng, ph, humidity, effects)
     
-    return phosphorus_df
+    # Add the new columns in one concat rather than one insert per sensor
+    return pd.concat([ph_df, _sensor_columns(values, 'phosphorus', ph_df.index)], axis=1)
 
-def generate_potassium_data(ph_df, humidity_df, seed=42):
+def generate_potassium_data(ph_df, humidity_df, seed=42, rng=None, num_sensors=None):
     """
     Generate soil potassium (K) data with correlation to pH and humidity.
     
@@ -526,57 +745,86 @@ def generate_potassium_data(ph_df, humidity_df, seed=42):
     - ph_df: DataFrame containing pH data
     - humidity_df: DataFrame containing humidity data
     - seed: Random seed for reproducibility
+    - rng: NumPy Generator to draw from instead of one seeded with seed
+    - num_sensors: Number of sensors, counted from the pH columns when not given
     
     Returns:
     - DataFrame with potassium data for each sensor
     """
-    np.random.seed(seed)
+    if rng is None:
+        rng = np.random.default_rng(seed)
     
-    potassium_df = ph_df.copy()
+    # Get the number of sensors from the pH dataframe unless the caller knows it
+    if num_sensors is None:
+        num_sensors = sum(1 for col in ph_df.columns if col.endswith('_ph'))
+    effects = _sensor_effects(_time_features(ph_df['timestamp']))
     
-    # Get the number of sensors from the pH dataframe
-    num_sensors = sum(1 for col in ph_df.columns if col.endswith('_ph'))
+    ph = _sensor_matrix(ph_df, 'ph', num_sensors)
+    humidity = _sensor_matrix(humidity_df, 'humidity', num_sensors)
+    values = _potassium_values(rng, ph, humidity, effects)
     
-    for i in range(1, num_sensors + 1):
-        ph_col = f'sensor_{i}_ph'
-        humidity_col = f'sensor_{i}_humidity'
-        
-        # Base potassium level (different for each sensor, in mg/kg)
-        base_potassium = 150.0 + np.random.uniform(-30, 30)
-        
-        # Generate potassium with correlation to pH and humidity
-        potassium_values = []
-        
-        for idx, row in ph_df.iterrows():
-            timestamp = row['timestamp']
-            ph = row[ph_col]
-            humidity = humidity_df.loc[idx, humidity_col]
-            
-            # pH effect (potassium availability is moderately affected by pH)
-            # Potassium is generally available across a wide pH range
-            ph_effect = -10.0 * abs(ph - 6.5) / 6.5
-            
-            # Humidity effect (higher humidity can increase potassium availability)
-            humidity_effect = 0.3 * (humidity - 50)
-            
-            # Seasonal effect
-            day_of_year = timestamp.timetuple().tm_yday
-            seasonal_effect = 15.0 * np.sin(2 * np.pi * (day_of_year - 150) / 365)
-            
-            # Random noise
-            noise = np.random.normal(0, 10.0)
-            
-            # Calculate potassium
-            potassium = base_potassium + ph_effect + humidity_effect + seasonal_effect + noise
-            
-            # Ensure potassium is positive
-            potassium = max(0, potassium)
-            
-            potassium_values.append(round(potassium, 1))
-        
-        potassium_df[f'sensor_{i}_potassium'] = potassium_values
+    # Add the new columns in one concat rather than one insert per sensor
+    return pd.concat([ph_df, _sensor_columns(values, 'potassium', ph_df.index)], axis=1)
+
+def generate_all_sensors_fused(days=730, frequency_minutes=720, num_sensors=20, seed=42):
+    """
+    Generate all sensor parameters in one pass over the sensors, without the
+    intermediate per-parameter DataFrames.
+    
+    Parameters:
+    - days: Number of days of data to generate
+    - frequency_minutes: Data recording frequency in minutes
+    - num_sensors: Number of sensors to simulate
+    - seed: Random seed for reproducibility
+    
+    Returns:
+    - DataFrame with the timestamp and all parameters of each sensor
+    """
+    # One seeded generator for the whole pipeline, split into an independent
+    # child stream per parameter (reseeding each parameter with the same seed
+    # would give them all the same noise sequence)
+    params = ['ph', 'temp', 'humidity', 'conductivity', 'nitrogen', 'phosphorus', 'potassium', 'dissolved_oxygen', 'turbidity']
+    rngs = dict(zip(params, np.random.default_rng(seed).spawn(len(params))))
+    
+    ph_df = generate_ph_data(days, frequency_minutes, num_sensors, rng=rngs['ph'])
+    effects = _sensor_effects(_time_features(ph_df['timestamp']))
+    
+    # The pH columns of all sensors come first, followed by the other
+    # parameters of each sensor
+    data = {col: ph_df[col] for col in ph_df.columns}
+    
+    # Every parameter is computed for all sensors at once, one row per sensor,
+    # in float32 like the readings it is stored as
+    ph = _sensor_matrix(ph_df, 'ph', num_sensors)
+    
+    # The parameters only depend on pH, temperature and humidity, and each draws
+    # from its own stream, so the independent ones run on worker threads (NumPy
+    # releases the GIL for whole-array work) without changing the results
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        turbidity = executor.submit(_turbidity_values, rngs['turbidity'], ph)
+        temp = _temperature_values(rngs['temp'], ph, effects, 0.3)
+        conductivity = executor.submit(_conductivity_values, rngs['conductivity'], ph, temp)
+        dissolved_oxygen = executor.submit(_dissolved_oxygen_values, rngs['dissolved_oxygen'], ph, temp, effects)
+        humidity = _humidity_values(rngs['humidity'], ph, temp, effects)
+        nitrogen = executor.submit(_nitrogen_values, rngs['nitrogen'], ph, humidity, effects)
+        phosphorus = executor.submit(_phosphorus_values, rngs['phosphorus'], ph, humidity, effects)
+        potassium = _potassium_values(rngs['potassium'], ph, humidity, effects)
+        turbidity, conductivity, dissolved_oxygen, nitrogen, phosphorus = (
+            future.result() for future in (turbidity, conductivity, dissolved_oxygen, nitrogen, phosphorus)
+        )
+    
+    for i in range(num_sensors):
+        # Add parameters in order of importance as specified by the user
+        data[f'sensor_{i + 1}_humidity'] = humidity[i]  # Second after pH
+        data[f'sensor_{i + 1}_temp'] = temp[i]  # Third
+        data[f'sensor_{i + 1}_conductivity'] = conductivity[i]
+        data[f'sensor_{i + 1}_nitrogen'] = nitrogen[i]
+        data[f'sensor_{i + 1}_phosphorus'] = phosphorus[i]
+        data[f'sensor_{i + 1}_potassium'] = potassium[i]
+        data[f'sensor_{i + 1}_dissolved_oxygen'] = dissolved_oxygen[i]
+        data[f'sensor_{i + 1}_turbidity'] = turbidity[i]
     
-    return potassium_df
+    return pd.DataFrame(data)
 
 def generate_all_sensor_data(days=730, frequency_minutes=720, num_sensors=20, seed=42):
     """
@@ -591,57 +839,39 @@ def generate_all_sensor_data(days=730, frequency_minutes=720, num_sensors=20, se
     Returns:
     - DataFrame with all sensor data
     """
-    # Generate base pH data
-    ph_df = generate_ph_data(days, frequency_minutes, num_sensors, seed)
-    
-    # Generate temperature data
-    temp_df = generate_temperature_data(ph_df, correlation=0.3, seed=seed)
-    
-    # Generate humidity data
-    humidity_df = generate_humidity_data(ph_df, temp_df, seed=seed)
-    
-    # Generate conductivity data
-    cond_df = generate_conductivity_data(ph_df, temp_df, seed=seed)
-    
-    # Generate nitrogen data
-    nitrogen_df = generate_nitrogen_data(ph_df, humidity_df, seed=seed)
-    
-    # Generate phosphorus data
-    phosphorus_df = generate_phosphorus_data(ph_df, humidity_df, seed=seed)
-    
-    # Generate potassium data
-    potassium_df = generate_potassium_data(ph_df, humidity_df, seed=seed)
-    
-    # Generate dissolved oxygen data
-    do_df = generate_dissolved_oxygen_data(ph_df, temp_df, seed=seed)
-    
-    # Generate turbidity data
-    turb_df = generate_turbidity_data(ph_df, seed=seed)
-    
-    # Combine all data
-    all_data = ph_df.copy()
-    
-    for i in range(1, num_sensors + 1):
-        # Add parameters in order of importance as specified by the user
-        all_data[f'sensor_{i}_ph'] = ph_df[f'sensor_{i}_ph']  # Most important
-        all_data[f'sensor_{i}_humidity'] = humidity_df[f'sensor_{i}_humidity']  # Second
-        all_data[f'sensor_{i}_temp'] = temp_df[f'sensor_{i}_temp']  # Third
-        all_data[f'sensor_{i}_conductivity'] = cond_df[f'sensor_{i}_conductivity']
-        all_data[f'sensor_{i}_nitrogen'] = nitrogen_df[f'sensor_{i}_nitrogen']
-        all_data[f'sensor_{i}_phosphorus'] = phosphorus_df[f'sensor_{i}_phosphorus']
-        all_data[f'sensor_{i}_potassium'] = potassium_df[f'sensor_{i}_potassium']
-        all_data[f'sensor_{i}_dissolved_oxygen'] = do_df[f'sensor_{i}_dissolved_oxygen']
-        all_data[f'sensor_{i}_turbidity'] = turb_df[f'sensor_{i}_turbidity']
+    # Reuse the dataset generated earlier with the same arguments
+    cache_path = _generated_cache_path(days, frequency_minutes, num_sensors, seed)
+    if cache_path is not None and os.path.exists(cache_path):
+        try:
+            return pd.read_parquet(cache_path)
+        except (ImportError, OSError, ValueError):
+            pass
+    
+    # Generate every parameter of every sensor in one pass
+    all_data = generate_all_sensors_fused(days, frequency_minutes, num_sensors, seed)
+    
+    # The cache is best effort; without pyarrow or a writable home directory
+    # the data is just generated again next time
+    if cache_path is not None:
+        try:
+            os.makedirs(GENERATED_CACHE_DIR, exist_ok=True)
+            for old_path in os.listdir(GENERATED_CACHE_DIR):
+                if not old_path.startswith(f'{date.today():%Y%m%d}_'):
+                    os.remove(os.path.join(GENERATED_CACHE_DIR, old_path))
+            all_data.to_parquet(cache_path, index=False)
+        except (ImportError, OSError):
+            pass
     
     return all_data
 
-def add_location_info(df, num_sensors=20):
+def add_location_info(df, num_sensors=20, seed=42):
     """
     Add location information for each sensor in Thailand.
     
     Parameters:
     - df: DataFrame with sensor data
     - num_sensors: Number of sensors
+    - seed: Random seed for reproducibility
     
     Returns:
     - DataFrame with location information
@@ -657,29 +887,77 @@ def add_location_info(df, num_sensors=20):
         {"name": "Kanchanaburi Sugarcane Field", "type": "Sandy Clay", "coordinates": "14.0227° N, 99.5328° E"}
     ]
     
-    # Create a new dataframe with sensor metadata
-    sensor_info = []
+    rng = np.random.default_rng(seed)
+    
+    # Cycle through the locations in order, one per sensor
+    loc_idx = np.arange(num_sensors) % len(locations)
+    location_df = pd.DataFrame(locations).iloc[loc_idx].reset_index(drop=True)
+    
+    # Draw the dates and maintenance intervals of all sensors at once
+    now = pd.Timestamp.now()
+    installation_days = rng.integers(30, 366, num_sensors)
+    calibration_days = rng.integers(1, 31, num_sensors)
+    
+    return pd.DataFrame({
+        "sensor_id": np.arange(1, num_sensors + 1),
+        "location_name": location_df["name"],
+        "water_type": location_df["type"],
+        "coordinates": location_df["coordinates"],
+        "installation_date": (now - pd.to_timedelta(installation_days, unit='D')).strftime("%Y-%m-%d"),
+        "maintenance_interval_days": rng.choice([30, 60, 90], num_sensors),
+        "last_calibration": (now - pd.to_timedelta(calibration_days, unit='D')).strftime("%Y-%m-%d")
+    })
+
+def _write_csv(df, csv_path):
+    """
+    Write a table to CSV with PyArrow's writer when available, falling back to
+    pandas.
     
-    for i in range(1, num_sensors + 1):
-        # Randomly select a location (without replacement if possible)
-        loc_idx = (i - 1) % len(locations)
-        location = locations[loc_idx]
-        
-        sensor_info.append({
-            "sensor_id": i,
-            "location_name": location["name"],
-            "water_type": location["type"],
-            "coordinates": location["coordinates"],
-            "installation_date": (datetime.now() - timedelta(days=random.randint(30, 365))).strftime("%Y-%m-%d"),
-            "maintenance_interval_days": random.choice([30, 60, 90]),
-            "last_calibration": (datetime.now() - timedelta(days=random.randint(1, 30))).strftime("%Y-%m-%d")
-        })
-    
-    return pd.DataFrame(sensor_info)
+    Parameters:
+    - df: DataFrame to write, without string columns
+    - csv_path: Path of the CSV file
+    """
+    if pa is None:
+        df.to_csv(csv_path, index=False)
+        return
+    
+    # Format timestamps the way pandas does, and write the header unquoted as
+    # pandas does, so the file reads back the same
+    table = pa.Table.from_pandas(
+        df.assign(**{col: df[col].astype(str) for col in df.select_dtypes('datetime').columns}),
+        preserve_index=False
+    )
+    with open(csv_path, 'wb') as f:
+        f.write((','.join(df.columns) + '\n').encode())
+        pa_csv.write_csv(table, f, pa_csv.WriteOptions(include_header=False, quoting_style='none'))
+
+def _save_table(df, csv_path):
+    """
+    Save a table as CSV plus a zstd-compressed Parquet sibling, which the
+    dashboards load in preference to the CSV.
+    
+    Parameters:
+    - df: DataFrame to save
+    - csv_path: Path of the CSV file; the Parquet file uses the same name with a .parquet extension
+    
+    Returns:
+    - Path of the CSV file
+    """
+    _write_csv(df, csv_path)
+    
+    parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+    try:
+        df.to_parquet(parquet_path, engine='pyarrow', compression='zstd', index=False)
+    except (ImportError, OSError):
+        # Don't leave an older Parquet file shadowing the new CSV
+        if os.path.exists(parquet_path):
+            os.remove(parquet_path)
+    
+    return csv_path
 
 def save_sensor_data(days=730, frequency_minutes=720, num_sensors=20, seed=42):
     """
-    Generate and save all sensor data to CSV files.
+    Generate and save all sensor data to CSV files, each with a Parquet copy.
     
     Parameters:
     - days: Number of days of data to generate
@@ -694,60 +972,74 @@ def save_sensor_data(days=730, frequency_minutes=720, num_sensors=20, seed=42):
     data_dir = os.path.join(os.path.dirname(__file__), 'data')
     os.makedirs(data_dir, exist_ok=True)
     
-    # Generate all sensor data
+    # Generate all sensor data; the readings have at most 2 decimals, so they
+    # are stored as float32, which halves the memory and Parquet size
     all_data = generate_all_sensor_data(days, frequency_minutes, num_sensors, seed)
+    all_data = all_data.astype({col: 'float32' for col in all_data.columns if col != 'timestamp'})
     
     # Generate sensor location information
-    sensor_info = add_location_info(all_data, num_sensors)
+    sensor_info = add_location_info(all_data, num_sensors, seed)
     
     # Save combined data
-    combined_path = os.path.join(data_dir, 'combined_sensor_data.csv')
-    all_data.to_csv(combined_path, index=False)
+    combined_path = _save_table(all_data, os.path.join(data_dir, 'combined_sensor_data.csv'))
     
     # Save sensor information
     sensor_info_path = os.path.join(data_dir, 'sensor_info.csv')
     sensor_info.to_csv(sensor_info_path, index=False)
     
-    # Save individual sensor data
+    # Save a CSV per sensor for tools that don't read Parquet, slicing each
+    # sensor's columns out of the combined data and formatting the timestamps
+    # once for all of them
+    timestamps = all_data['timestamp'].astype(str)
     individual_paths = {}
     for i in range(1, num_sensors + 1):
-        # Extract data for this sensor
-        sensor_cols = ['timestamp'] + [col for col in all_data.columns if col.startswith(f'sensor_{i}_')]
-        sensor_data = all_data[sensor_cols]
-        
-        # Rename columns to remove sensor prefix
-        new_cols = ['timestamp'] + [col.replace(f'sensor_{i}_', '') for col in sensor_cols if col != 'timestamp']
-        sensor_data.columns = new_cols
+        prefix = f'sensor_{i}_'
+        sensor_cols = [col for col in all_data.columns if col.startswith(prefix)]
+        sensor_data = all_data[sensor_cols].rename(columns=lambda col: col.removeprefix(prefix))
+        sensor_data.insert(0, 'timestamp', timestamps)
         
-        # Save to CSV
         sensor_path = os.path.join(data_dir, f'sensor_{i}_data.csv')
-        sensor_data.to_csv(sensor_path, index=False)
+        _write_csv(sensor_data, sensor_path)
         individual_paths[f'sensor_{i}'] = sensor_path
     
-    # Create a daily summary
-    daily_summary = all_data.copy()
-    daily_summary['date'] = daily_summary['timestamp'].dt.date
-    
-    # Group by date and calculate statistics
-    daily_stats = []
-    
-    for date, group in daily_summary.groupby('date'):
-        date_stats = {'date': date}
-        
-        for i in range(1, num_sensors + 1):
-            # Calculate statistics for each parameter
-            for param in ['ph', 'humidity', 'temp', 'conductivity', 'nitrogen', 'phosphorus', 'potassium', 'dissolved_oxygen', 'turbidity']:
-                col = f'sensor_{i}_{param}'
-                if col in group.columns:
-                    date_stats[f'sensor_{i}_{param}_min'] = group[col].min()
-                    date_stats[f'sensor_{i}_{param}_max'] = group[col].max()
-                    date_stats[f'sensor_{i}_{param}_avg'] = group[col].mean()
-        
-        daily_stats.append(date_stats)
+    # Reshape to one row per (timestamp, sensor) with a column per parameter,
+    # so the per-sensor tables come from a single pass over the data
+    wide = all_data.set_index('timestamp')
+    wide.columns = pd.MultiIndex.from_tuples(
+        [(int(col.split('_', 2)[1]), col.split('_', 2)[2]) for col in wide.columns],
+        names=['sensor_id', None]
+    )
+    by_sensor = wide.stack('sensor_id', future_stack=True).reset_index()
+    
+    # Save individual sensor data as one Parquet dataset partitioned by sensor
+    # (sensors/sensor_id=<id>/), replacing any dataset from an earlier run. It is
+    # written after the CSVs, so the dashboard sees it as the newer copy
+    sensors_dir = os.path.join(data_dir, 'sensors')
+    shutil.rmtree(sensors_dir, ignore_errors=True)
+    try:
+        by_sensor.to_parquet(sensors_dir, engine='pyarrow', partition_cols=['sensor_id'], compression='zstd', index=False)
+    except (ImportError, OSError):
+        shutil.rmtree(sensors_dir, ignore_errors=True)
+    
+    # Create a daily summary of the min, max and mean of every sensor column,
+    # computed for all dates in one grouped aggregation
+    params = ['ph', 'humidity', 'temp', 'conductivity', 'nitrogen', 'phosphorus', 'potassium', 'dissolved_oxygen', 'turbidity']
+    stat_cols = [
+        f'sensor_{i}_{param}'
+        for i in range(1, num_sensors + 1)
+        for param in params
+        if f'sensor_{i}_{param}' in all_data.columns
+    ]
+    # Resampling buckets the int64 timestamps by day directly, rather than
+    # grouping on Python date objects
+    daily_summary_df = all_data.set_index('timestamp')[stat_cols].resample('1D').agg(['min', 'max', 'mean'])
     
-    daily_summary_df = pd.DataFrame(daily_stats)
-    daily_summary_path = os.path.join(data_dir, 'daily_summary.csv')
-    daily_summary_df.to_csv(daily_summary_path, index=False)
+    # Flatten the (column, statistic) header, keeping the _avg suffix for the mean
+    daily_summary_df.columns = [
+        f'{col}_{"avg" if stat == "mean" else stat}' for col, stat in daily_summary_df.columns
+    ]
+    daily_summary_df = daily_summary_df.rename_axis('date').reset_index()
+    daily_summary_path = _save_table(daily_summary_df, os.path.join(data_dir, 'daily_summary.csv'))
     
     # Return paths to all saved files
     return {
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+from scipy.stats import kendalltau
+
+# Import the dashboard modules the way app.py does, from the app directory
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from dashboards import _kernels
+
+
+def test_downsample_indices_keeps_endpoints(monkeypatch):
+    """The fallback MinMaxLTTB path keeps the first and last points of the series."""
+    monkeypatch.setattr(_kernels, 'MinMaxLTTBDownsampler', None)
+    rng = np.random.default_rng(42)
+    x = np.arange(100_000, dtype=np.int64)
+    y = np.sin(x / 500) + rng.normal(size=x.size)
+
+    indices = _kernels.downsample_indices(x, y, 2000)
+
+    assert len(indices) == 2000
+    assert indices[0] == 0
+    assert indices[-1] == len(y) - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+@pytest.mark.parametrize('n', [7, 30, 33, 50, 200])
+@pytest.mark.parametrize('ties', [False, True])
+def test_mann_kendall_matches_scipy(n, ties):
+    """Tau and p-value match SciPy's kendalltau against time, including its exact p-value for short series."""
+    rng = np.random.default_rng(n)
+    y = np.linspace(0, 1, n) + rng.normal(scale=0.5, size=n)
+    if ties:
+        y = np.round(y, 1)
+
+    tau, p_value = _kernels.mann_kendall(y)
+    expected = kendalltau(np.arange(n), y)
+
+    assert tau == pytest.approx(expected.statistic, rel=1e-9)
+    assert p_value == pytest.approx(expected.pvalue, rel=1e-9, abs=0)
+
+
+def test_mann_kendall_monotonic_series_uses_exact_p_value():
+    """A strictly increasing series is beyond the short-series size but still gets the exact p-value."""
+    y = np.arange(40, dtype=np.float64)
+
+    tau, p_value = _kernels.mann_kendall(y)
+    expected = kendalltau(np.arange(40), y)
+
+    assert tau == pytest.approx(1.0)
+    assert p_value == pytest.approx(expected.pvalue, rel=1e-9, abs=0)
@@ -22,8 +22,15 @@ import logging
 import time
 import random
 from datetime import datetime
+from threading import Semaphore
 from AWSIoTPythonSDK.MQTTLib import AWSIoTMQTTClient
 
+# orjson is optional: it serializes readings much faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logger = logging.getLogger("AWSIoTLogger")
 logger.setLevel(logging.INFO)
@@ -72,8 +79,19 @@ DEFAULT_PARAMS = {
     }
 }
 
-# Current values for each parameter (will be updated with each reading)
-current_values = {}
+# (name, min, max, drift) of each parameter, flattened from DEFAULT_PARAMS so the
+# drift loop indexes tuples instead of nested dicts
+PARAM_TABLE = [(param, config["min"], config["max"], config["drift"]) for param, config in DEFAULT_PARAMS.items()]
+
+# Current values for each parameter, in PARAM_TABLE order (will be updated with each reading)
+current_values = [0.0] * len(PARAM_TABLE)
+
+# Publishes still waiting for their acknowledgement from AWS IoT Core; at most
+# --max-inflight are outstanding, so publishing never waits on one round trip at a time
+publish_slots = None
+
+# Seconds to wait for outstanding publishes to be acknowledged before disconnecting
+DRAIN_TIMEOUT = 10
 
 def parse_args():
     """Parse command line arguments."""
@@ -84,7 +102,11 @@ def parse_args():
     parser.add_argument('--key', required=True, help="Private key file path")
     parser.add_argument('--client-id', default="ESP32_Soil_Sensor_1", help="MQTT client ID")
     parser.add_argument('--topic', default="soil/sensors", help="MQTT topic to publish to")
-    parser.add_argument('--interval', type=int, default=60, help="Interval between readings in seconds")
+    parser.add_argument('--interval', type=float, default=60, help="Interval between readings in seconds")
+    parser.add_argument('--batch-size', type=int, default=1, help="Readings to publish together in one message")
+    parser.add_argument('--batch-timeout', type=float, default=300, help="Maximum seconds to hold readings before publishing them")
+    parser.add_argument('--qos', type=int, choices=[0, 1], default=0, help="MQTT QoS of published readings (1 waits for acknowledgement)")
+    parser.add_argument('--max-inflight', type=int, default=20, help="Maximum publishes waiting for acknowledgement at once")
     parser.add_argument('--location', default="Chiang Mai Rice Field", help="Sensor location name")
     parser.add_argument('--verbosity', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'], 
                         default='INFO', help='Logging level')
@@ -93,15 +115,15 @@ def parse_args():
 
 def initialize_values():
     """Initialize the current values for each parameter."""
-    global current_values
-    
-    for param, config in DEFAULT_PARAMS.items():
+    for i, (_, low, high, _) in enumerate(PARAM_TABLE):
         # Start with a random value within the range
-        current_values[param] = random.uniform(config["min"], config["max"])
+        current_values[i] = random.uniform(low, high)
 
 def generate_reading():
     """Generate a fake sensor reading."""
-    global current_values
+    # Local names for the loop below, which run faster than global lookups
+    uniform = random.uniform
+    values = current_values
     
     reading = {
         "timestamp": datetime.now().isoformat(),
@@ -110,22 +132,63 @@ def generate_reading():
     }
     
     # Update each parameter with some random drift
-    for param, config in DEFAULT_PARAMS.items():
-        # Add some random drift to the current value
-        drift = random.uniform(-config["drift"], config["drift"])
-        new_value = current_values[param] + drift
-        
-        # Ensure the value stays within the defined range
-        new_value = max(config["min"], min(config["max"], new_value))
+    for i, (param, low, high, drift) in enumerate(PARAM_TABLE):
+        # Add some random drift to the current value, keeping it within the defined range
+        new_value = values[i] + uniform(-drift, drift)
+        if new_value < low:
+            new_value = low
+        elif new_value > high:
+            new_value = high
         
-        # Update the current value
-        current_values[param] = new_value
-        
-        # Add to the reading
+        # Update the current value and add it to the reading
+        values[i] = new_value
         reading[param] = round(new_value, 2)
     
     return reading
 
+def encode_message(payload):
+    """Convert a reading or batch of readings to a JSON message."""
+    if orjson is not None:
+        return orjson.dumps(payload).decode('utf-8')
+    return json.dumps(payload)
+
+def publish_readings(mqtt_client, readings):
+    """Publish readings to AWS IoT Core, as one reading or as a batch."""
+    payload = readings[0] if len(readings) == 1 else {"batch": readings}
+    message = encode_message(payload)
+    
+    # Only format the message when it will be logged
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Publishing %d reading(s): %s", len(readings), message)
+    
+    # QoS 0 publishes are not acknowledged, so they are sent without taking a slot
+    if args.qos == 0:
+        mqtt_client.publish(args.topic, message, 0)
+        return
+    
+    # Publish without waiting for the acknowledgement, which frees the slot when it arrives
+    acquired = publish_slots.acquire(timeout=DRAIN_TIMEOUT)
+    if not acquired:
+        logger.warning(f"{args.max_inflight} publishes still unacknowledged after {DRAIN_TIMEOUT} seconds")
+    
+    def on_ack(mid):
+        if acquired:
+            publish_slots.release()
+    
+    try:
+        mqtt_client.publishAsync(args.topic, message, args.qos, ackCallback=on_ack)
+    except Exception:
+        on_ack(None)
+        raise
+
+def wait_for_publishes():
+    """Wait until all outstanding publishes are acknowledged, or DRAIN_TIMEOUT passes."""
+    deadline = time.monotonic() + DRAIN_TIMEOUT
+    for _ in range(args.max_inflight):
+        if not publish_slots.acquire(timeout=max(deadline - time.monotonic(), 0)):
+            logger.warning("Disconnecting with unacknowledged publishes")
+            break
+
 def setup_mqtt_client(args):
     """Set up and configure the MQTT client."""
     # Initialize the MQTT client
@@ -146,6 +209,8 @@ def setup_mqtt_client(args):
 
 def main():
     """Main function."""
+    global publish_slots
+    
     # Set logging level
     logger.setLevel(getattr(logging, args.verbosity))
     
@@ -158,18 +223,27 @@ def main():
     # Connect to AWS IoT Core
     logger.info(f"Connecting to AWS IoT Core at {args.endpoint}")
     mqtt_client.connect()
+    publish_slots = Semaphore(args.max_inflight)
+    
+    # Readings waiting to be published together
+    batch = []
+    last_publish = time.monotonic()
+    
+    # Readings are taken on a fixed schedule, so time spent generating and
+    # publishing is not added to the interval
+    next_reading = time.monotonic()
     
     try:
         while True:
             # Generate a fake reading
             reading = generate_reading()
+            batch.append(reading)
             
-            # Convert to JSON
-            message = json.dumps(reading)
-            
-            # Publish to AWS IoT Core
-            logger.info(f"Publishing: {message}")
-            mqtt_client.publish(args.topic, message, 1)
+            # Publish to AWS IoT Core once the batch is full or has waited long enough
+            if len(batch) >= args.batch_size or time.monotonic() - last_publish >= args.batch_timeout:
+                publish_readings(mqtt_client, batch)
+                batch = []
+                last_publish = time.monotonic()
             
             # Print the current values with units
             print("\nCurrent Soil Sensor Readings:")
@@ -180,11 +254,20 @@ def main():
                     print(f"{param.capitalize()}: {value} {unit}")
             print("-" * 30)
             
-            # Wait for the next interval
+            # Wait for the next interval, skipping readings that are already late
+            next_reading += args.interval
+            now = time.monotonic()
+            if next_reading < now:
+                next_reading = now
             logger.info(f"Waiting {args.interval} seconds until next reading...")
-            time.sleep(args.interval)
+            time.sleep(next_reading - now)
             
     except KeyboardInterrupt:
+        # Publish the readings still waiting in the batch
+        if batch:
+            publish_readings(mqtt_client, batch)
+        wait_for_publishes()
+        
         logger.info("Disconnecting from AWS IoT Core")
         mqtt_client.disconnect()
 
@@ -15,17 +15,40 @@ python aws_to_csv.py --endpoint <aws-iot-endpoint> --root-ca <root-ca-path> --ce
 """
 
 import argparse
+import atexit
+import csv
 import json
 import logging
 import os
-import sys
+import queue
+import signal
 import time
+from collections import defaultdict, deque, namedtuple
 from datetime import datetime
-from threading import Thread
+from functools import lru_cache
+from threading import Event, Lock, Thread
 
 import pandas as pd
 from AWSIoTPythonSDK.MQTTLib import AWSIoTMQTTClient
 
+# ciso8601 is optional: its C parser is used for ISO timestamps when installed
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
+# orjson is optional: it decodes payload bytes directly and much faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pyarrow is optional: when installed, individual sensor data is stored as Parquet
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
 # Configure logging
 logger = logging.getLogger("AWSIoTLogger")
 logger.setLevel(logging.INFO)
@@ -35,12 +58,78 @@ streamHandler.setFormatter(formatter)
 logger.addHandler(streamHandler)
 
 # Global variables
-received_messages = []
 output_directory = None
 combined_data_file = None
 daily_summary_file = None
 sensor_info_file = None
 
+# Messages waiting to be processed by the writer thread; when the queue is full
+# the oldest message is dropped so the MQTT receive thread never blocks
+MESSAGE_QUEUE_SIZE = 10000
+message_queue = queue.Queue(maxsize=MESSAGE_QUEUE_SIZE)
+dropped_messages = 0
+
+# Rows waiting to be appended to each CSV file, flushed in batches by a
+# background thread when BATCH_SIZE rows are queued or every FLUSH_INTERVAL seconds
+BATCH_SIZE = 100
+FLUSH_INTERVAL = 5.0
+pending_rows = defaultdict(deque)
+pending_headers = {}
+pending_lock = Lock()
+flush_lock = Lock()
+flush_requested = Event()
+
+# Open CSV files being appended to, as path -> (file, csv writer)
+csv_writers = {}
+
+# Rows waiting to be written to each sensor's Parquet files, written as a new part
+# file along with the CSV rows; once a sensor's month has SENSOR_COMPACT_PARTS
+# parts, they are merged into one file for the month
+SENSOR_COMPACT_PARTS = 100
+pending_sensor_rows = defaultdict(list)
+
+# Number of the last part file written for each (sensor_id, month)
+sensor_part_numbers = {}
+
+# Timestamp parser of each device, chosen from the format of its first message
+timestamp_parsers = {}
+
+# Per-sensor CSV paths, and the sensors already in the sensor info file
+# (read from it once, on the first message)
+sensor_file_paths = {}
+known_sensor_ids = None
+
+# Running daily statistics, as (date, sensor_id) -> {parameter: [count, mean, min, max]},
+# written to the daily summary CSV every SUMMARY_INTERVAL seconds and on exit.
+# Readings are queued as (date, sensor_id, *values) and aggregated together when written
+SUMMARY_INTERVAL = 60.0
+summary_state = {}
+pending_summary_rows = []
+summary_lock = Lock()
+summary_changed = False
+
+# Dashboard parameter of each reading and the message field it comes from, in column order
+SENSOR_FIELDS = [
+    ('ph', 'ph'),
+    ('temp', 'temperature'),
+    ('humidity', 'moisture'),
+    ('conductivity', 'conductivity'),
+    ('nitrogen', 'nitrogen'),
+    ('phosphorus', 'phosphorus'),
+    ('potassium', 'potassium'),
+    ('dissolved_oxygen', 'dissolved_oxygen'),
+    ('turbidity', 'turbidity')
+]
+
+# A reading of a sensor, with its values in column order; a tuple rather than a
+# dict per reading, which is smaller and is written to CSV and Parquet as it is
+Reading = namedtuple('Reading', ['timestamp'] + [parameter for parameter, _ in SENSOR_FIELDS])
+
+@lru_cache(maxsize=64)
+def sensor_columns(sensor_id):
+    """Column names of the readings of a sensor."""
+    return ('timestamp',) + tuple(f'sensor_{sensor_id}_{parameter}' for parameter, _ in SENSOR_FIELDS)
+
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser()
@@ -52,30 +141,91 @@ def parse_args():
     parser.add_argument('--output-dir', required=True, help="Directory to save CSV files")
     parser.add_argument('--client-id', default="soil_sensor_integration", help="MQTT client ID")
     parser.add_argument('--use-websocket', action='store_true', help="Use MQTT over WebSocket")
-    parser.add_argument('--verbosity', choices=[x.name for x in logging.Levels], default='INFO',
-                        help='Logging level')
+    parser.add_argument('--qos', type=int, choices=[0, 1], default=1, help="MQTT QoS of the subscription (0 saves acknowledgements but readings lost on the way are not redelivered)")
+    parser.add_argument('--queue-size', type=int, default=MESSAGE_QUEUE_SIZE, help="Messages to hold for processing before dropping the oldest")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Rows to buffer before writing them to CSV")
+    parser.add_argument('--flush-interval', type=float, default=FLUSH_INTERVAL, help="Seconds between writes of buffered rows")
+    parser.add_argument('--verbosity', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
+                        default='INFO', help='Logging level')
     
     return parser.parse_args()
 
 def mqtt_callback(client, userdata, message):
     """Callback when a message is received from AWS IoT Core."""
     try:
-        payload = json.loads(message.payload.decode('utf-8'))
-        logger.info(f"Received message: {payload}")
-        
-        # Add timestamp if not present
-        if 'timestamp' not in payload:
-            payload['timestamp'] = datetime.now().isoformat()
+        if orjson is not None:
+            payload = orjson.loads(message.payload)
+        else:
+            payload = json.loads(message.payload.decode('utf-8'))
+        # Log the size of the message, and the payload itself only when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received message: %s", payload)
+        elif logger.isEnabledFor(logging.INFO):
+            logger.info("Received message (%d bytes)", len(message.payload))
         
-        # Add to received messages
-        received_messages.append(payload)
+        # A message holds either one reading or a batch of them
+        if isinstance(payload, list):
+            readings = payload
+        elif 'batch' in payload:
+            readings = payload['batch']
+        else:
+            readings = [payload]
         
-        # Process and save to CSV
-        process_message(payload)
+        for reading in readings:
+            # Add timestamp if not present
+            if 'timestamp' not in reading:
+                reading['timestamp'] = datetime.now().isoformat()
+            
+            # Hand over to the writer thread to process and save to CSV
+            enqueue_message(reading)
         
     except Exception as e:
         logger.error(f"Error processing message: {e}")
 
+def enqueue_message(payload):
+    """Queue a message for the writer thread, dropping the oldest one if the queue is full."""
+    global dropped_messages
+    
+    while True:
+        try:
+            message_queue.put_nowait(payload)
+            return
+        except queue.Full:
+            try:
+                message_queue.get_nowait()
+                message_queue.task_done()
+            except queue.Empty:
+                continue
+            
+            dropped_messages += 1
+            logger.warning(f"Message queue full, dropped the oldest message ({dropped_messages} dropped so far)")
+
+def writer_loop():
+    """Process queued messages in order."""
+    while True:
+        payload = message_queue.get()
+        try:
+            process_message(payload)
+        finally:
+            message_queue.task_done()
+
+def parse_ms_timestamp(value):
+    """Convert a timestamp in milliseconds to datetime."""
+    return datetime.fromtimestamp(value / 1000.0)
+
+def parse_iso_timestamp(value):
+    """Parse an ISO format timestamp."""
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def timestamp_parser(value):
+    """Get the parser for timestamps in the format of the given one."""
+    if isinstance(value, int):
+        return parse_ms_timestamp
+    if ciso8601 is not None:
+        # ciso8601 handles the Z suffix itself
+        return ciso8601.parse_datetime
+    return parse_iso_timestamp
+
 def process_message(message):
     """Process the received message and save to CSV files."""
     global output_directory, combined_data_file, daily_summary_file, sensor_info_file
@@ -85,145 +235,322 @@ def process_message(message):
         device_id = message.get('device_id', 'unknown')
         sensor_id = int(device_id.split('_')[-1]) if device_id.split('_')[-1].isdigit() else 1
         
-        # Create timestamp
-        if isinstance(message.get('timestamp'), int):
-            # Convert milliseconds to datetime
-            timestamp = datetime.fromtimestamp(message['timestamp'] / 1000.0)
-        else:
-            # Parse ISO format timestamp
-            timestamp = datetime.fromisoformat(message['timestamp'].replace('Z', '+00:00'))
+        # Create timestamp with the parser of the device, choosing it again if the
+        # device sends a timestamp in another format
+        value = message['timestamp']
+        parser = timestamp_parsers.get(device_id)
+        if parser is None:
+            parser = timestamp_parsers[device_id] = timestamp_parser(value)
+        try:
+            timestamp = parser(value)
+        except (TypeError, ValueError, AttributeError):
+            parser = timestamp_parsers[device_id] = timestamp_parser(value)
+            timestamp = parser(value)
         
-        # Create sensor data row
-        sensor_data = {
-            'timestamp': timestamp,
-            f'sensor_{sensor_id}_ph': message.get('ph', 0),
-            f'sensor_{sensor_id}_temp': message.get('temperature', 0),
-            f'sensor_{sensor_id}_humidity': message.get('moisture', 0),
-            f'sensor_{sensor_id}_conductivity': message.get('conductivity', 0),
-            f'sensor_{sensor_id}_nitrogen': message.get('nitrogen', 0),
-            f'sensor_{sensor_id}_phosphorus': message.get('phosphorus', 0),
-            f'sensor_{sensor_id}_potassium': message.get('potassium', 0),
-            f'sensor_{sensor_id}_dissolved_oxygen': message.get('dissolved_oxygen', 0),
-            f'sensor_{sensor_id}_turbidity': message.get('turbidity', 0)
-        }
+        # Create the reading, taking its values from the message fields in SENSOR_FIELDS order
+        get = message.get
+        reading = Reading(
+            timestamp, get('ph', 0), get('temperature', 0), get('moisture', 0), get('conductivity', 0),
+            get('nitrogen', 0), get('phosphorus', 0), get('potassium', 0), get('dissolved_oxygen', 0), get('turbidity', 0)
+        )
         
-        # Append to combined data CSV
-        combined_df = pd.DataFrame([sensor_data])
-        if os.path.exists(combined_data_file):
-            # Append to existing file
-            combined_df.to_csv(combined_data_file, mode='a', header=False, index=False)
+        # Queue the reading for the combined data CSV and the individual sensor data,
+        # stored as Parquet when pyarrow is installed and as CSV otherwise
+        columns = sensor_columns(sensor_id)
+        queue_row(combined_data_file, reading, columns)
+        if pyarrow is not None:
+            queue_sensor_row(sensor_id, reading)
         else:
-            # Create new file with header
-            combined_df.to_csv(combined_data_file, index=False)
-        
-        # Update individual sensor CSV
-        sensor_file = os.path.join(output_directory, f'sensor_{sensor_id}_data.csv')
-        if os.path.exists(sensor_file):
-            # Append to existing file
-            combined_df.to_csv(sensor_file, mode='a', header=False, index=False)
-        else:
-            # Create new file with header
-            combined_df.to_csv(sensor_file, index=False)
+            if sensor_id not in sensor_file_paths:
+                sensor_file_paths[sensor_id] = os.path.join(output_directory, f'sensor_{sensor_id}_data.csv')
+            queue_row(sensor_file_paths[sensor_id], reading, columns)
         
         # Update daily summary (simplified - in a real implementation, you would aggregate data)
-        update_daily_summary(sensor_id, sensor_data)
+        update_daily_summary(sensor_id, reading)
         
         # Update sensor info if not exists
         update_sensor_info(sensor_id, message)
         
-        logger.info(f"Data saved for sensor {sensor_id}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Data queued for sensor %d", sensor_id)
         
     except Exception as e:
         logger.error(f"Error saving data to CSV: {e}")
 
-def update_daily_summary(sensor_id, sensor_data):
-    """Update the daily summary CSV file."""
-    try:
-        # Get today's date
-        today = sensor_data['timestamp'].date()
+def queue_row(path, row, header):
+    """Queue a row to be appended to a CSV file by the flusher thread."""
+    with pending_lock:
+        if not pending_rows[path]:
+            pending_headers[path] = header
+        pending_rows[path].append(row)
+        if len(pending_rows[path]) >= BATCH_SIZE:
+            flush_requested.set()
+
+def queue_sensor_row(sensor_id, row):
+    """Queue a row to be written to a sensor's Parquet files by the flusher thread."""
+    with pending_lock:
+        pending_sensor_rows[sensor_id].append(row)
+        if len(pending_sensor_rows[sensor_id]) >= BATCH_SIZE:
+            flush_requested.set()
+
+def flush_pending_rows():
+    """Append all queued rows to their CSV files, one write per file, and to the
+    Parquet files of their sensors."""
+    with flush_lock:
+        with pending_lock:
+            batches = {path: (pending_headers[path], list(rows)) for path, rows in pending_rows.items() if rows}
+            pending_rows.clear()
+            pending_headers.clear()
+            sensor_batches = {sensor_id: rows for sensor_id, rows in pending_sensor_rows.items() if rows}
+            pending_sensor_rows.clear()
         
-        # Create daily summary row
-        summary_row = {
-            'date': today,
-            f'sensor_{sensor_id}_ph_avg': sensor_data[f'sensor_{sensor_id}_ph'],
-            f'sensor_{sensor_id}_ph_min': sensor_data[f'sensor_{sensor_id}_ph'],
-            f'sensor_{sensor_id}_ph_max': sensor_data[f'sensor_{sensor_id}_ph'],
-            f'sensor_{sensor_id}_temp_avg': sensor_data[f'sensor_{sensor_id}_temp'],
-            f'sensor_{sensor_id}_humidity_avg': sensor_data[f'sensor_{sensor_id}_humidity'],
-            f'sensor_{sensor_id}_conductivity_avg': sensor_data[f'sensor_{sensor_id}_conductivity'],
-            f'sensor_{sensor_id}_nitrogen_avg': sensor_data[f'sensor_{sensor_id}_nitrogen'],
-            f'sensor_{sensor_id}_phosphorus_avg': sensor_data[f'sensor_{sensor_id}_phosphorus'],
-            f'sensor_{sensor_id}_potassium_avg': sensor_data[f'sensor_{sensor_id}_potassium'],
-            f'sensor_{sensor_id}_dissolved_oxygen_avg': sensor_data[f'sensor_{sensor_id}_dissolved_oxygen'],
-            f'sensor_{sensor_id}_turbidity_avg': sensor_data[f'sensor_{sensor_id}_turbidity']
-        }
+        write_batches(batches)
+        write_sensor_batches(sensor_batches)
+
+def get_csv_writer(path, header):
+    """Get the writer of a CSV file, opening it for appending on first use."""
+    if path not in csv_writers:
+        csv_file = open(path, 'a', newline='', buffering=1 << 16)
+        writer = csv.writer(csv_file, lineterminator='\n')
         
-        # Check if daily summary file exists
-        if os.path.exists(daily_summary_file):
-            # Read existing data
-            daily_df = pd.read_csv(daily_summary_file)
+        # Write the header only when the file is new
+        if csv_file.tell() == 0:
+            writer.writerow(header)
+        csv_writers[path] = (csv_file, writer)
+    
+    return csv_writers[path][1]
+
+def write_batches(batches):
+    """Append each batch of rows, with the header of its first row, to its CSV file."""
+    for path, (header, rows) in batches.items():
+        try:
+            # Rows are written by position under the header of the row that
+            # created the file, as when each row was appended on its own
+            writer = get_csv_writer(path, header)
+            writer.writerows(rows)
             
-            # Check if today's data exists for this sensor
-            today_str = today.strftime('%Y-%m-%d')
-            mask = (daily_df['date'] == today_str)
+            # Make the batch visible to the dashboard
+            csv_writers[path][0].flush()
+        except Exception as e:
+            logger.error(f"Error writing {len(rows)} rows to {path}: {e}")
+
+def write_sensor_batches(batches):
+    """Write each sensor's batch of rows as new part files of its monthly Parquet data."""
+    for sensor_id, rows in batches.items():
+        try:
+            # Same columns and types as the sensor data written by the data generator
+            batch = pd.DataFrame(rows, columns=Reading._fields)
+            batch['timestamp'] = pd.to_datetime(batch['timestamp'], utc=True).dt.tz_convert(None).astype('datetime64[ns]')
+            for parameter in Reading._fields[1:]:
+                # A value that is not a number becomes NaN instead of failing the batch
+                batch[parameter] = pd.to_numeric(batch[parameter], errors='coerce').astype('float32')
             
-            if mask.any():
-                # Update existing row (simplified - in reality, you would calculate proper averages)
-                # This is just a placeholder for demonstration
-                pass
-            else:
-                # Append new row
-                new_row_df = pd.DataFrame([summary_row])
-                daily_df = pd.concat([daily_df, new_row_df], ignore_index=True)
+            # Part files per sensor and month, in the partition layout the dashboard reads
+            # (sensors/sensor_id=<id>/<YYYY-MM>-<part>.parquet)
+            sensor_dir = os.path.join(output_directory, 'sensors', f'sensor_id={sensor_id}')
+            os.makedirs(sensor_dir, exist_ok=True)
+            for month, month_rows in batch.groupby(batch['timestamp'].dt.strftime('%Y-%m'), sort=False):
+                write_parquet_part(next_part_path(sensor_dir, sensor_id, month), month_rows)
+                if sensor_part_numbers[(sensor_id, month)] >= SENSOR_COMPACT_PARTS:
+                    compact_sensor_parts(sensor_dir, sensor_id, month)
+        except Exception as e:
+            logger.error(f"Error writing {len(rows)} rows for sensor {sensor_id} to Parquet: {e}")
+
+def compact_sensor_parts(sensor_dir, sensor_id, month):
+    """Merge the part files of a sensor's month, and its earlier merged file, into <YYYY-MM>.parquet."""
+    month_path = os.path.join(sensor_dir, f'{month}.parquet')
+    part_paths = sorted(
+        os.path.join(sensor_dir, name) for name in os.listdir(sensor_dir)
+        if name.startswith(f'{month}-') and name.endswith('.parquet')
+    )
+    paths = ([month_path] if os.path.exists(month_path) else []) + part_paths
+    write_parquet_part(month_path, pd.concat([pd.read_parquet(path) for path in paths], ignore_index=True))
+    
+    # The merged file is in place before the parts are removed, so readers may
+    # briefly see rows twice but never miss any
+    for path in part_paths:
+        os.remove(path)
+    sensor_part_numbers[(sensor_id, month)] = 0
+
+def next_part_path(sensor_dir, sensor_id, month):
+    """Get the path of the next part file of a sensor's month, after those already written."""
+    key = (sensor_id, month)
+    if key not in sensor_part_numbers:
+        # Continue the numbering of parts written by an earlier run
+        parts = [name[len(month) + 1:-len('.parquet')] for name in os.listdir(sensor_dir)
+                 if name.startswith(f'{month}-') and name.endswith('.parquet')]
+        sensor_part_numbers[key] = max((int(part) for part in parts if part.isdigit()), default=0)
+    
+    sensor_part_numbers[key] += 1
+    return os.path.join(sensor_dir, f'{month}-{sensor_part_numbers[key]:05d}.parquet')
+
+def write_parquet_part(path, rows):
+    """Write rows to a Parquet file through a hidden file renamed into place,
+    so readers never see a partly written file."""
+    # Files starting with '.' are skipped when the directory is read as a dataset
+    temp_path = os.path.join(os.path.dirname(path), '.' + os.path.basename(path))
+    rows.to_parquet(temp_path, compression='zstd', index=False)
+    os.replace(temp_path, path)
+
+def close_writers():
+    """Close all CSV files being appended to."""
+    with flush_lock:
+        for csv_file, _ in csv_writers.values():
+            csv_file.close()
+        csv_writers.clear()
+
+def flush_loop():
+    """Flush queued rows when a batch fills up or the flush interval passes."""
+    while True:
+        flush_requested.wait(FLUSH_INTERVAL)
+        flush_requested.clear()
+        flush_pending_rows()
+
+def load_daily_summary():
+    """Load the daily summary CSV into the running daily statistics."""
+    if not os.path.exists(daily_summary_file):
+        return
+    
+    daily_df = pd.read_csv(daily_summary_file)
+    for row in daily_df.to_dict('records'):
+        for col, value in row.items():
+            if not col.endswith('_avg') or pd.isna(value):
+                continue
             
-            # Save updated dataframe
-            daily_df.to_csv(daily_summary_file, index=False)
-        else:
-            # Create new file with header
-            summary_df = pd.DataFrame([summary_row])
-            summary_df.to_csv(daily_summary_file, index=False)
+            # Continue with the number of readings behind the average; a file
+            # written without counts is continued as if each average was one reading
+            prefix = col[:-len('_avg')]
+            _, sensor_id, parameter = prefix.split('_', 2)
+            count = row.get(f'{prefix}_count', 1)
+            low = row.get(f'{prefix}_min', value)
+            high = row.get(f'{prefix}_max', value)
+            stats = summary_state.setdefault((str(row['date']), int(sensor_id)), {})
+            stats[parameter] = [
+                1 if pd.isna(count) else int(count),
+                value,
+                value if pd.isna(low) else low,
+                value if pd.isna(high) else high
+            ]
+
+def update_daily_summary(sensor_id, reading):
+    """Queue a reading for the running daily statistics."""
+    global summary_changed
+    
+    try:
+        row = (reading.timestamp.date(), sensor_id, *reading[1:])
+        with summary_lock:
+            pending_summary_rows.append(row)
+            summary_changed = True
         
     except Exception as e:
         logger.error(f"Error updating daily summary: {e}")
 
+def aggregate_summary_rows():
+    """Merge the queued readings into the running daily statistics (summary_lock must be held)."""
+    if not pending_summary_rows:
+        return
+    
+    # Count, mean, minimum and maximum of each parameter per day and sensor, in one pass
+    parameters = [parameter for parameter, _ in SENSOR_FIELDS]
+    batch = pd.DataFrame(pending_summary_rows, columns=['date', 'sensor_id'] + parameters)
+    pending_summary_rows.clear()
+    batch[parameters] = batch[parameters].apply(pd.to_numeric, errors='coerce')
+    aggregated = batch.groupby(['date', 'sensor_id'], sort=False)[parameters].agg(['count', 'mean', 'min', 'max'])
+    
+    for (day, sensor_id), values in zip(aggregated.index, aggregated.to_numpy().reshape(len(aggregated), -1, 4)):
+        stats = summary_state.setdefault((day.strftime('%Y-%m-%d'), int(sensor_id)), {})
+        for parameter, (count, mean, low, high) in zip(parameters, values):
+            if count == 0:
+                continue
+            
+            # Combine with the statistics of earlier readings of the day
+            count = int(count)
+            if parameter not in stats:
+                stats[parameter] = [count, float(mean), float(low), float(high)]
+            else:
+                entry = stats[parameter]
+                entry[0] += count
+                entry[1] += (mean - entry[1]) * count / entry[0]
+                entry[2] = min(entry[2], low)
+                entry[3] = max(entry[3], high)
+
+def flush_daily_summary():
+    """Write the running daily statistics to the daily summary CSV."""
+    global summary_changed
+    
+    with summary_lock:
+        if not summary_changed:
+            return
+        
+        try:
+            aggregate_summary_rows()
+            
+            # One row per date with the min, max, average and number of readings of
+            # each sensor's parameters (the count lets a restart continue the averages)
+            rows = {}
+            for (day, sensor_id), stats in sorted(summary_state.items()):
+                row = rows.setdefault(day, {'date': day})
+                for parameter, (count, mean, low, high) in stats.items():
+                    row[f'sensor_{sensor_id}_{parameter}_min'] = low
+                    row[f'sensor_{sensor_id}_{parameter}_max'] = high
+                    row[f'sensor_{sensor_id}_{parameter}_avg'] = mean
+                    row[f'sensor_{sensor_id}_{parameter}_count'] = count
+            
+            daily_df = pd.DataFrame(list(rows.values()))
+            count_cols = [col for col in daily_df.columns if col.endswith('_count')]
+            daily_df[count_cols] = daily_df[count_cols].astype('Int64')
+            sensor_cols = sorted(daily_df.columns[1:], key=lambda col: int(col.split('_')[1]))
+            daily_df[['date'] + sensor_cols].to_csv(daily_summary_file, index=False)
+            summary_changed = False
+        except Exception as e:
+            logger.error(f"Error writing daily summary: {e}")
+
+def summary_loop():
+    """Write the daily summary every SUMMARY_INTERVAL seconds."""
+    while True:
+        time.sleep(SUMMARY_INTERVAL)
+        flush_daily_summary()
+
 def update_sensor_info(sensor_id, message):
     """Update the sensor info CSV file."""
+    global known_sensor_ids
+    
     try:
+        # Only a sensor not yet in the file needs an update
+        if known_sensor_ids is None:
+            if os.path.exists(sensor_info_file):
+                known_sensor_ids = set(pd.read_csv(sensor_info_file)['sensor_id'])
+            else:
+                known_sensor_ids = set()
+        if sensor_id in known_sensor_ids:
+            return
+        
+        # Info of the new sensor
+        today_str = datetime.now().strftime('%Y-%m-%d')
+        new_sensor = {
+            'sensor_id': sensor_id,
+            'location_name': message.get('location', f'Location {sensor_id}'),
+            'coordinates': message.get('coordinates', '13.7°N 100.5°E'),  # Default to Bangkok
+            'water_type': message.get('soil_type', 'Clay Loam'),
+            'installation_date': today_str,
+            'last_calibration': today_str,
+            'maintenance_interval_days': 90
+        }
+        
         # Check if sensor info file exists
         if os.path.exists(sensor_info_file):
             # Read existing data
             info_df = pd.read_csv(sensor_info_file)
             
-            # Check if this sensor exists
+            # Add the sensor if it is not in the file yet
             if not (info_df['sensor_id'] == sensor_id).any():
-                # Add new sensor info
-                new_sensor = {
-                    'sensor_id': sensor_id,
-                    'location_name': message.get('location', f'Location {sensor_id}'),
-                    'coordinates': message.get('coordinates', f'13.7°N 100.5°E'),  # Default to Bangkok
-                    'water_type': message.get('soil_type', 'Clay Loam'),
-                    'installation_date': datetime.now().strftime('%Y-%m-%d'),
-                    'last_calibration': datetime.now().strftime('%Y-%m-%d'),
-                    'maintenance_interval_days': 90
-                }
-                
-                new_row_df = pd.DataFrame([new_sensor])
-                info_df = pd.concat([info_df, new_row_df], ignore_index=True)
+                info_df = pd.concat([info_df, pd.DataFrame([new_sensor])], ignore_index=True)
                 info_df.to_csv(sensor_info_file, index=False)
         else:
             # Create new file with header
-            new_sensor = {
-                'sensor_id': sensor_id,
-                'location_name': message.get('location', f'Location {sensor_id}'),
-                'coordinates': message.get('coordinates', f'13.7°N 100.5°E'),  # Default to Bangkok
-                'water_type': message.get('soil_type', 'Clay Loam'),
-                'installation_date': datetime.now().strftime('%Y-%m-%d'),
-                'last_calibration': datetime.now().strftime('%Y-%m-%d'),
-                'maintenance_interval_days': 90
-            }
-            
-            info_df = pd.DataFrame([new_sensor])
-            info_df.to_csv(sensor_info_file, index=False)
+            pd.DataFrame([new_sensor]).to_csv(sensor_info_file, index=False)
+        
+        known_sensor_ids.add(sensor_id)
         
     except Exception as e:
         logger.error(f"Error updating sensor info: {e}")
@@ -248,12 +575,20 @@ def setup_mqtt_client(args):
     
     return client
 
+def handle_sigterm(signum, frame):
+    """Stop on SIGTERM (e.g. systemctl stop) as on Ctrl+C, so buffered data is written."""
+    raise KeyboardInterrupt
+
 def main():
     """Main function."""
     global output_directory, combined_data_file, daily_summary_file, sensor_info_file
+    global BATCH_SIZE, FLUSH_INTERVAL, message_queue
     
     # Parse arguments
     args = parse_args()
+    message_queue = queue.Queue(maxsize=args.queue_size)
+    BATCH_SIZE = args.batch_size
+    FLUSH_INTERVAL = args.flush_interval
     
     # Set logging level
     logger.setLevel(getattr(logging, args.verbosity))
@@ -267,6 +602,15 @@ def main():
     daily_summary_file = os.path.join(output_directory, 'daily_summary.csv')
     sensor_info_file = os.path.join(output_directory, 'sensor_info.csv')
     
+    # Continue the daily summary from disk, and keep it written while running
+    load_daily_summary()
+    atexit.register(flush_daily_summary)
+    
+    # Start processing messages and writing queued rows and the daily summary in the background
+    Thread(target=writer_loop, daemon=True).start()
+    Thread(target=flush_loop, daemon=True).start()
+    Thread(target=summary_loop, daemon=True).start()
+    
     # Set up MQTT client
     mqtt_client = setup_mqtt_client(args)
     
@@ -276,16 +620,23 @@ def main():
     
     # Subscribe to the topic
     logger.info(f"Subscribing to topic: {args.topic}")
-    mqtt_client.subscribe(args.topic, 1, mqtt_callback)
+    mqtt_client.subscribe(args.topic, args.qos, mqtt_callback)
     
-    # Keep the script running
+    # Keep the script running until interrupted or terminated
+    signal.signal(signal.SIGTERM, handle_sigterm)
     try:
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
+        pass
+    finally:
+        # Write everything still buffered before exiting
         logger.info("Disconnecting from AWS IoT Core")
         mqtt_client.disconnect()
-        sys.exit(0)
+        message_queue.join()
+        flush_pending_rows()
+        close_writers()
+        flush_daily_summary()
 
 if __name__ == '__main__':
     main()